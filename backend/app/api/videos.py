@@ -1,36 +1,56 @@
-from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel, conint
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from ..database import get_db
+from ..database import get_db, get_read_db, run_write
 from ..services.scanner import scan_videos, get_videos
-from ..services.tags import get_all_tags, add_video_tag, remove_video_tag
+from ..services.tags import get_all_tags, get_or_create_tag, remove_video_tag
+from ..services.tags import add_video_tag as add_tag_to_video
 from ..config import settings
 from ..models.video import Video
 from ..models.tag import Tag
-from fastapi.responses import FileResponse
+from fastapi.responses import Response, StreamingResponse
 import os
 import subprocess
 import platform
 from ..logger import logger
 from sqlalchemy import select, and_
 from sqlalchemy.sql import func
+from sqlalchemy.orm import selectinload
 import math
-from enum import Enum
-from datetime import datetime, timedelta
+from datetime import datetime
 from ..services.metadata import update_video_info
+from ..services.scan_jobs import scan_job_manager
+from ..services.thumbnail import find_thumbnail_file, has_all_sizes
+from ..services.thumbnail_worker import get_thumbnail_worker
+from ..services.thumbnail_cache import get_thumbnail_cache
+from ..services.thumbnail_bundle import BUNDLE_MEDIA_TYPE, iter_bundle
+from ..services.listing import (
+    TagSearchMode, VideoSort, SortOrder, VideoFilter, InvalidCursor, count_videos, fetch_video_page
+)
+from ..services.facets import get_facets
+from ..services.search import InvalidSearchQuery, search_videos
+from ..services.thumbnail_queue import LANE_ON_DEMAND, LANE_PREFETCH
 import socket
+import asyncio
+import json
+import re
+from email.utils import formatdate
 
 router = APIRouter()
 
+SCAN_EVENT_INTERVAL = 0.5  # 스캔 진행 상황 전송 간격 (초)
+MAX_PREFETCH_IDS = 500  # 한 번에 미리 생성을 요청할 수 있는 썸네일 수
+THUMBNAIL_RETRY_AFTER = 2  # 썸네일 생성 대기 중일 때 다시 요청할 간격 (초)
+MAX_BUNDLE_IDS = 100  # 한 번에 묶어서 받을 수 있는 썸네일 수
+THUMBNAIL_ID_PATTERN = re.compile(r"[0-9A-Za-z_-]{1,64}")  # 파일 경로로 사용되므로 허용 문자 제한
+SCAN_EVENT_KEEPALIVE = 15.0  # 변화가 없을 때 연결 유지용 주석 전송 간격 (초)
+
 # 요청 모델 추가
 class AddTagRequest(BaseModel):
     tag_name: str
 
-class TagSearchMode(str, Enum):
-    OR = "or"
-    AND = "and"
-
 class TagResponse(BaseModel):
     id: int
     name: str
@@ -42,6 +62,12 @@ class VideoResponse(BaseModel):
     thumbnail_id: str
     duration: float
     category: str | None
+    width: int | None = None
+    height: int | None = None
+    fps: float | None = None
+    codec: str | None = None
+    bitrate: int | None = None
+    file_size: int | None = None
     created_at: datetime
     updated_at: datetime
     tags: List[TagResponse]
@@ -55,103 +81,205 @@ class TagCreate(BaseModel):
 class UpdateVideoTags(BaseModel):
     tag_ids: List[int]
 
-@router.post("/scan", summary="비디오 파일 스캔", 
-    description="설정된 디렉토리들에서 비디오 파일들을 스캔하여 DB에 저장합니다.")
-def scan_directory(db: Session = Depends(get_db)):
+class ThumbnailPrefetchRequest(BaseModel):
+    thumbnail_ids: List[str]
+
+@router.post("/scan", status_code=202, summary="비디오 파일 스캔", 
+    description="설정된 디렉토리들에서 비디오 파일들을 스캔하는 백그라운드 작업을 시작합니다. "
+                "이미 실행 중인 스캔이 있으면 새 작업을 만들지 않고 해당 작업을 반환합니다. "
+                "실행 중인 스캔이 전체 스캔이 아닌데 full=true로 요청하면 그 스캔이 끝난 뒤 실행할 전체 스캔을 예약합니다.")
+def scan_directory(
+    full: bool = Query(False, description="디렉토리 저널을 무시하고 모든 디렉토리를 다시 읽습니다")
+):
     """
     config.yaml에 설정된 video_directories 경로들에서 비디오 파일들을 스캔하여 DB에 저장합니다.
     """
-    scan_videos(db)
-    return {"message": "Video scanning completed"}
+    job, created = scan_job_manager.start_scan(full=full)
+    if job.queued_after is not None:
+        message = "Full video scan queued after the running scan"
+    else:
+        message = "Video scanning started" if created else "Video scanning already in progress"
+    return {
+        "message": message,
+        "coalesced": not created,
+        **job.to_dict()
+    }
+
+@router.get("/scan/{job_id}", summary="스캔 작업 상태 조회",
+    description="스캔 작업의 상태와 진행 상황을 반환합니다.")
+def get_scan_job(job_id: str):
+    job = scan_job_manager.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Scan job not found")
+    return job.to_dict()
+
+@router.get("/scan/{job_id}/events", summary="스캔 진행 상황 스트림",
+    description="Server-Sent Events로 스캔 진행 상황(발견/분석/추가/삭제 파일 수, 썸네일 작업 수)을 전송합니다.")
+async def stream_scan_job(job_id: str, request: Request):
+    job = scan_job_manager.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Scan job not found")
+    
+    async def event_stream():
+        last_data = None
+        idle = 0.0
+        while not await request.is_disconnected():
+            finished = job.done.is_set()
+            data = jsonable_encoder(job.to_dict())
+            if data != last_data:
+                yield f"event: progress\ndata: {json.dumps(data)}\n\n"
+                last_data = data
+                idle = 0.0
+            elif idle >= SCAN_EVENT_KEEPALIVE:
+                yield ": keep-alive\n\n"
+                idle = 0.0
+            
+            if finished:
+                yield f"event: {job.status}\ndata: {json.dumps(data)}\n\n"
+                break
+            
+            await asyncio.sleep(SCAN_EVENT_INTERVAL)
+            idle += SCAN_EVENT_INTERVAL
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # nginx 프록시 버퍼링 비활성화
+        }
+    )
 
 @router.get("/list", 
     summary="비디오 목록 조회",
-    description="저장된 비디오 파일 목록을 페이징하여 반환합니다.")
+    description="저장된 비디오 파일 목록을 정렬하여 페이지 단위로 반환합니다. "
+                "cursor(이전 응답의 next_cursor) 를 지정하면 그 다음 페이지를, 지정하지 않으면 page 번호의 페이지를 반환합니다.")
 def list_videos(
     page: int = Query(1, ge=1),
     size: int = Query(25, ge=1, le=100),
     tag_ids: Optional[List[int]] = Query(None),
     tag_mode: TagSearchMode = Query(TagSearchMode.OR),
-    db: Session = Depends(get_db)
+    exclude_tag_ids: Optional[List[int]] = Query(None, description="이 태그 중 하나라도 가진 비디오는 제외"),
+    category: Optional[str] = Query(None),
+    sort: VideoSort = Query(VideoSort.ID, description="정렬 기준"),
+    order: SortOrder = Query(SortOrder.ASC, description="정렬 방향"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    db: Session = Depends(get_read_db)
 ):
-    offset = (page - 1) * size
+    filters = VideoFilter(tag_ids, tag_mode, exclude_tag_ids, category)
+    total = count_videos(db, filters)
     
-    # 태그 검색 조건 구성
-    query = db.query(Video)
-    if tag_ids:
-        if tag_mode == TagSearchMode.OR:
-            # OR 검색: 지정된 태그 중 하나라도 있는 비디오
-            query = query.filter(Video.tags.any(Tag.id.in_(tag_ids)))
-        else:
-            # AND 검색: 지정된 태그를 모두 가진 비디오
-            for tag_id in tag_ids:
-                query = query.filter(Video.tags.any(Tag.id == tag_id))
-    
-    # 전체 개수 조회
-    total = query.count()
-    
-    # 페이지네이션 적용
-    videos = query.offset(offset).limit(size).all()
+    # 태그는 페이지의 비디오들에 대해 한 번의 쿼리로 조회
+    try:
+        videos, next_cursor = fetch_video_page(
+            db, filters, sort, order, size, page, cursor,
+            options=(selectinload(Video.tags),)
+        )
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     total_pages = (total + size - 1) // size
     
-    # 비디오 목록 변환
-    items = []
-    for video in videos:
-        # 컨테이너 모드일 때 파일 경로를 호스트 경로로 변환
-        file_path = settings.get_host_path(video.file_path) if settings.CONTAINER_MODE else video.file_path
-        
-        items.append({
-            "id": video.id,
-            "file_path": file_path,
-            "file_name": video.file_name,
-            "thumbnail_id": video.thumbnail_id,
-            "duration": video.duration,
-            "category": video.category,
-            "created_at": video.created_at,
-            "updated_at": video.updated_at,
-            "tags": [
-                {"id": tag.id, "name": tag.name} 
-                for tag in video.tags
-            ]
-        })
+    return {
+        "items": [_video_item(video) for video in videos],
+        "total": total,
+        "page": page,
+        "size": size,
+        "pages": total_pages,
+        "next_cursor": next_cursor
+    }
+
+@router.get("/search",
+    summary="비디오 검색",
+    description="파일 이름, 경로, 카테고리에서 검색어를 찾아 관련도 순으로 페이지 단위로 반환합니다. "
+                "단어는 모두 포함해야 하며, 끝에 *를 붙이면 접두어로, \"...\" 로 묶으면 구문으로 검색합니다. "
+                "/list와 같은 필터 조건(tag_ids, tag_mode, exclude_tag_ids, category) 을 함께 사용할 수 있습니다.")
+def search(
+    q: str = Query(..., min_length=1, max_length=200, description="검색어"),
+    page: int = Query(1, ge=1),
+    size: int = Query(25, ge=1, le=100),
+    tag_ids: Optional[List[int]] = Query(None),
+    tag_mode: TagSearchMode = Query(TagSearchMode.OR),
+    exclude_tag_ids: Optional[List[int]] = Query(None),
+    category: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db)
+):
+    try:
+        videos, total = search_videos(db, q, VideoFilter(tag_ids, tag_mode, exclude_tag_ids, category), page, size)
+    except InvalidSearchQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {
-        "items": items,
+        "items": [_video_item(video) for video in videos],
         "total": total,
         "page": page,
         "size": size,
-        "pages": total_pages
+        "pages": (total + size - 1) // size
+    }
+
+def _video_item(video: Video) -> dict:
+    """비디오 목록 응답의 항목으로 변환합니다."""
+    # 컨테이너 모드일 때 파일 경로를 호스트 경로로 변환
+    file_path = settings.get_host_path(video.file_path) if settings.CONTAINER_MODE else video.file_path
+    
+    return {
+        "id": video.id,
+        "file_path": file_path,
+        "file_name": video.file_name,
+        "thumbnail_id": video.thumbnail_id,
+        "duration": video.duration,
+        "category": video.category,
+        "width": video.width,
+        "height": video.height,
+        "fps": video.fps,
+        "codec": video.codec,
+        "bitrate": video.bitrate,
+        "file_size": video.file_size,
+        "created_at": video.created_at,
+        "updated_at": video.updated_at,
+        "tags": [
+            {"id": tag.id, "name": tag.name} 
+            for tag in video.tags
+        ]
     }
 
 @router.get("/tags", summary="전체 태그 목록",
     description="사용 중인 모든 태그 목록을 반환합니다.")
-def list_tags(db: Session = Depends(get_db)):
+def list_tags(db: Session = Depends(get_read_db)):
     """모든 태그 목록을 반환합니다."""
     return get_all_tags(db)
 
+@router.get("/facets", summary="태그/카테고리별 비디오 수",
+    description="/list와 같은 필터 조건(tag_ids, tag_mode, exclude_tag_ids, category) 에 맞는 비디오 수와, "
+                "그 중 각 태그와 카테고리를 가진 비디오 수를 반환합니다. 조건에 쓰인 태그와 0개인 항목은 제외합니다.")
+def list_facets(
+    tag_ids: Optional[List[int]] = Query(None),
+    tag_mode: TagSearchMode = Query(TagSearchMode.OR),
+    exclude_tag_ids: Optional[List[int]] = Query(None),
+    category: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db)
+):
+    return get_facets(db, VideoFilter(tag_ids, tag_mode, exclude_tag_ids, category))
+
 @router.post("/tags", 
     response_model=TagResponse,
     summary="태그 생성",
     description="새로운 태그를 생성하거나, 이미 존재하는 태그의 정보를 반환합니다.")
 async def create_tag(tag: TagCreate, db: Session = Depends(get_db)):
     """태그를 생성하고 ID를 반환합니다."""
+    def create():
+        try:
+            # 이미 존재하면 기존 태그, 없으면 새 태그
+            new_tag = get_or_create_tag(db, tag.name)
+            db.commit()
+            return {"id": new_tag.id, "name": new_tag.name}
+        except Exception:
+            db.rollback()
+            raise
+
     try:
-        # 이미 존재하는 태그 확인
-        existing_tag = db.query(Tag).filter(Tag.name == tag.name).first()
-        if existing_tag:
-            return {"id": existing_tag.id, "name": existing_tag.name}
-        
-        # 새 태그 생성
-        new_tag = Tag(name=tag.name)
-        db.add(new_tag)
-        db.commit()
-        db.refresh(new_tag)
-        
-        return {"id": new_tag.id, "name": new_tag.name}
-        
+        return await run_write(create)
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/{video_id}/tags", 
@@ -160,62 +288,39 @@ async def create_tag(tag: TagCreate, db: Session = Depends(get_db)):
     description="비디오에 새로운 태그를 추가합니다. 태그가 존재하지 않으면 새로 생성합니다.")
 async def add_video_tag(
     video_id: int, 
-    tag: TagCreate
+    tag: TagCreate,
+    db: Session = Depends(get_db)
 ):
     """비디오에 태그를 추가합니다."""
-    db = next(get_db())
-    cursor = db.cursor()
-    
+    def add():
+        try:
+            video, _ = add_tag_to_video(db, video_id, tag.name)
+            if not video:
+                return None
+            added = next(video_tag for video_tag in video.tags if video_tag.name == tag.name)
+            return {"id": added.id, "name": added.name}
+        except Exception:
+            db.rollback()
+            raise
+
     try:
-        # 먼저 태그 생성 또는 조회
-        cursor.execute(
-            "SELECT id, name FROM tags WHERE name = ?",
-            (tag.name,)
-        )
-        existing_tag = cursor.fetchone()
-        
-        if existing_tag:
-            tag_id = existing_tag[0]
-        else:
-            cursor.execute(
-                "INSERT INTO tags (name) VALUES (?)",
-                (tag.name,)
-            )
-            tag_id = cursor.lastrowid
-        
-        # 비디오-태그 연결이 이미 존재하는지 확인
-        cursor.execute(
-            "SELECT 1 FROM video_tags WHERE video_id = ? AND tag_id = ?",
-            (video_id, tag_id)
-        )
-        if cursor.fetchone():
-            return {"id": tag_id, "name": tag.name}
-        
-        # 비디오-태그 연결
-        cursor.execute(
-            "INSERT INTO video_tags (video_id, tag_id) VALUES (?, ?)",
-            (video_id, tag_id)
-        )
-        db.commit()
-        
-        return {"id": tag_id, "name": tag.name}
-        
+        result = await run_write(add)
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        cursor.close()
+    if result is None:
+        raise HTTPException(status_code=404, detail="Video not found")
+    return result
 
 @router.delete("/{video_id}/tags/{tag_id}",
     summary="비디오에서 태그 제거",
     description="지정된 비디오에서 태그를 제거합니다.")
-def remove_tag(
+async def remove_tag(
     video_id: int,
     tag_id: int,
     db: Session = Depends(get_db)
 ):
     """비디오에서 태그를 제거합니다."""
-    video, removed = remove_video_tag(db, video_id, tag_id)
+    video, removed = await run_write(remove_video_tag, db, video_id, tag_id)
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
     
@@ -226,33 +331,170 @@ def remove_tag(
         "removed": removed
     }
 
+def request_thumbnails(db: Session, thumbnail_ids: List[str], lane: int) -> int:
+    """썸네일 생성 작업을 lane으로 앞당깁니다. 대기 중인 작업이 없고 썸네일도 없으면 새로 추가합니다.
+
+    Returns:
+        대기 중이거나 새로 추가된 작업 수
+    """
+    worker = get_thumbnail_worker(settings)
+    requested = 0
+    missing = []
+    for thumbnail_id in thumbnail_ids:
+        if worker.request(thumbnail_id, lane):
+            requested += 1
+        elif not worker.jobs.is_backing_off(thumbnail_id) and not has_all_sizes(thumbnail_id, settings):
+            # 최근 생성에 실패하여 재시도 대기 중인 썸네일은 제외
+            # (크기 설정이 추가되기 전에 생성된 썸네일은 빠진 크기를 다시 생성)
+            missing.append(thumbnail_id)
+
+    if missing:
+        rows = db.query(Video.thumbnail_id, Video.file_path).filter(Video.thumbnail_id.in_(missing))
+        for thumbnail_id, file_path in rows:
+            if worker.add_task(thumbnail_id, file_path, lane):
+                requested += 1
+    return requested
+
+@router.post("/thumbnails/prefetch",
+    summary="썸네일 미리 생성",
+    description="화면에 보이는 썸네일들을 스캔 작업보다 먼저 생성하도록 요청합니다.")
+async def prefetch_thumbnails(request: ThumbnailPrefetchRequest, db: Session = Depends(get_read_db)):
+    """지정한 썸네일들의 생성 작업을 prefetch 우선순위로 앞당깁니다."""
+    requested = await asyncio.to_thread(request_thumbnails, db, request.thumbnail_ids[:MAX_PREFETCH_IDS], LANE_PREFETCH)
+    return {"requested": requested}
+
+@router.get("/thumbnails/bundle",
+    summary="썸네일 묶음 조회",
+    description="여러 썸네일을 한 응답으로 반환합니다. ids를 지정하거나, 지정하지 않으면 /list와 같은 조건"
+                "(page, size, tag_ids, tag_mode, exclude_tag_ids, category, sort, order, cursor) 의 페이지에 있는 썸네일을 반환합니다. "
+                "응답은 항목마다 [u8 ID 길이][ID][u8 종류(0: 없음, 1: 포스터, 2: 애니메이션)][u32 길이][WebP] "
+                "형식의 바이너리 스트림입니다. (빅 엔디언)",
+    response_class=StreamingResponse)
+async def get_thumbnail_bundle(
+    ids: Optional[List[str]] = Query(None, description="썸네일 ID 목록 (최대 100개)"),
+    page: int = Query(1, ge=1),
+    size: int = Query(25, ge=1, le=100),
+    tag_ids: Optional[List[int]] = Query(None),
+    tag_mode: TagSearchMode = Query(TagSearchMode.OR),
+    exclude_tag_ids: Optional[List[int]] = Query(None),
+    category: Optional[str] = Query(None),
+    sort: VideoSort = Query(VideoSort.ID),
+    order: SortOrder = Query(SortOrder.ASC),
+    cursor: Optional[str] = Query(None),
+    thumbnail_size: Optional[int] = Query(None, gt=0, description="원하는 썸네일 최대 크기(px)"),
+    db: Session = Depends(get_read_db)
+):
+    """페이지의 썸네일들을 한 번의 요청으로 반환합니다.
+
+    없는 썸네일은 종류 0으로 표시하고 생성 작업을 가장 먼저 처리하도록 앞당기며,
+    포스터만 있는 썸네일은 애니메이션 생성을 앞당깁니다.
+    """
+    if ids:
+        thumbnail_ids = [thumbnail_id for thumbnail_id in ids[:MAX_BUNDLE_IDS] if THUMBNAIL_ID_PATTERN.fullmatch(thumbnail_id)]
+    else:
+        try:
+            thumbnail_ids, _ = await asyncio.to_thread(
+                fetch_video_page, db, VideoFilter(tag_ids, tag_mode, exclude_tag_ids, category),
+                sort, order, size, page, cursor,
+                entities=(Video.thumbnail_id,)
+            )
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    def find_files():
+        return [(thumbnail_id, find_thumbnail_file(thumbnail_id, settings, thumbnail_size)) for thumbnail_id in thumbnail_ids]
+    
+    files = await asyncio.to_thread(find_files)
+    missing = [thumbnail_id for thumbnail_id, found in files if found is None]
+    if missing:
+        await asyncio.to_thread(request_thumbnails, db, missing, LANE_ON_DEMAND)
+    worker = get_thumbnail_worker(settings)
+    for thumbnail_id, found in files:
+        if found is not None and not found.animated:
+            worker.request(thumbnail_id, LANE_PREFETCH)
+    
+    # 파일 읽기는 스트리밍하면서 스레드풀에서 처리
+    return StreamingResponse(
+        iter_bundle(files, get_thumbnail_cache(settings)),
+        media_type=BUNDLE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-store"}
+    )
+
+@router.get("/thumbnails/metrics",
+    summary="썸네일 생성 메트릭",
+    description="레인별 대기 작업 수, 실행 중인 작업 수, 분당 완료/실패 수, 단계별(decode/resize/encode) 지연 시간 "
+                "히스토그램, 워커 프로세스별 메모리(RSS) 를 반환합니다. thumbnails.max_workers 조정에 사용합니다.")
+def get_thumbnail_metrics():
+    """썸네일 워커의 메트릭을 반환합니다."""
+    return {
+        **get_thumbnail_worker(settings).get_metrics(),
+        "cache": get_thumbnail_cache(settings).stats(),
+    }
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더에 etag가 포함되어 있는지 확인합니다. (약한 비교)"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
 @router.get("/thumbnails/{thumbnail_id}", 
     summary="썸네일 이미지 조회",
-    description="지정된 ID의 썸네일 이미지를 반환합니다.",
-    response_class=FileResponse)
-async def get_thumbnail(thumbnail_id: str):
-    """썸네일 이미지를 반환합니다."""
+    description="지정된 ID의 썸네일 이미지를 반환합니다. size를 지정하면 thumbnails.sizes 중 알맞은 크기를 반환합니다. "
+                "v(비디오가 바뀌면 달라지는 값, 예: updated_at) 를 지정하면 완성된 썸네일을 변경 불가(immutable) 로 캐싱합니다.",
+    response_class=Response)
+async def get_thumbnail(
+    thumbnail_id: str,
+    request: Request,
+    size: Optional[int] = Query(None, gt=0, description="원하는 최대 크기(px). 이 크기 이상인 가장 작은 생성 크기를 반환합니다."),
+    v: Optional[str] = Query(None, description="썸네일 버전. 비디오가 바뀌면 달라지는 값을 지정합니다."),
+    db: Session = Depends(get_read_db)
+):
+    """썸네일 이미지를 반환합니다. 애니메이션 썸네일이 생성되기 전에는 정지 이미지(포스터) 를 반환합니다.
+
+    썸네일이 없으면 생성 작업을 가장 먼저 처리하도록 앞당기고, 포스터만 있으면 애니메이션 생성을 앞당깁니다.
+    파일의 mtime과 크기로 만든 ETag로 조건부 요청(If-None-Match) 에 304를 반환합니다.
+    """
     try:
-        thumbnail_path = settings.get_thumbnail_path(thumbnail_id)
+        found = await asyncio.to_thread(find_thumbnail_file, thumbnail_id, settings, size)
         
-        if not os.path.exists(thumbnail_path):
+        if found is None:
+            queued = await asyncio.to_thread(request_thumbnails, db, [thumbnail_id], LANE_ON_DEMAND)
             raise HTTPException(
                 status_code=404, 
-                detail="Thumbnail not found"
+                detail="Thumbnail not found",
+                headers={'Retry-After': str(THUMBNAIL_RETRY_AFTER)} if queued else None
             )
-            
+        
+        worker = get_thumbnail_worker(settings)
+        if not found.animated:
+            worker.request(thumbnail_id, LANE_PREFETCH)
+        
+        # 버전이 지정된 완성된 썸네일만 변경 불가로 캐싱
+        # (포스터나 다시 생성될 썸네일은 매번 ETag로 확인)
+        if v is not None and found.animated and not worker.is_pending(thumbnail_id):
+            cache_control = 'public, max-age=31536000, immutable'
+        else:
+            cache_control = 'no-cache'
+        etag = f'"{found.mtime_ns:x}-{found.size:x}"'
         headers = {
-            'Cache-Control': 'public, max-age=600',  # 10분 캐싱
-            'Expires': (datetime.now() + timedelta(minutes=10)).strftime('%a, %d %b %Y %H:%M:%S GMT')
+            'Cache-Control': cache_control,
+            'ETag': etag,
+            'Last-Modified': formatdate(found.mtime_ns / 1e9, usegmt=True),
         }
-            
-        return FileResponse(
-            path=thumbnail_path,
-            media_type="image/webp",
-            filename=f"{thumbnail_id}.webp",
-            headers=headers
-        )
         
+        if _etag_matches(request.headers.get('if-none-match'), etag):
+            return Response(status_code=304, headers=headers)
+        
+        cache = get_thumbnail_cache(settings)
+        content = cache.get(found.path, found.mtime_ns, found.size)
+        if content is None:
+            content = await asyncio.to_thread(cache.load, found.path, found.mtime_ns, found.size)
+        
+        return Response(content=content, media_type="image/webp", headers=headers)
+        
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -262,9 +504,9 @@ async def get_thumbnail(thumbnail_id: str):
 @router.post("/play/{video_id}", 
     summary="비디오 재생",
     description="로컬 시스템에서 비디오 파일을 재생합니다.")
-async def play_video(video_id: int, db: Session = Depends(get_db)):
+async def play_video(video_id: int, db: Session = Depends(get_read_db)):
     """비디오 파일을 시스템 기본 플레이어로 재생합니다."""
-    video = db.query(Video).filter(Video.id == video_id).first()
+    video = await asyncio.to_thread(db.get, Video, video_id)
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
     
@@ -276,12 +518,8 @@ async def play_video(video_id: int, db: Session = Depends(get_db)):
             logger.info(f"Converted path: {host_path}")
             
             try:
-                # TCP 소켓으로 파일 경로 전송
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                    logger.info(f"Connecting to player at {settings.PLAYER_HOST}:{settings.PLAYER_PORT}")
-                    sock.connect((settings.PLAYER_HOST, settings.PLAYER_PORT))
-                    sock.sendall(f"{host_path}\n".encode('utf-8'))
-                    logger.info("Sent file path to player")
+                # TCP 소켓으로 파일 경로 전송 (연결 대기 중 이벤트 루프를 막지 않도록 스레드에서 실행)
+                await asyncio.to_thread(send_to_player, host_path)
             except ConnectionRefusedError:
                 raise HTTPException(
                     status_code=500,
@@ -294,9 +532,11 @@ async def play_video(video_id: int, db: Session = Depends(get_db)):
                 )
         else:
             # 로컬 모드에서는 기존 방식대로 직접 실행
-            os.startfile(video.file_path)
+            await asyncio.to_thread(os.startfile, video.file_path)
             
         return {"status": "success"}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error playing video: {e}")
         raise HTTPException(
@@ -304,35 +544,48 @@ async def play_video(video_id: int, db: Session = Depends(get_db)):
             detail=f"Failed to play video: {str(e)}"
         )
 
+def send_to_player(host_path: str):
+    """플레이어 서비스에 재생할 파일 경로를 보냅니다."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        logger.info(f"Connecting to player at {settings.PLAYER_HOST}:{settings.PLAYER_PORT}")
+        sock.connect((settings.PLAYER_HOST, settings.PLAYER_PORT))
+        sock.sendall(f"{host_path}\n".encode('utf-8'))
+        logger.info("Sent file path to player")
+
 @router.put("/{video_id}/tags",
     response_model=List[TagResponse],
     summary="비디오 태그 목록 갱신",
     description="비디오의 태그 목록을 갱신합니다. 요청에 포함되지 않은 기존 태그는 삭제됩니다.")
 async def update_video_tags(video_id: int, update: UpdateVideoTags, db: Session = Depends(get_db)):
     """비디오의 태그 목록을 갱신합니다."""
-    try:
-        # 비디오 조회
-        video = db.query(Video).filter(Video.id == video_id).first()
-        if not video:
-            raise HTTPException(status_code=404, detail="Video not found")
-
-        # 요청된 태그들이 실제로 존재하는지 확인
-        tags = db.query(Tag).filter(Tag.id.in_(update.tag_ids)).all()
-        if len(tags) != len(update.tag_ids):
-            raise HTTPException(status_code=400, detail="Some tag IDs are invalid")
-        
-        # 태그 목록 업데이트
-        video.tags = tags
-        db.commit()
+    def update_tags():
+        try:
+            # 비디오 조회
+            video = db.query(Video).filter(Video.id == video_id).first()
+            if not video:
+                raise HTTPException(status_code=404, detail="Video not found")
 
-        # info 파일 업데이트
-        tag_list = [{"id": tag.id, "name": tag.name} for tag in tags]
-        update_video_info(video.file_path, {"tags": tag_list})
-        
-        return tag_list
-        
+            # 요청된 태그들이 실제로 존재하는지 확인
+            tags = db.query(Tag).filter(Tag.id.in_(update.tag_ids)).all()
+            if len(tags) != len(update.tag_ids):
+                raise HTTPException(status_code=400, detail="Some tag IDs are invalid")
+            
+            # 태그 목록 업데이트
+            video.tags = tags
+            db.commit()
+
+            # info 파일 업데이트
+            tag_list = [{"id": tag.id, "name": tag.name} for tag in tags]
+            update_video_info(video.file_path, {"tags": tag_list})
+            
+            return tag_list
+        except Exception:
+            db.rollback()
+            raise
+
+    try:
+        return await run_write(update_tags)
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
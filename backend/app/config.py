@@ -2,7 +2,7 @@ import os
 import yaml
 import logging
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 
 # 로거 설정
 logger = logging.getLogger(__name__)
@@ -37,7 +37,14 @@ class Settings:
             default_config = {
                 "video_directories": ["D:/videos"],
                 "database": {
-                    "path": "D:/videos/videos.db"
+                    "path": "D:/videos/videos.db",
+                    "journal_mode": "wal",
+                    "synchronous": "normal",
+                    "cache_size_mb": 32,
+                    "mmap_size_mb": 256,
+                    "temp_store": "memory",
+                    "busy_timeout": 30.0,
+                    "read_pool_size": 4
                 },
                 "thumbnails": {
                     "directory": "D:/videos/thumbnails",
@@ -45,7 +52,25 @@ class Settings:
                     "duration": 3.0,
                     "fps": 5.0,
                     "max_size": 480,
-                    "max_workers": 6
+                    "sizes": [320],
+                    "max_workers": 6,
+                    "max_in_flight": 12,
+                    "sampling": "auto",
+                    "quality": 80,
+                    "method": 6,
+                    "poster_quality": 75,
+                    "poster_method": 0,
+                    "cache_size_mb": 64
+                },
+                "scan": {
+                    "max_workers": 8,
+                    "startup": "deferred"
+                },
+                "watcher": {
+                    "enabled": False,
+                    "polling": False,
+                    "poll_interval": 30.0,
+                    "debounce": 3.0
                 }
             }
             os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
@@ -57,7 +82,27 @@ class Settings:
             config = yaml.safe_load(f)
         
         self.VIDEO_DIRECTORIES = config["video_directories"]
-        self.DATABASE_PATH = config["database"]["path"]
+        database = config["database"]
+        self.DATABASE_PATH = database["path"]
+        # SQLite 연결 설정 (연결마다 PRAGMA로 적용)
+        self.DATABASE_JOURNAL_MODE = str(database.get("journal_mode", "wal")).lower()
+        if self.DATABASE_JOURNAL_MODE not in ("wal", "delete", "truncate", "persist"):
+            logger.error(f"Unknown database.journal_mode value: {self.DATABASE_JOURNAL_MODE}, using 'wal'")
+            self.DATABASE_JOURNAL_MODE = "wal"
+        self.DATABASE_SYNCHRONOUS = str(database.get("synchronous", "normal")).lower()
+        if self.DATABASE_SYNCHRONOUS not in ("off", "normal", "full", "extra"):
+            logger.error(f"Unknown database.synchronous value: {self.DATABASE_SYNCHRONOUS}, using 'normal'")
+            self.DATABASE_SYNCHRONOUS = "normal"
+        self.DATABASE_CACHE_SIZE_MB = max(0, int(database.get("cache_size_mb", 32)))  # 연결마다 따로 사용
+        self.DATABASE_MMAP_SIZE_MB = max(0, int(database.get("mmap_size_mb", 256)))
+        self.DATABASE_TEMP_STORE = str(database.get("temp_store", "memory")).lower()
+        if self.DATABASE_TEMP_STORE not in ("default", "file", "memory"):
+            logger.error(f"Unknown database.temp_store value: {self.DATABASE_TEMP_STORE}, using 'memory'")
+            self.DATABASE_TEMP_STORE = "memory"
+        # 잠금(다른 쓰기 작업) 을 기다리는 최대 시간 (초)
+        self.DATABASE_BUSY_TIMEOUT = max(0.0, float(database.get("busy_timeout", 30.0)))
+        # 조회(GET) 요청용 읽기 전용 연결 수
+        self.DATABASE_READ_POOL_SIZE = max(1, int(database.get("read_pool_size", 4)))
         
         thumbnails = config["thumbnails"]
         self.THUMBNAIL_DIR = thumbnails["directory"]
@@ -65,7 +110,49 @@ class Settings:
         self.THUMBNAIL_DURATION = float(thumbnails.get("duration", 3.0))
         self.THUMBNAIL_FPS = float(thumbnails.get("fps", 10.0))
         self.THUMBNAIL_MAX_SIZE = int(thumbnails.get("max_size", 480))
+        # 함께 생성하는 작은 크기들 (같은 디코딩 결과에서 크기만 줄여 저장, max_size보다 큰 값은 무시)
+        self.THUMBNAIL_SIZES = [self.THUMBNAIL_MAX_SIZE]
+        for size in thumbnails.get("sizes", [320]) or []:
+            try:
+                size = int(size)
+            except (TypeError, ValueError):
+                logger.error(f"Invalid thumbnails.sizes value: {size}")
+                continue
+            if 0 < size < self.THUMBNAIL_MAX_SIZE and size not in self.THUMBNAIL_SIZES:
+                self.THUMBNAIL_SIZES.append(size)
+        self.THUMBNAIL_SIZES.sort()
         self.THUMBNAIL_MAX_WORKERS = int(thumbnails.get("max_workers", 4))
+        # 프로세스 풀에 동시에 제출하는 작업 수 (기본: 워커당 2개, 워커 수보다 작을 수 없음)
+        self.THUMBNAIL_MAX_IN_FLIGHT = max(
+            self.THUMBNAIL_MAX_WORKERS,
+            int(thumbnails.get("max_in_flight", self.THUMBNAIL_MAX_WORKERS * 2))
+        )
+        self.THUMBNAIL_SAMPLING = str(thumbnails.get("sampling", "auto")).lower()
+        if self.THUMBNAIL_SAMPLING not in ("auto", "grab", "seek"):
+            logger.error(f"Unknown thumbnails.sampling value: {self.THUMBNAIL_SAMPLING}, using 'auto'")
+            self.THUMBNAIL_SAMPLING = "auto"
+        # WebP 인코딩 설정 (method: 0(빠름) ~ 6(최상의 압축))
+        self.THUMBNAIL_QUALITY = int(thumbnails.get("quality", 80))
+        self.THUMBNAIL_METHOD = int(thumbnails.get("method", 6))
+        self.THUMBNAIL_POSTER_QUALITY = int(thumbnails.get("poster_quality", 75))
+        self.THUMBNAIL_POSTER_METHOD = int(thumbnails.get("poster_method", 0))
+        # 자주 조회되는 썸네일 파일을 메모리에 보관하는 캐시 크기 (0이면 사용 안 함)
+        self.THUMBNAIL_CACHE_SIZE_MB = max(0, int(thumbnails.get("cache_size_mb", 64)))
+        
+        # 스캔 설정
+        scan = config.get("scan", {})
+        self.SCAN_MAX_WORKERS = int(scan.get("max_workers", 8))
+        self.SCAN_STARTUP_MODE = str(scan.get("startup", "deferred")).lower()
+        if self.SCAN_STARTUP_MODE not in ("deferred", "blocking"):
+            logger.error(f"Unknown scan.startup value: {self.SCAN_STARTUP_MODE}, using 'deferred'")
+            self.SCAN_STARTUP_MODE = "deferred"
+        
+        # 파일 감시 설정
+        watcher = config.get("watcher", {})
+        self.WATCHER_ENABLED = bool(watcher.get("enabled", False))
+        self.WATCHER_POLLING = bool(watcher.get("polling", False))
+        self.WATCHER_POLL_INTERVAL = float(watcher.get("poll_interval", 30.0))
+        self.WATCHER_DEBOUNCE = float(watcher.get("debounce", 3.0))
         
         # 컨테이너 모드 설정
         container_config = config.get("container", {})
@@ -98,9 +185,32 @@ class Settings:
                 logger.error(f"Failed to load docker-compose.yml: {e}")
                 self.volume_mounts = {}
 
-    def get_thumbnail_path(self, thumbnail_id: str) -> str:
-        """썸네일 파일의 전체 경로를 반환합니다."""
-        return os.path.join(self.THUMBNAIL_DIR, f"{thumbnail_id}{self.THUMBNAIL_EXT}")
+    def get_thumbnail_path(self, thumbnail_id: str, size: Optional[int] = None) -> str:
+        """썸네일 파일의 전체 경로를 반환합니다. size를 지정하면 해당 크기의 파일 경로를 반환합니다."""
+        suffix = "" if size is None or size == self.THUMBNAIL_MAX_SIZE else f"_{size}"
+        return os.path.join(self.THUMBNAIL_DIR, f"{thumbnail_id}{suffix}{self.THUMBNAIL_EXT}")
+
+    def get_poster_path(self, thumbnail_id: str, size: Optional[int] = None) -> str:
+        """정지 이미지 썸네일(포스터) 파일의 전체 경로를 반환합니다."""
+        suffix = "" if size is None or size == self.THUMBNAIL_MAX_SIZE else f"_{size}"
+        return os.path.join(self.THUMBNAIL_DIR, f"{thumbnail_id}_poster{suffix}{self.THUMBNAIL_EXT}")
+
+    def get_rendition_paths(self, thumbnail_id: str, poster: bool = False) -> dict[int, str]:
+        """max_size 외에 함께 생성하는 크기별 파일 경로를 반환합니다. (크기 -> 경로)"""
+        get_path = self.get_poster_path if poster else self.get_thumbnail_path
+        return {
+            size: get_path(thumbnail_id, size)
+            for size in self.THUMBNAIL_SIZES
+            if size != self.THUMBNAIL_MAX_SIZE
+        }
+
+    def get_thumbnail_files(self, thumbnail_id: str) -> list[str]:
+        """비디오 하나에 대해 생성되는 모든 썸네일 파일 경로를 반환합니다."""
+        return [
+            path
+            for size in self.THUMBNAIL_SIZES
+            for path in (self.get_thumbnail_path(thumbnail_id, size), self.get_poster_path(thumbnail_id, size))
+        ]
 
     def get_host_path(self, container_path: str) -> str:
         """컨테이너 내부 경로를 호스트 경로로 변환"""
@@ -1,32 +1,199 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, exc
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Callable, Iterator, List, Optional, Tuple
+import asyncio
+import threading
 from .config import settings
+from .logger import logger
 import os
 
 Base = declarative_base()
 
+# 목록 조회 결과에 영향을 주는 테이블 (변경되면 라이브러리 세대 증가)
+LIBRARY_TABLES = frozenset({"videos", "tags", "video_tags"})
+
+# 라이브러리 세대: 스캔, 태그 편집 등으로 위 테이블이 변경되어 커밋될 때마다 증가
+# (목록 전체 개수 등 조회 결과 캐시의 무효화 기준)
+_library_generation = 0
+_generation_lock = threading.Lock()
+
+# 라이브러리 변경이 커밋될 때 세대를 올리기 전에 호출할 함수들 (메모리 인덱스 갱신 등)
+_commit_hooks: List[Callable] = []
+
+# 쓰기 트랜잭션 직렬화: 트랜잭션의 첫 쓰기 문에서 잡고 연결이 풀로 반환될 때(커밋/롤백 후) 놓음
+# (조회만 하는 동안에는 잡지 않으므로 스캔의 긴 조회가 태그 편집을 막지 않고,
+#  쓰기끼리는 SQLite의 잠금 재시도 대신 순서대로 대기)
+_write_lock = threading.Lock()
+_WRITE_LOCK_KEY = "holds_write_lock"
+_READ_STATEMENTS = ("SELECT", "PRAGMA", "EXPLAIN")
+
+# 비동기 API의 쓰기 작업(쓰기 세션 사용, info 파일 저장) 을 실행할 스레드
+# (쓰기 잠금을 기다리는 요청이 조회 요청이나 썸네일 파일 읽기에 쓰이는 스레드를 차지하지 않도록 분리)
+WRITE_WORKERS = 2
+_write_executor = ThreadPoolExecutor(max_workers=WRITE_WORKERS, thread_name_prefix="db-write")
+
+# 요청별 실행 쿼리 수 (track_queries 안에서만 집계)
+_query_counter: ContextVar[Optional[List[int]]] = ContextVar("query_counter", default=None)
+
+def get_library_generation() -> int:
+    """현재 라이브러리 세대를 반환합니다."""
+    return _library_generation
+
+def bump_library_generation():
+    """라이브러리 세대를 증가시킵니다. (ORM을 거치지 않고 라이브러리 테이블을 변경한 경우 호출)"""
+    global _library_generation
+    with _generation_lock:
+        _library_generation += 1
+
+def add_commit_hook(hook: Callable):
+    """라이브러리 테이블 변경이 커밋되면 hook(session) 을 호출합니다. 세대는 hook이 끝난 뒤에 올라갑니다."""
+    _commit_hooks.append(hook)
+
+def _is_library_object(obj) -> bool:
+    return getattr(type(obj), "__tablename__", None) in LIBRARY_TABLES
+
+def _on_flush(session, flush_context):
+    if any(_is_library_object(obj) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["library_changed"] = True
+
+def _on_orm_execute(orm_execute_state):
+    # insert()/update()/delete() 문이나 query().delete() 같은 일괄 변경은 flush를 거치지 않음
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if getattr(table, "name", None) in LIBRARY_TABLES:
+            orm_execute_state.session.info["library_changed"] = True
+
+def _on_commit(session):
+    if session.info.pop("library_changed", False):
+        for hook in _commit_hooks:
+            try:
+                hook(session)
+            except Exception as e:
+                logger.error(f"Error in commit hook: {str(e)}")
+        bump_library_generation()
+
+def _on_rollback(session):
+    session.info.pop("library_changed", None)
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_counter.get()
+    if counter is not None:
+        counter[0] += 1
+
+def _acquire_write_lock(conn, cursor, statement, parameters, context, executemany):
+    if conn.info.get(_WRITE_LOCK_KEY) or statement.lstrip()[:7].upper().startswith(_READ_STATEMENTS):
+        return
+    if not _write_lock.acquire(timeout=settings.DATABASE_BUSY_TIMEOUT):
+        raise exc.TimeoutError("Timed out waiting for another database write to finish")
+    conn.info[_WRITE_LOCK_KEY] = True
+
+def _release_write_lock(dbapi_connection, connection_record):
+    if connection_record is not None and connection_record.info.pop(_WRITE_LOCK_KEY, False):
+        _write_lock.release()
+
+async def run_write(func: Callable, *args):
+    """func(*args) 를 쓰기 작업 스레드에서 실행하고 결과를 기다립니다. (이벤트 루프를 막지 않음)"""
+    context = copy_context()  # 요청별 쿼리 수 집계 유지
+    return await asyncio.get_running_loop().run_in_executor(_write_executor, context.run, func, *args)
+
+@contextmanager
+def track_queries() -> Iterator[List[int]]:
+    """블록 안에서 실행된 쿼리 수를 셉니다. 반환된 리스트의 첫 항목이 쿼리 수입니다."""
+    counter = [0]
+    token = _query_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _query_counter.reset(token)
+
+def sqlite_pragmas(read_only: bool = False) -> List[Tuple[str, object]]:
+    """설정에 따라 연결마다 적용할 PRAGMA 목록을 반환합니다."""
+    pragmas = [
+        ("busy_timeout", int(settings.DATABASE_BUSY_TIMEOUT * 1000)),
+        ("synchronous", settings.DATABASE_SYNCHRONOUS.upper()),
+        ("cache_size", -settings.DATABASE_CACHE_SIZE_MB * 1024),  # 음수는 KiB 단위
+        ("mmap_size", settings.DATABASE_MMAP_SIZE_MB * 1024 * 1024),
+        ("temp_store", settings.DATABASE_TEMP_STORE.upper()),
+        ("foreign_keys", "ON"),  # 연결마다 켜야 함 (비디오/태그 삭제 시 video_tags ON DELETE CASCADE 적용)
+    ]
+    if read_only:
+        pragmas.append(("query_only", "ON"))
+    else:
+        # 저널 방식은 DB 파일에 저장되므로 쓰기 연결에서만 설정
+        pragmas.insert(0, ("journal_mode", settings.DATABASE_JOURNAL_MODE.upper()))
+    return pragmas
+
+def _pragma_listener(pragmas: List[Tuple[str, object]]):
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+    return apply_pragmas
+
+def _create_engine(read_only: bool):
+    pool_options = {}
+    if read_only:
+        pool_options = {
+            "pool_size": settings.DATABASE_READ_POOL_SIZE,
+            "max_overflow": 0,
+            "pool_timeout": settings.DATABASE_BUSY_TIMEOUT,
+        }
+    engine = create_engine(
+        f"sqlite:///{settings.DATABASE_PATH}",
+        connect_args={"check_same_thread": False, "timeout": settings.DATABASE_BUSY_TIMEOUT},
+        poolclass=QueuePool,
+        **pool_options
+    )
+    event.listen(engine, "connect", _pragma_listener(sqlite_pragmas(read_only)))
+    event.listen(engine, "before_cursor_execute", _count_query)
+    if not read_only:
+        event.listen(engine, "before_cursor_execute", _acquire_write_lock)
+        event.listen(engine, "checkin", _release_write_lock)
+    return engine
+
 def init_db():
-    """데이터베이스를 초기화합니다."""
+    """데이터베이스를 초기화합니다.
+
+    스캔, 태그 편집 등의 쓰기 트랜잭션은 쓰기 잠금으로 하나씩 실행되고,
+    조회 요청은 WAL 덕분에 쓰기 중에도 읽기 전용 연결 풀에서 실행됩니다.
+
+    Returns:
+        (쓰기 엔진, 쓰기 세션 팩토리, 읽기 전용 세션 팩토리)
+    """
     # DB 디렉토리 생성
     db_dir = os.path.dirname(settings.DATABASE_PATH)
     if not os.path.exists(db_dir):
         os.makedirs(db_dir)
 
-    # SQLite 엔진 생성
-    engine = create_engine(
-        f"sqlite:///{settings.DATABASE_PATH}",
-        connect_args={"check_same_thread": False}
-    )
+    # SQLite 엔진 생성 (쓰기 연결에서 저널 방식을 먼저 적용한 뒤 읽기 연결을 만듦)
+    engine = _create_engine(read_only=False)
+    with engine.connect() as conn:
+        journal_mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+    logger.info(f"SQLite journal mode: {journal_mode}")
+    read_engine = _create_engine(read_only=True)
     
     # 세션 팩토리 생성
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    event.listen(SessionLocal, "after_flush", _on_flush)
+    event.listen(SessionLocal, "do_orm_execute", _on_orm_execute)
+    event.listen(SessionLocal, "after_commit", _on_commit)
+    event.listen(SessionLocal, "after_rollback", _on_rollback)
+    ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
     
-    return engine, SessionLocal
+    return engine, SessionLocal, ReadSessionLocal
 
 # DB 초기화는 main.py에서 settings 초기화 후에 수행
 engine = None
 SessionLocal = None
+ReadSessionLocal = None
 
 def get_db():
     global SessionLocal  # 전역 변수 참조
@@ -37,4 +204,15 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close() 
+
+def get_read_db():
+    """조회 전용 세션 (읽기 전용 연결 풀, 쓰기를 시도하면 오류)"""
+    if ReadSessionLocal is None:
+        raise RuntimeError("Database not initialized")
+    
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
\ No newline at end of file
@@ -1,13 +1,16 @@
 import signal
 import sys
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import uvicorn
 import logging
 import argparse
 from .config import settings
-from .database import Base, init_db, get_db
+from .database import init_db, get_db, track_queries
 
 logger = logging.getLogger(__name__)
 
@@ -20,36 +23,58 @@ async def lifespan(app: FastAPI):
     """서버 시작/종료 시 실행되는 이벤트 핸들러"""
     # 데이터베이스 초기화
     global engine, SessionLocal
-    engine, SessionLocal = init_db()
+    engine, SessionLocal, ReadSessionLocal = init_db()
     
     # database.py의 전역 변수도 설정
     from . import database
     database.engine = engine
     database.SessionLocal = SessionLocal
+    database.ReadSessionLocal = ReadSessionLocal
     
-    # DB 테이블 생성
-    Base.metadata.create_all(bind=engine)
+    # DB 테이블 생성 및 기존 DB 파일의 스키마를 최신 버전으로 변경 (검색 색인 포함)
+    from .migrations import migrate
+    migrate(engine)
     
-    # 초기 비디오 스캔
+    # 태그 필터용 메모리 인덱스 (이후 커밋되는 태그 변경은 자동 반영)
+    from .services.tag_index import tag_index
+    tag_index.install(SessionLocal)
+    with ReadSessionLocal() as db:
+        tag_index.build(db)
+    
+    # 썸네일 워커 시작 (이전 실행에서 완료되지 않은 썸네일 작업 재개)
+    from .services.thumbnail_worker import get_thumbnail_worker
+    get_thumbnail_worker(settings)
+    
+    # 초기 비디오 스캔 (deferred: 백그라운드 실행, blocking: 완료 후 요청 수신)
     try:
-        from .services.scanner import scan_videos
-        db = next(get_db())
-        try:
-            scan_videos(db)
-            logger.info("Initial video scan completed")
-        finally:
-            db.close()
+        from .services.scan_jobs import scan_job_manager
+        job = scan_job_manager.start_initial_scan()
+        if settings.SCAN_STARTUP_MODE == "blocking":
+            await asyncio.to_thread(job.done.wait)
+            if job.status == "completed":
+                logger.info("Initial video scan completed")
+            else:
+                logger.error(f"Initial video scan failed: {job.error}")
+        else:
+            logger.info(f"Initial video scan started in background (job {job.id})")
     except Exception as e:
         logger.error(f"Error during initial video scan: {str(e)}")
         import traceback
         logger.error(f"Traceback: {traceback.format_exc()}")
     
+    # 파일 감시 시작
+    if settings.WATCHER_ENABLED:
+        from .services.watcher import start_library_watcher
+        start_library_watcher(settings)
+    
     yield  # 서버 실행 중
     
     # 종료 시 실행
     logger.info("Shutting down...")
+    from .services.watcher import shutdown_library_watcher
     from .services.thumbnail_worker import shutdown_thumbnail_worker
     from .logger import shutdown_logger
+    shutdown_library_watcher()  # 파일 감시 종료
     shutdown_thumbnail_worker()  # 썸네일 워커 종료
     shutdown_logger()  # 로그 리스너 종료
 
@@ -92,6 +117,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def count_queries(request: Request, call_next):
+    """요청 처리 중 실행된 DB 쿼리 수를 X-Query-Count 헤더로 반환합니다. (스트리밍 본문의 쿼리는 제외)"""
+    with track_queries() as counter:
+        response = await call_next(request)
+    response.headers["X-Query-Count"] = str(counter[0])
+    return response
+
 # 라우터 등록
 from .api import videos
 app.include_router(videos.router, prefix="/api/videos", tags=["videos"])
@@ -100,6 +133,36 @@ app.include_router(videos.router, prefix="/api/videos", tags=["videos"])
 def read_root():
     return {"message": "Welcome to Video Manager"}
 
+@app.get("/health/live", summary="서버 동작 확인")
+def liveness():
+    """프로세스가 요청을 처리할 수 있으면 항상 200을 반환합니다."""
+    return {"status": "ok"}
+
+@app.get("/health/ready", summary="초기 동기화 완료 확인")
+def readiness():
+    """첫 라이브러리 스캔이 성공했으면 200, 아직 진행 중이거나 실패했으면 503을 반환합니다.
+
+    초기 스캔이 실패하면 status는 failed이고 error에 실패 원인을 담으며, 이후 스캔이 성공하면 ready가 됩니다.
+    """
+    from .services.scan_jobs import scan_job_manager
+    job = scan_job_manager.initial_job
+    ready = scan_job_manager.is_ready()
+    if ready:
+        status = "ready"
+    elif job is not None and job.status == "failed":
+        status = "failed"
+    else:
+        status = "starting"
+    body = {
+        "status": status,
+        "error": job.error if status == "failed" else None,
+        "initial_scan": job.to_dict() if job else None
+    }
+    return JSONResponse(
+        content=jsonable_encoder(body),
+        status_code=200 if ready else 503
+    )
+
 # 종료 플래그
 should_exit = False
 
@@ -110,6 +173,12 @@ def signal_handler(signum, frame):
         logger.info("Received shutdown signal, cleaning up...")
         should_exit = True
         
+        try:
+            from .services.watcher import shutdown_library_watcher
+            shutdown_library_watcher()
+        except Exception as e:
+            logger.error(f"Error during library watcher shutdown: {e}")
+        
         try:
             # 리소스 정리
             from .services.thumbnail_worker import shutdown_thumbnail_worker
@@ -0,0 +1,108 @@
+from typing import Callable, List, Tuple
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from .database import Base
+from .logger import logger
+from .services.search import create_search_index
+
+def _add_video_tags_primary_key(conn: Connection):
+    """video_tags에 (video_id, tag_id) 기본 키를 추가합니다."""
+    # SQLite는 기존 테이블에 기본 키를 추가할 수 없으므로 새 테이블로 복사한 뒤 교체
+    conn.execute(text("DROP TABLE IF EXISTS video_tags_new"))  # 이전에 중단된 마이그레이션의 남은 테이블
+    conn.execute(text(
+        "CREATE TABLE video_tags_new ("
+        "video_id INTEGER NOT NULL REFERENCES videos (id) ON DELETE CASCADE, "
+        "tag_id INTEGER NOT NULL REFERENCES tags (id) ON DELETE CASCADE, "
+        "PRIMARY KEY (video_id, tag_id)) WITHOUT ROWID"
+    ))
+    # 중복 연결과 삭제된 비디오/태그를 가리키는 연결은 복사하지 않음
+    copied = conn.execute(text("""
+        INSERT OR IGNORE INTO video_tags_new (video_id, tag_id)
+        SELECT video_id, tag_id FROM video_tags
+        WHERE video_id IN (SELECT id FROM videos) AND tag_id IN (SELECT id FROM tags)
+    """)).rowcount
+    total = conn.execute(text("SELECT COUNT(*) FROM video_tags")).scalar()
+    conn.execute(text("DROP TABLE video_tags"))
+    conn.execute(text("ALTER TABLE video_tags_new RENAME TO video_tags"))
+    if total != copied:
+        logger.info(f"Removed {total - copied} duplicate or orphaned video_tags rows")
+
+def _add_video_tags_tag_index(conn: Connection):
+    """태그별 비디오 조회(태그 필터, 사용되지 않는 태그 정리) 용 역방향 인덱스"""
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_video_tags_tag_id_video_id ON video_tags (tag_id, video_id)"))
+
+def _remove_orphaned_video_tags(conn: Connection):
+    """외래 키 제약을 켜기 전에 삭제된 비디오/태그를 가리키던 연결을 정리합니다. (제약은 기존 행을 검사하지 않음)"""
+    removed = conn.execute(text(
+        "DELETE FROM video_tags "
+        "WHERE video_id NOT IN (SELECT id FROM videos) OR tag_id NOT IN (SELECT id FROM tags)"
+    )).rowcount
+    if removed:
+        logger.info(f"Removed {removed} orphaned video_tags rows")
+
+def _drop_directory_entry_count(conn: Connection):
+    """사용하지 않는 scanned_directories.entry_count 컬럼을 삭제합니다. (DROP COLUMN은 SQLite 3.35 이상)"""
+    columns = {column["name"] for column in inspect(conn).get_columns("scanned_directories")}
+    if "entry_count" not in columns:
+        return
+    if conn.dialect.dbapi.sqlite_version_info < (3, 35, 0):
+        return  # 이전 버전에서는 남겨 둠 (NULL로 기록되며 읽지 않음)
+    conn.execute(text("ALTER TABLE scanned_directories DROP COLUMN entry_count"))
+
+# (버전, 설명, 변경 함수) 목록. 스키마를 바꿀 때는 모델을 수정하고 다음 버전의 항목을 끝에 추가
+# (새 DB는 create_all이 모델대로 만들므로 마이그레이션을 실행하지 않고 최신 버전으로 기록)
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "video_tags (video_id, tag_id) primary key", _add_video_tags_primary_key),
+    (2, "video_tags (tag_id, video_id) index", _add_video_tags_tag_index),
+    (3, "remove orphaned video_tags rows", _remove_orphaned_video_tags),
+    (4, "drop scanned_directories.entry_count", _drop_directory_entry_count),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def get_schema_version(conn: Connection) -> int:
+    """DB 파일에 기록된 스키마 버전 (마이그레이션 도입 전 파일과 새 파일은 0)"""
+    return conn.execute(text("PRAGMA user_version")).scalar()
+
+def _sync_columns_and_indexes(conn: Connection):
+    """기존 테이블에 모델에 새로 추가된 컬럼과 인덱스를 반영합니다. (create_all은 기존 테이블을 변경하지 않음)"""
+    inspector = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'))
+            logger.info(f"Added column {table.name}.{column.name}")
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing_indexes:
+                continue
+            index.create(bind=conn)
+            logger.info(f"Created index {index.name}")
+
+def migrate(engine):
+    """DB 스키마를 최신 버전으로 맞춥니다. (버전은 PRAGMA user_version에 기록)
+
+    새 테이블을 만들고, 기존 DB 파일에는 현재 버전 이후의 마이그레이션과 새 컬럼/인덱스를 차례로 적용한 뒤
+    파일 이름/경로 검색 색인을 만듭니다.
+    """
+    with engine.begin() as conn:
+        version = get_schema_version(conn)
+        is_new = not inspect(conn).has_table("videos")
+        Base.metadata.create_all(bind=conn)
+        if not is_new:
+            if version > SCHEMA_VERSION:
+                logger.warning(f"Database schema version {version} is newer than this app ({SCHEMA_VERSION})")
+            for target, description, upgrade in MIGRATIONS:
+                if target > version:
+                    logger.info(f"Migrating database to version {target}: {description}")
+                    upgrade(conn)
+        _sync_columns_and_indexes(conn)
+        if version < SCHEMA_VERSION:
+            conn.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
+
+    # 파일 이름/경로/카테고리 검색 색인 (이후 videos 변경은 트리거로 반영)
+    create_search_index(engine)
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from ..database import Base
+
+class ScannedDirectory(Base):
+    """스캔한 디렉토리의 변경 기록 (디렉토리 단위 변경 저널)"""
+    __tablename__ = "scanned_directories"
+
+    id = Column(Integer, primary_key=True, index=True)
+    path = Column(String, unique=True, index=True)
+    parent_path = Column(String, index=True)  # 루트 디렉토리는 None
+    mtime_ns = Column(Integer)  # 디렉토리 mtime (None이면 다음 스캔 때 다시 읽음)
+    scanned_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,13 +1,17 @@
-from sqlalchemy import Column, Integer, String, Table, ForeignKey
+from sqlalchemy import Column, Integer, String, Table, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from ..database import Base
 
 # 비디오-태그 연결 테이블
+# (video_id, tag_id) 기본 키로 중복 연결을 막고 비디오별 태그 조회에 사용, 역방향 인덱스는 태그별 비디오 조회용
+# 기존 DB 파일의 스키마 변경은 migrations.py에서 처리
 video_tags = Table(
     'video_tags',
     Base.metadata,
-    Column('video_id', Integer, ForeignKey('videos.id', ondelete='CASCADE')),
-    Column('tag_id', Integer, ForeignKey('tags.id', ondelete='CASCADE'))
+    Column('video_id', Integer, ForeignKey('videos.id', ondelete='CASCADE'), primary_key=True),
+    Column('tag_id', Integer, ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True),
+    Index('ix_video_tags_tag_id_video_id', 'tag_id', 'video_id'),
+    sqlite_with_rowid=False  # 기본 키 순서로 저장 (별도 rowid 없음)
 )
 
 class Tag(Base):
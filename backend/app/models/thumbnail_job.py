@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from ..database import Base
+
+class ThumbnailJob(Base):
+    """썸네일 생성 작업 (재시작 후 이어서 처리하기 위해 저장)"""
+    __tablename__ = "thumbnail_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    thumbnail_id = Column(String, unique=True, index=True)
+    video_path = Column(String)
+    state = Column(String, index=True, default="pending")  # pending -> running -> done / failed
+    lane = Column(Integer)  # 우선순위 레인
+    attempts = Column(Integer, default=0)  # 연속 실패 횟수
+    last_error = Column(String)
+    next_attempt_at = Column(DateTime, index=True)  # 실패한 작업을 다시 시도할 시각
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Float, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import uuid
@@ -8,6 +8,13 @@ from .tag import video_tags
 
 class Video(Base):
     __tablename__ = "videos"
+    __table_args__ = (
+        # 목록 정렬 기준별 커서 페이지네이션용 (정렬 키, id) 인덱스
+        Index("ix_videos_file_name_id", "file_name", "id"),
+        Index("ix_videos_duration_id", "duration", "id"),
+        Index("ix_videos_created_at_id", "created_at", "id"),
+        Index("ix_videos_category_id", "category", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     file_path = Column(String, unique=True, index=True)
@@ -15,6 +22,17 @@ class Video(Base):
     thumbnail_id = Column(String, unique=True, index=True)  # UUID 기반 썸네일 ID
     duration = Column(Float)  # 영상 길이 (초 단위)
     category = Column(String, index=True)  # 카테고리
+    # 파일 지문 (변경 감지용)
+    file_size = Column(Integer)  # 파일 크기 (바이트)
+    mtime_ns = Column(Integer)  # 파일 수정 시각 (나노초)
+    inode = Column(Integer)
+    device = Column(Integer)
+    # 분석 결과 캐시
+    width = Column(Integer)
+    height = Column(Integer)
+    fps = Column(Float)
+    codec = Column(String)
+    bitrate = Column(Integer)  # 평균 비트레이트 (bps)
     tags = relationship("Tag", secondary=video_tags, back_populates="videos")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
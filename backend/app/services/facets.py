@@ -0,0 +1,50 @@
+from typing import List
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from ..models.video import Video
+from ..models.tag import video_tags
+from .library_cache import GenerationCache
+from .listing import VideoFilter, build_video_query, category_bits, resolve_filter
+from .tag_index import tag_index
+
+# 필터 조건별 패싯 결과
+_facets = GenerationCache(max_entries=64)
+
+def get_facets(db: Session, filters: VideoFilter) -> dict:
+    """필터 조건에 맞는 비디오 수와, 그 중 각 태그/카테고리를 가진 비디오 수를 반환합니다.
+
+    태그 수는 현재 조건에 그 태그를 AND로 추가했을 때의 결과 수와 같습니다. 이미 조건에 쓰인 태그와
+    결과가 0인 태그/카테고리는 포함하지 않습니다. (데이터가 바뀌기 전까지 같은 조건의 결과를 재사용)
+    """
+    return _facets.get_or_compute(filters.key, lambda: _compute_facets(db, filters))
+
+def _compute_facets(db: Session, filters: VideoFilter) -> dict:
+    used = set(filters.tag_ids or ()) | set(filters.exclude_tag_ids or ())
+    if tag_index.ready:
+        # 태그 인덱스의 비트셋 교집합으로 계산
+        resolved = resolve_filter(db, filters)
+        bits = resolved.bits if resolved is not None else tag_index.all_bits()
+        total = bits.bit_count()
+        tag_counts = [(tag_id, (bits & tag_bits).bit_count()) for tag_id, tag_bits in tag_index.tag_items()]
+        category_counts = [(category, (bits & videos).bit_count()) for category, videos in category_bits(db).items()]
+    else:
+        matched = build_video_query(db, filters, Video.id).subquery()
+        total = db.query(func.count()).select_from(matched).scalar()
+        tag_counts = db.query(video_tags.c.tag_id, func.count()).filter(
+            video_tags.c.video_id.in_(select(matched.c.id))
+        ).group_by(video_tags.c.tag_id).all()
+        category_counts = db.query(Video.category, func.count()).filter(
+            Video.id.in_(select(matched.c.id))
+        ).group_by(Video.category).all()
+
+    return {
+        "total": total,
+        "tags": _sorted_counts("id", ((tag_id, count) for tag_id, count in tag_counts if tag_id not in used)),
+        "categories": _sorted_counts("category", category_counts),
+    }
+
+def _sorted_counts(name: str, counts) -> List[dict]:
+    """0이 아닌 항목을 많은 순서로 정렬합니다."""
+    items = [(value, count) for value, count in counts if count]
+    items.sort(key=lambda item: (-item[1], item[0] is None, item[0]))
+    return [{name: value, "count": count} for value, count in items]
@@ -0,0 +1,37 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+from .. import database
+
+class GenerationCache:
+    """라이브러리 세대별 조회 결과 캐시
+
+    라이브러리 세대가 바뀌면(스캔, 태그 편집 등으로 데이터가 변경되면) 모든 항목을 버립니다.
+    계산하는 동안 세대가 바뀐 결과는 저장하지 않습니다.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._generation = database.get_library_generation()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """key의 캐시된 값을 반환합니다. 없으면 compute() 결과를 저장하고 반환합니다."""
+        generation = database.get_library_generation()
+        with self._lock:
+            if self._generation != generation:
+                self._entries.clear()
+                self._generation = generation
+            elif key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        value = compute()
+
+        with self._lock:
+            if self._generation == generation == database.get_library_generation():
+                self._entries[key] = value
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
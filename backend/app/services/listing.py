@@ -0,0 +1,290 @@
+import base64
+import json
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from array import array
+from sqlalchemy import and_, func, or_, select, tuple_
+from sqlalchemy.orm import Session
+from ..models.video import Video
+from ..models.tag import Tag
+from .library_cache import GenerationCache
+from .tag_index import tag_index, bits_to_ids, ids_to_bits
+
+class TagSearchMode(str, Enum):
+    OR = "or"
+    AND = "and"
+
+class VideoSort(str, Enum):
+    ID = "id"  # 추가된 순서 (기본값)
+    FILE_NAME = "file_name"
+    DURATION = "duration"
+    CREATED_AT = "created_at"
+    CATEGORY = "category"
+
+class SortOrder(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+# 정렬 기준별 컬럼 (모두 (컬럼, id) 복합 인덱스가 있음)
+SORT_COLUMNS = {
+    VideoSort.ID: Video.id,
+    VideoSort.FILE_NAME: Video.file_name,
+    VideoSort.DURATION: Video.duration,
+    VideoSort.CREATED_AT: Video.created_at,
+    VideoSort.CATEGORY: Video.category,
+}
+
+class InvalidCursor(ValueError):
+    """커서를 해석할 수 없거나 정렬 조건이 다른 경우"""
+
+class VideoFilter(NamedTuple):
+    """/list 의 필터 조건"""
+    tag_ids: Optional[List[int]] = None
+    tag_mode: TagSearchMode = TagSearchMode.OR
+    exclude_tag_ids: Optional[List[int]] = None  # 이 태그 중 하나라도 가진 비디오는 제외
+    category: Optional[str] = None
+
+    @property
+    def key(self) -> tuple:
+        """캐시 키 (태그 순서와 중복은 결과에 영향 없음)"""
+        return (
+            tuple(sorted(set(self.tag_ids or ()))),
+            self.tag_mode.value if self.tag_ids else None,
+            tuple(sorted(set(self.exclude_tag_ids or ()))),
+            self.category,
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.tag_ids or self.exclude_tag_ids or self.category is not None)
+
+# 필터 조건별 전체 비디오 수
+_totals = GenerationCache()
+# (필터, 정렬, 페이지 크기) 별 페이지 시작 위치. 페이지 번호로 이동할 때 가장 가까운 앞 페이지부터 찾음
+_page_anchors = GenerationCache()
+# 태그 인덱스로 계산한 필터 결과 (비트셋과 id 목록은 커질 수 있으므로 적게 보관)
+_resolved = GenerationCache(max_entries=16)
+# 카테고리별 비디오 비트셋
+_categories = GenerationCache(max_entries=1)
+
+class ResolvedFilter:
+    """태그 인덱스로 계산한 필터 결과 (비디오 id 비트셋)"""
+
+    def __init__(self, bits: int):
+        self.bits = bits
+        self.count = bits.bit_count()
+        self._ids: Optional[array] = None
+        self._json: Optional[str] = None
+        self._mask: Optional[bytes] = None
+
+    @property
+    def ids(self) -> array:
+        """오름차순 비디오 id 배열 (처음 사용할 때 생성)"""
+        if self._ids is None:
+            self._ids = bits_to_ids(self.bits)
+        return self._ids
+
+    def __contains__(self, video_id: int) -> bool:
+        # 큰 int의 비트 연산은 크기에 비례하므로 바이트 배열로 변환해 두고 확인
+        if self._mask is None:
+            self._mask = self.bits.to_bytes((self.bits.bit_length() + 7) // 8, "little")
+        index = video_id >> 3
+        return index < len(self._mask) and bool(self._mask[index] >> (video_id & 7) & 1)
+
+    @property
+    def json(self) -> str:
+        """SQLite json_each()로 넘길 id 목록 (처음 사용할 때 생성)"""
+        if self._json is None:
+            self._json = json.dumps(self.ids.tolist(), separators=(",", ":"))
+        return self._json
+
+def category_bits(db: Session) -> Dict[Optional[str], int]:
+    """카테고리별 비디오 id 비트셋을 반환합니다. (데이터가 바뀌기 전까지 재사용)"""
+    def load():
+        category_ids: Dict[Optional[str], List[int]] = {}
+        for video_id, category in db.query(Video.id, Video.category):
+            category_ids.setdefault(category, []).append(video_id)
+        return {category: ids_to_bits(ids) for category, ids in category_ids.items()}
+    return _categories.get_or_compute("categories", load)
+
+def resolve_filter(db: Session, filters: VideoFilter) -> Optional[ResolvedFilter]:
+    """필터 조건을 태그 인덱스로 계산합니다. 조건이 없거나 인덱스가 준비되지 않았으면 None을 반환합니다."""
+    if filters.is_empty or not tag_index.ready:
+        return None
+    def compute():
+        if filters.tag_ids or filters.exclude_tag_ids:
+            bits = tag_index.resolve(filters.tag_ids, filters.tag_mode == TagSearchMode.AND, filters.exclude_tag_ids)
+        else:
+            bits = tag_index.all_bits()
+        if filters.category is not None:
+            bits &= category_bits(db).get(filters.category, 0)
+        return ResolvedFilter(bits)
+    return _resolved.get_or_compute(filters.key, compute)
+
+def build_video_query(db: Session, filters: VideoFilter, *entities):
+    """/list 의 필터 조건을 적용한 비디오 쿼리를 만듭니다. (entities를 지정하면 해당 컬럼만 조회)"""
+    query = db.query(*(entities or (Video,)))
+    resolved = resolve_filter(db, filters)
+    if resolved is not None:
+        # 태그 인덱스가 계산한 id 목록으로 필터링
+        matched = func.json_each(resolved.json).table_valued("value")
+        return query.filter(Video.id.in_(select(matched.c.value)))
+    
+    # 검색 조건 구성 (태그 인덱스를 만들기 전)
+    tag_ids = filters.tag_ids
+    if filters.category is not None:
+        query = query.filter(Video.category == filters.category)
+    if filters.exclude_tag_ids:
+        query = query.filter(~Video.tags.any(Tag.id.in_(filters.exclude_tag_ids)))
+    if tag_ids:
+        if filters.tag_mode == TagSearchMode.OR:
+            # OR 검색: 지정된 태그 중 하나라도 있는 비디오
+            query = query.filter(Video.tags.any(Tag.id.in_(tag_ids)))
+        else:
+            # AND 검색: 지정된 태그를 모두 가진 비디오
+            for tag_id in tag_ids:
+                query = query.filter(Video.tags.any(Tag.id == tag_id))
+    return query
+
+def count_videos(db: Session, filters: VideoFilter) -> int:
+    """필터 조건에 맞는 비디오 수를 반환합니다. (데이터가 바뀌기 전까지 같은 조건의 결과를 재사용)"""
+    resolved = resolve_filter(db, filters)
+    if resolved is not None:
+        return resolved.count
+    return _totals.get_or_compute(filters.key, lambda: build_video_query(db, filters).count())
+
+def encode_cursor(sort: VideoSort, order: SortOrder, value: Any, video_id: int) -> str:
+    """마지막으로 받은 항목의 (정렬 키, id) 를 커서 문자열로 만듭니다."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort.value, order.value, value, video_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, sort: VideoSort, order: SortOrder) -> Tuple[Any, int]:
+    """커서 문자열을 (정렬 키, id) 로 해석합니다."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, cursor_order, value, video_id = json.loads(payload)
+        if value is not None and sort == VideoSort.CREATED_AT:
+            value = datetime.fromisoformat(value)
+        video_id = int(video_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+    if cursor_sort != sort.value or cursor_order != order.value:
+        raise InvalidCursor("Cursor was created with a different sort order")
+    return value, video_id
+
+def _order(query, column, order: SortOrder):
+    if column is Video.id:
+        return query.order_by(Video.id.asc() if order == SortOrder.ASC else Video.id.desc())
+    if order == SortOrder.ASC:
+        return query.order_by(column.asc(), Video.id.asc())
+    return query.order_by(column.desc(), Video.id.desc())
+
+def _after(column, order: SortOrder, anchor: Tuple[Any, int]):
+    """정렬 순서에서 anchor 다음에 오는 항목들의 조건을 만듭니다. (SQLite는 NULL을 가장 작은 값으로 정렬)"""
+    value, last_id = anchor
+    if column is Video.id:
+        return Video.id > last_id if order == SortOrder.ASC else Video.id < last_id
+    if order == SortOrder.ASC:
+        if value is None:
+            return or_(and_(column.is_(None), Video.id > last_id), column.isnot(None))
+        return tuple_(column, Video.id) > tuple_(value, last_id)
+    if value is None:
+        return and_(column.is_(None), Video.id < last_id)
+    return or_(tuple_(column, Video.id) < tuple_(value, last_id), column.is_(None))
+
+def _find_anchor(db: Session, filters: VideoFilter, sort: VideoSort, order: SortOrder,
+                 size: int, page: int) -> Tuple[bool, Optional[Tuple[Any, int]]]:
+    """page의 시작 위치(앞 페이지의 마지막 항목) 를 찾습니다.
+
+    캐시된 가장 가까운 앞 페이지에서 (정렬 키, id) 인덱스만 읽어 건너뛰므로, 한 번 지나간 페이지나
+    그 근처로의 이동은 페이지 번호와 관계없이 비용이 같습니다.
+
+    Returns:
+        (페이지가 존재하는지, 시작 위치)
+    """
+    if page == 1:
+        return True, None
+    # 같은 dict를 여러 요청 스레드가 함께 쓰므로, 순회는 키 목록을 복사한 뒤에 함 (순회 중 추가되면 RuntimeError)
+    anchors = _page_anchors.get_or_compute((filters.key, sort, order, size), dict)
+    anchor = anchors.get(page)
+    if anchor is not None:
+        return True, anchor
+
+    start_page = max((cached for cached in list(anchors) if cached < page), default=1)
+    column = SORT_COLUMNS[sort]
+    query = build_video_query(db, filters, column, Video.id)
+    if start_page > 1:
+        query = query.filter(_after(column, order, anchors[start_page]))
+    row = _order(query, column, order).offset((page - start_page) * size - 1).limit(1).first()
+    if row is None:
+        return False, None
+    anchor = anchors[page] = (row[0], row[1])
+    return True, anchor
+
+def _page_ids(ids: array, order: SortOrder, size: int, page: int,
+              anchor: Optional[Tuple[Any, int]]) -> Tuple[List[int], bool]:
+    """정렬된 id 배열에서 한 페이지의 id를 잘라냅니다.
+
+    Returns:
+        (페이지의 id 목록, 다음 페이지가 있는지)
+    """
+    if anchor is not None:
+        last_id = anchor[1]
+        start = bisect_right(ids, last_id) if order == SortOrder.ASC else len(ids) - bisect_left(ids, last_id)
+    else:
+        start = (page - 1) * size
+    end = min(start + size, len(ids))
+    if start >= end:
+        return [], False
+    if order == SortOrder.ASC:
+        return ids[start:end].tolist(), end < len(ids)
+    return ids[len(ids) - end:len(ids) - start].tolist()[::-1], end < len(ids)
+
+def fetch_video_page(db: Session, filters: VideoFilter, sort: VideoSort, order: SortOrder, size: int,
+                     page: int = 1, cursor: Optional[str] = None,
+                     entities: Sequence = (), options: Sequence = ()) -> Tuple[list, Optional[str]]:
+    """정렬된 목록의 한 페이지를 조회합니다. cursor가 있으면 커서 다음부터, 없으면 page 번호로 조회합니다.
+
+    필터 조건이 있고 id 순서로 정렬하면 태그 인덱스의 id 목록에서 페이지를 잘라내고, DB에서는 그 페이지의
+    행만 조회합니다.
+
+    Returns:
+        (항목 목록, 다음 페이지 커서 또는 None). entities를 지정하면 항목은 해당 컬럼들의 튜플입니다.
+    """
+    column = SORT_COLUMNS[sort]
+    anchor = decode_cursor(cursor, sort, order) if cursor else None
+    resolved = resolve_filter(db, filters) if sort == VideoSort.ID else None
+    # 다음 커서를 만들 수 있도록 정렬 키와 id를 함께 조회
+    selected = tuple(entities) or (Video,)
+
+    if resolved is not None:
+        page_ids, has_more = _page_ids(resolved.ids, order, size, page, anchor)
+        if not page_ids:
+            return [], None
+        query = db.query(*selected, column, Video.id).filter(Video.id.in_(page_ids))
+    else:
+        if not cursor:
+            exists, anchor = _find_anchor(db, filters, sort, order, size, page)
+            if not exists:
+                return [], None
+        query = build_video_query(db, filters, *selected, column, Video.id)
+        if anchor is not None:
+            query = query.filter(_after(column, order, anchor))
+    if options:
+        query = query.options(*options)
+    rows = _order(query, column, order).limit(size + 1).all()
+
+    next_cursor = None
+    if resolved is not None:
+        if has_more:
+            next_cursor = encode_cursor(sort, order, page_ids[-1], page_ids[-1])
+    elif len(rows) > size:
+        rows = rows[:size]
+        next_cursor = encode_cursor(sort, order, rows[-1][-2], rows[-1][-1])
+    if len(selected) == 1:
+        return [row[0] for row in rows], next_cursor
+    return [tuple(row[:-2]) for row in rows], next_cursor
@@ -1,5 +1,4 @@
 import os
-import cv2
 from datetime import datetime
 from sqlalchemy.orm import Session
 from .tags import update_video_tags
@@ -7,29 +6,43 @@ from typing import List
 from ..logger import logger
 import json
 
-def get_video_duration(video_path: str) -> float:
-    """비디오 파일의 길이를 초 단위로 반환합니다."""
-    try:
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            logger.error(f"Error: Could not open video file - {video_path}")
-            return 0.0
+def _to_sqlite_int(value: int) -> int | None:
+    """SQLite INTEGER(부호 있는 64비트) 범위로 변환합니다. 0은 값이 없는 것으로 취급합니다."""
+    if not value:
+        return None
+    return value - (1 << 64) if value >= (1 << 63) else value
 
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        duration = frame_count / fps if fps > 0 else 0.0
+def get_file_fingerprint(file_stat: os.stat_result) -> dict:
+    """파일의 (크기, mtime_ns, inode, device) 지문을 Video 컬럼 형식으로 반환합니다."""
+    return {
+        "file_size": file_stat.st_size,
+        "mtime_ns": file_stat.st_mtime_ns,
+        "inode": _to_sqlite_int(file_stat.st_ino),
+        "device": _to_sqlite_int(file_stat.st_dev),
+    }
 
-        cap.release()
-        return duration
-    except Exception as e:
-        logger.error(f"Error getting duration for {video_path}: {str(e)}")
-        return 0.0
+def has_file_fingerprint(video) -> bool:
+    """지문이 저장된 레코드인지 여부 (지문 도입 전에 추가된 레코드는 False)"""
+    return video.file_size is not None and video.mtime_ns is not None
 
-def is_video_modified(file_path: str, video) -> bool:
-    """비디오 파일이 DB 데이터 이후에 수정되었는지 확인합니다."""
+def is_video_modified(file_path: str, video, file_stat: os.stat_result | None = None) -> bool:
+    """비디오 파일이 DB에 저장된 지문(크기, mtime_ns, inode, device)과 달라졌는지 확인합니다.
+    
+    file_stat이 주어지면 stat 호출 없이 해당 값을 사용합니다.
+    지문이 없는 기존 레코드는 파일 수정 시각이 마지막 갱신 시각(UTC) 이후인 경우에만 수정된 것으로 봅니다.
+    """
     try:
-        file_mtime = datetime.fromtimestamp(os.path.getmtime(file_path))
-        return file_mtime > video.updated_at
+        if file_stat is None:
+            file_stat = os.stat(file_path)
+        if not has_file_fingerprint(video):
+            return video.updated_at is None or datetime.utcfromtimestamp(file_stat.st_mtime) > video.updated_at
+        current = get_file_fingerprint(file_stat)
+        if current["file_size"] != video.file_size or current["mtime_ns"] != video.mtime_ns:
+            return True
+        # Windows의 DirEntry.stat()은 inode/device를 0으로 반환하므로 양쪽 값이 모두 있을 때만 비교
+        if current["inode"] and current["device"] and video.inode and video.device:
+            return (current["inode"], current["device"]) != (video.inode, video.device)
+        return False
     except Exception as e:
         logger.error(f"Error checking modification time for {file_path}: {str(e)}")
         return False
@@ -66,12 +79,18 @@ def read_video_metadata(file_path: str, base_dir: str) -> tuple[str | None, list
     
     return category, tags
 
-def update_video_metadata(video, file_path: str, base_dir: str, db: Session):
-    """비디오의 메타데이터를 업데이트합니다."""
+def update_video_metadata(video, file_path: str, base_dir: str, db: Session, tag_writer=None):
+    """비디오의 메타데이터를 업데이트합니다.
+    
+    tag_writer(ScanTagWriter) 가 주어지면 태그는 바로 커밋하지 않고 모아서 일괄 저장합니다. (비디오는 flush하지 않아도 됨)
+    """
     category, tag_names = read_video_metadata(file_path, base_dir)
     if category is not None:
         video.category = category
-    update_video_tags(db, video, tag_names)
+    if tag_writer is not None:
+        tag_writer.set_tags(video, tag_names)
+    else:
+        update_video_tags(db, video, tag_names)
 
 def update_video_info(video_path: str, updates: dict):
     """비디오의 info 파일을 업데이트합니다."""
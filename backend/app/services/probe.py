@@ -0,0 +1,562 @@
+import os
+import struct
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Tuple
+from ..logger import logger
+
+class VideoProbe(NamedTuple):
+    """비디오 파일의 기본 정보"""
+    duration: float  # 초 단위
+    width: Optional[int] = None
+    height: Optional[int] = None
+    codec: Optional[str] = None
+    fps: Optional[float] = None
+
+class ProbeError(Exception):
+    """컨테이너 헤더를 해석할 수 없는 경우"""
+
+class KeyframeInfo(NamedTuple):
+    """비디오 트랙의 키프레임 정보"""
+    interval: float  # 키프레임 사이 평균 간격 (초, 모든 프레임이 키프레임이면 0)
+    count: Optional[int] = None  # 키프레임 수 (알 수 없으면 None)
+
+# 모든 프레임이 키프레임인(intra-only) 코덱. 소문자 fourcc 또는 Matroska 코덱 ID
+INTRA_ONLY_CODECS = (
+    'mjpg', 'mjpa', 'mjpb', 'jpeg', 'avrn', 'avdj', 'dmb1',
+    'apch', 'apcn', 'apcs', 'apco', 'ap4h', 'ap4x',
+    'v_mjpeg', 'v_uncompressed', 'v_prores',
+)
+
+def probe_video(video_path: str) -> Optional[VideoProbe]:
+    """비디오 정보를 읽습니다. 컨테이너 헤더를 먼저 파싱하고, 실패하면 OpenCV로 대체합니다."""
+    try:
+        probe = probe_container(video_path)
+        if probe is not None and probe.duration > 0:
+            return probe
+    except Exception as e:
+        logger.info(f"Header probe failed for {video_path}, falling back to OpenCV: {str(e)}")
+    return probe_video_opencv(video_path)
+
+def probe_container(video_path: str) -> Optional[VideoProbe]:
+    """MP4/MOV, MKV/WebM, AVI 컨테이너 헤더만 읽어 비디오 정보를 반환합니다.
+
+    지원하지 않는 형식이면 None을 반환하고, 헤더가 손상된 경우 ProbeError를 발생시킵니다.
+    """
+    with open(video_path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        head = f.read(12)
+        if len(head) < 12:
+            raise ProbeError("File too small")
+
+        if head[:4] == b'RIFF' and head[8:12] == b'AVI ':
+            return _probe_avi(f, file_size)
+        if head[:4] == b'\x1a\x45\xdf\xa3':
+            return _probe_mkv(f, file_size)
+        if head[4:8] in (b'ftyp', b'moov', b'mdat', b'free', b'wide', b'skip', b'pnot'):
+            return _probe_mp4(f, file_size)
+    return None
+
+def probe_video_opencv(video_path: str) -> Optional[VideoProbe]:
+    """OpenCV로 비디오를 열어 정보를 읽습니다. (디먹서/디코더 초기화 비용이 큼)"""
+    import cv2
+    try:
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            logger.error(f"Error: Could not open video file - {video_path}")
+            return None
+
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or None
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or None
+            fourcc = int(cap.get(cv2.CAP_PROP_FOURCC)) & 0xFFFFFFFF
+        finally:
+            cap.release()
+
+        codec = fourcc.to_bytes(4, 'little').decode('latin-1').strip('\x00 ') or None if fourcc else None
+        duration = frame_count / fps if fps > 0 else 0.0
+        return VideoProbe(duration, width, height, codec, fps if fps > 0 else None)
+    except Exception as e:
+        logger.error(f"Error probing {video_path} with OpenCV: {str(e)}")
+        return None
+
+def probe_keyframes(video_path: str, probe: Optional[VideoProbe] = None) -> Optional[KeyframeInfo]:
+    """키프레임 간격을 구합니다. MP4/MOV는 stss 박스에서 키프레임 수를 읽고,
+    그 외 형식은 코덱으로 intra-only 여부만 판단합니다. 알 수 없으면 None을 반환합니다.
+    """
+    try:
+        with open(video_path, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            head = f.read(12)
+            if len(head) == 12 and head[4:8] in (b'ftyp', b'moov', b'mdat', b'free', b'wide', b'skip', b'pnot'):
+                info = _read_mp4_keyframes(f, file_size)
+                if info is not None:
+                    return info
+        if probe is None:
+            probe = probe_container(video_path)
+    except Exception as e:
+        logger.info(f"Keyframe probe failed for {video_path}: {str(e)}")
+        return None
+
+    if probe is not None and probe.codec and probe.codec.lower() in INTRA_ONLY_CODECS:
+        return KeyframeInfo(0.0)
+    return None
+
+# ---------------------------------------------------------------------------
+# MP4 / MOV (ISO base media file format)
+# ---------------------------------------------------------------------------
+
+def _iter_boxes(f: BinaryIO, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    """[start, end) 범위의 박스들을 (type, 데이터 시작, 박스 끝) 으로 순회합니다."""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack('>I4s', header)
+        header_size = 8
+        if size == 1:  # 64비트 크기
+            size = struct.unpack('>Q', f.read(8))[0]
+            header_size = 16
+        elif size == 0:  # 파일 끝까지
+            size = end - pos
+        if size < header_size:
+            raise ProbeError(f"Invalid box size for {box_type!r}")
+        yield box_type, pos + header_size, min(pos + size, end)
+        pos += size
+
+def _find_box(f: BinaryIO, start: int, end: int, box_type: bytes) -> Optional[Tuple[int, int]]:
+    for found_type, data_start, box_end in _iter_boxes(f, start, end):
+        if found_type == box_type:
+            return data_start, box_end
+    return None
+
+def _read_full_box(f: BinaryIO, start: int, length: int) -> Tuple[int, bytes]:
+    """FullBox의 version과 이후 데이터를 읽습니다."""
+    f.seek(start)
+    data = f.read(length)
+    if len(data) < 4:
+        raise ProbeError("Truncated box")
+    return data[0], data[4:]
+
+def _parse_time_header(f: BinaryIO, start: int) -> Tuple[int, int]:
+    """mvhd/mdhd 박스에서 (timescale, duration) 을 읽습니다."""
+    version, data = _read_full_box(f, start, 36)
+    if version == 1:
+        timescale, duration = struct.unpack('>IQ', data[16:28])
+    else:
+        timescale, duration = struct.unpack('>II', data[8:16])
+    return timescale, duration
+
+def _probe_mp4(f: BinaryIO, file_size: int) -> VideoProbe:
+    # moov 박스는 파일 앞 또는 뒤(mdat 다음)에 있음. 박스 크기로 건너뛰므로 mdat은 읽지 않음
+    moov = _find_box(f, 0, file_size, b'moov')
+    if moov is None:
+        raise ProbeError("moov box not found")
+    moov_start, moov_end = moov
+
+    duration = 0.0
+    movie_timescale = 0
+    width = height = None
+    codec = None
+    fps = None
+
+    for box_type, start, end in list(_iter_boxes(f, moov_start, moov_end)):
+        if box_type == b'mvhd':
+            timescale, raw_duration = _parse_time_header(f, start)
+            if timescale > 0:
+                duration = raw_duration / timescale
+            movie_timescale = timescale
+        elif box_type == b'mvex' and duration <= 0:
+            # 조각난 MP4는 mvhd 대신 mehd에 전체 길이가 기록됨
+            mehd = _find_box(f, start, end, b'mehd')
+            if mehd is not None and movie_timescale:
+                version, data = _read_full_box(f, mehd[0], 12)
+                raw = struct.unpack('>Q', data[:8])[0] if version == 1 else struct.unpack('>I', data[:4])[0]
+                duration = raw / movie_timescale
+        elif box_type == b'trak' and codec is None:
+            track = _parse_mp4_track(f, start, end)
+            if track is not None:
+                width, height, codec, fps, track_duration = track
+                if duration <= 0 and track_duration:
+                    duration = track_duration
+
+    return VideoProbe(duration, width, height, codec, fps)
+
+def _parse_mp4_track(f: BinaryIO, start: int, end: int):
+    """비디오 트랙이면 (width, height, codec, fps, duration) 을 반환합니다."""
+    width = height = None
+    mdia = None
+    for box_type, box_start, box_end in list(_iter_boxes(f, start, end)):
+        if box_type == b'tkhd':
+            version, data = _read_full_box(f, box_start, 100)
+            offset = 84 if version == 1 else 72  # 가로/세로(16.16 고정소수점) 위치
+            if len(data) >= offset + 8:
+                w, h = struct.unpack('>II', data[offset:offset + 8])
+                width, height = w >> 16, h >> 16
+        elif box_type == b'mdia':
+            mdia = (box_start, box_end)
+    if mdia is None:
+        return None
+
+    hdlr = _find_box(f, mdia[0], mdia[1], b'hdlr')
+    if hdlr is None:
+        return None
+    _, data = _read_full_box(f, hdlr[0], 12)
+    if data[4:8] != b'vide':
+        return None
+
+    timescale, raw_duration = 0, 0
+    mdhd = _find_box(f, mdia[0], mdia[1], b'mdhd')
+    if mdhd is not None:
+        timescale, raw_duration = _parse_time_header(f, mdhd[0])
+    track_duration = raw_duration / timescale if timescale > 0 else 0.0
+
+    codec = None
+    fps = None
+    minf = _find_box(f, mdia[0], mdia[1], b'minf')
+    stbl = _find_box(f, minf[0], minf[1], b'stbl') if minf else None
+    if stbl is not None:
+        for box_type, box_start, box_end in list(_iter_boxes(f, stbl[0], stbl[1])):
+            if box_type == b'stsd':
+                _, data = _read_full_box(f, box_start, 48)
+                if len(data) >= 12:
+                    codec = data[8:12].decode('latin-1').strip('\x00 ') or None
+                    # 시각 샘플 엔트리의 가로/세로 (tkhd가 0인 경우 대비)
+                    if (not width or not height) and len(data) >= 40:
+                        width, height = struct.unpack('>HH', data[36:40])
+            elif box_type == b'stts':
+                # 전체 샘플 수 / 트랙 길이 = 평균 FPS (가변 프레임레이트에서도 정확)
+                f.seek(box_start)
+                header = f.read(8)
+                entry_count = struct.unpack('>I', header[4:8])[0]
+                entries = f.read(min(entry_count * 8, box_end - box_start - 8))  # 손상된 항목 수로 과도하게 읽지 않음
+                sample_count = sum(
+                    count for count, _ in struct.iter_unpack('>II', entries[:len(entries) // 8 * 8])
+                )
+                if sample_count and track_duration > 0:
+                    fps = sample_count / track_duration
+
+    return width or None, height or None, codec, fps, track_duration
+
+def _read_mp4_keyframes(f: BinaryIO, file_size: int) -> Optional[KeyframeInfo]:
+    """첫 번째 비디오 트랙의 stss(동기 샘플) 항목 수로 평균 키프레임 간격을 계산합니다."""
+    moov = _find_box(f, 0, file_size, b'moov')
+    if moov is None:
+        return None
+
+    for box_type, start, end in list(_iter_boxes(f, moov[0], moov[1])):
+        if box_type != b'trak':
+            continue
+        mdia = _find_box(f, start, end, b'mdia')
+        hdlr = _find_box(f, mdia[0], mdia[1], b'hdlr') if mdia else None
+        if hdlr is None or _read_full_box(f, hdlr[0], 12)[1][4:8] != b'vide':
+            continue
+
+        mdhd = _find_box(f, mdia[0], mdia[1], b'mdhd')
+        timescale, raw_duration = _parse_time_header(f, mdhd[0]) if mdhd else (0, 0)
+        minf = _find_box(f, mdia[0], mdia[1], b'minf')
+        stbl = _find_box(f, minf[0], minf[1], b'stbl') if minf else None
+        if stbl is None or timescale <= 0 or raw_duration <= 0:
+            return None
+
+        stss = _find_box(f, stbl[0], stbl[1], b'stss')
+        if stss is None:
+            # stss가 없으면 모든 샘플이 키프레임
+            return KeyframeInfo(0.0)
+        _, data = _read_full_box(f, stss[0], 8)
+        count = struct.unpack('>I', data[:4])[0] if len(data) >= 4 else 0
+        if count <= 0:
+            return None
+        return KeyframeInfo(raw_duration / timescale / count, count)
+    return None
+
+# ---------------------------------------------------------------------------
+# Matroska / WebM (EBML)
+# ---------------------------------------------------------------------------
+
+EBML_SEGMENT = 0x18538067
+EBML_SEEK_HEAD = 0x114D9B74
+EBML_SEEK = 0x4DBB
+EBML_SEEK_ID = 0x53AB
+EBML_SEEK_POSITION = 0x53AC
+EBML_INFO = 0x1549A966
+EBML_TIMECODE_SCALE = 0x2AD7B1
+EBML_DURATION = 0x4489
+EBML_TRACKS = 0x1654AE6B
+EBML_TRACK_ENTRY = 0xAE
+EBML_TRACK_TYPE = 0x83
+EBML_CODEC_ID = 0x86
+EBML_DEFAULT_DURATION = 0x23E383
+EBML_VIDEO = 0xE0
+EBML_PIXEL_WIDTH = 0xB0
+EBML_PIXEL_HEIGHT = 0xBA
+EBML_CLUSTER = 0x1F43B675
+
+EBML_MAX_UINT_SIZE = 8  # 정수 요소 최대 크기 (바이트)
+EBML_MAX_STRING_SIZE = 256  # CodecID 등 문자열 요소 최대 크기 (바이트)
+
+def _read_vint(f: BinaryIO, keep_marker: bool) -> Tuple[Optional[int], int]:
+    """EBML 가변 길이 정수를 읽어 (값, 길이) 를 반환합니다. 크기 값이 '알 수 없음'이면 값은 None입니다."""
+    first = f.read(1)
+    if not first:
+        raise ProbeError("Unexpected end of file")
+    b = first[0]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not (b & mask):
+        mask >>= 1
+        length += 1
+    if length > 8:
+        raise ProbeError("Invalid EBML variable-length integer")
+    rest = f.read(length - 1)
+    if len(rest) < length - 1:
+        raise ProbeError("Unexpected end of file")
+    value = b if keep_marker else b & (mask - 1)
+    for byte in rest:
+        value = (value << 8) | byte
+    if not keep_marker and value == (1 << (7 * length)) - 1:
+        return None, length  # unknown size
+    return value, length
+
+def _read_ebml_header(f: BinaryIO, pos: int) -> Tuple[int, int, Optional[int]]:
+    """pos의 EBML 요소 헤더를 읽어 (id, 데이터 시작, 데이터 크기) 를 반환합니다."""
+    f.seek(pos)
+    element_id, id_length = _read_vint(f, keep_marker=True)
+    size, size_length = _read_vint(f, keep_marker=False)
+    return element_id, pos + id_length + size_length, size
+
+def _iter_ebml(f: BinaryIO, start: int, end: int) -> Iterator[Tuple[int, int, Optional[int]]]:
+    """[start, end) 범위의 EBML 요소를 (id, 데이터 시작, 데이터 크기) 로 순회합니다.
+
+    요소가 end(부모 요소의 끝) 를 넘으면 ProbeError를 발생시킵니다.
+    """
+    pos = start
+    while pos < end:
+        element_id, data_start, size = _read_ebml_header(f, pos)
+        if data_start > end or (size is not None and data_start + size > end):
+            raise ProbeError(f"EBML element 0x{element_id:X} exceeds its parent")
+        yield element_id, data_start, size
+        if size is None:
+            return  # 크기를 모르는 요소 다음은 순회할 수 없음
+        pos = data_start + size
+
+def _read_ebml_data(f: BinaryIO, start: int, size: int) -> bytes:
+    f.seek(start)
+    data = f.read(size)
+    if len(data) < size:
+        raise ProbeError("Unexpected end of file")
+    return data
+
+def _read_uint(f: BinaryIO, start: int, size: Optional[int]) -> int:
+    if size is None or size > EBML_MAX_UINT_SIZE:
+        raise ProbeError("Invalid EBML integer size")
+    return int.from_bytes(_read_ebml_data(f, start, size), 'big')
+
+def _read_float(f: BinaryIO, start: int, size: Optional[int]) -> float:
+    if size == 4:
+        return struct.unpack('>f', _read_ebml_data(f, start, 4))[0]
+    if size == 8:
+        return struct.unpack('>d', _read_ebml_data(f, start, 8))[0]
+    raise ProbeError("Invalid EBML float size")
+
+def _read_string(f: BinaryIO, start: int, size: Optional[int]) -> Optional[str]:
+    if size is None or size > EBML_MAX_STRING_SIZE:
+        raise ProbeError("Invalid EBML string size")
+    return _read_ebml_data(f, start, size).decode('ascii', errors='replace').strip('\x00') or None
+
+def _probe_mkv(f: BinaryIO, file_size: int) -> VideoProbe:
+    # 최상위 요소는 직접 순회 (복사 중인 파일처럼 잘린 파일의 Segment는 파일 끝까지로 봄)
+    segment = None
+    pos = 0
+    while pos < file_size:
+        element_id, start, size = _read_ebml_header(f, pos)
+        if element_id == EBML_SEGMENT:
+            segment = (start, file_size if size is None else min(start + size, file_size))
+            break
+        if size is None:
+            break
+        pos = start + size
+    if segment is None:
+        raise ProbeError("Segment element not found")
+    segment_start, segment_end = segment
+
+    positions = {}
+    for element_id, start, size in _iter_ebml(f, segment_start, segment_end):
+        if element_id in (EBML_INFO, EBML_TRACKS) and size is not None:
+            positions[element_id] = (start, size)
+        elif element_id == EBML_SEEK_HEAD and size is not None:
+            for seek_id, seek_pos in _parse_seek_head(f, start, start + size):
+                positions.setdefault(seek_id, (segment_start + seek_pos, None))
+        elif element_id == EBML_CLUSTER:
+            break  # 헤더 요소는 클러스터 앞에 있으며, 뒤에 있으면 SeekHead로 찾음
+        if EBML_INFO in positions and EBML_TRACKS in positions:
+            break
+
+    duration = 0.0
+    if EBML_INFO in positions:
+        start, size = _resolve_element(f, positions[EBML_INFO], EBML_INFO, segment_end)
+        timecode_scale = 1_000_000
+        raw_duration = None
+        for element_id, child_start, child_size in _iter_ebml(f, start, start + size):
+            if element_id == EBML_TIMECODE_SCALE:
+                timecode_scale = _read_uint(f, child_start, child_size)
+            elif element_id == EBML_DURATION:
+                raw_duration = _read_float(f, child_start, child_size)
+        if raw_duration:
+            duration = raw_duration * timecode_scale / 1e9
+
+    width = height = None
+    codec = None
+    fps = None
+    if EBML_TRACKS in positions:
+        start, size = _resolve_element(f, positions[EBML_TRACKS], EBML_TRACKS, segment_end)
+        for element_id, entry_start, entry_size in _iter_ebml(f, start, start + size):
+            if element_id != EBML_TRACK_ENTRY or entry_size is None:
+                continue
+            track = _parse_mkv_track(f, entry_start, entry_start + entry_size)
+            if track is not None:
+                width, height, codec, fps = track
+                break
+
+    return VideoProbe(duration, width, height, codec, fps)
+
+def _parse_seek_head(f: BinaryIO, start: int, end: int) -> Iterator[Tuple[int, int]]:
+    """SeekHead에서 (요소 ID, 세그먼트 기준 위치) 를 읽습니다."""
+    for element_id, seek_start, seek_size in list(_iter_ebml(f, start, end)):
+        if element_id != EBML_SEEK or seek_size is None:
+            continue
+        seek_id = seek_pos = None
+        for child_id, child_start, child_size in _iter_ebml(f, seek_start, seek_start + seek_size):
+            if child_id == EBML_SEEK_ID:
+                seek_id = _read_uint(f, child_start, child_size)
+            elif child_id == EBML_SEEK_POSITION:
+                seek_pos = _read_uint(f, child_start, child_size)
+        if seek_id is not None and seek_pos is not None:
+            yield seek_id, seek_pos
+
+def _resolve_element(f: BinaryIO, position: Tuple[int, Optional[int]], expected_id: int,
+                     segment_end: int) -> Tuple[int, int]:
+    """SeekHead로 찾은 위치는 요소 헤더부터 시작하므로 헤더를 읽어 데이터 범위를 구합니다."""
+    start, size = position
+    if size is not None:
+        return start, size
+    # SeekHead 위치는 요소 ID부터 시작
+    if start >= segment_end:
+        raise ProbeError("Invalid SeekHead position")
+    element_id, data_start, size = _read_ebml_header(f, start)
+    if element_id != expected_id or size is None or data_start + size > segment_end:
+        raise ProbeError("Invalid SeekHead position")
+    return data_start, size
+
+def _parse_mkv_track(f: BinaryIO, start: int, end: int):
+    """비디오 트랙이면 (width, height, codec, fps) 를 반환합니다."""
+    track_type = None
+    codec = None
+    fps = None
+    width = height = None
+    for element_id, child_start, child_size in _iter_ebml(f, start, end):
+        if element_id == EBML_TRACK_TYPE:
+            track_type = _read_uint(f, child_start, child_size)
+        elif element_id == EBML_CODEC_ID:
+            codec = _read_string(f, child_start, child_size)
+        elif element_id == EBML_DEFAULT_DURATION:
+            frame_ns = _read_uint(f, child_start, child_size)
+            fps = round(1e9 / frame_ns, 3) if frame_ns else None
+        elif element_id == EBML_VIDEO and child_size is not None:
+            for video_id, video_start, video_size in _iter_ebml(f, child_start, child_start + child_size):
+                if video_id == EBML_PIXEL_WIDTH:
+                    width = _read_uint(f, video_start, video_size)
+                elif video_id == EBML_PIXEL_HEIGHT:
+                    height = _read_uint(f, video_start, video_size)
+    if track_type != 1:  # 1 = video
+        return None
+    return width, height, codec, fps
+
+# ---------------------------------------------------------------------------
+# AVI (RIFF)
+# ---------------------------------------------------------------------------
+
+def _iter_riff(f: BinaryIO, start: int, end: int) -> Iterator[Tuple[bytes, int, int, Optional[bytes]]]:
+    """RIFF 청크를 (id, 데이터 시작, 데이터 크기, LIST 타입) 으로 순회합니다."""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(12)
+        if len(header) < 8:
+            return
+        chunk_id, size = struct.unpack('<4sI', header[:8])
+        if chunk_id == b'LIST':
+            yield chunk_id, pos + 12, size - 4, header[8:12]
+        else:
+            yield chunk_id, pos + 8, size, None
+        pos += 8 + size + (size & 1)  # 청크는 2바이트 단위로 정렬됨
+
+def _probe_avi(f: BinaryIO, file_size: int) -> VideoProbe:
+    hdrl = None
+    for chunk_id, start, size, list_type in _iter_riff(f, 12, file_size):
+        if chunk_id == b'LIST' and list_type == b'hdrl':
+            hdrl = (start, min(start + size, file_size))
+            break
+        if chunk_id == b'LIST' and list_type == b'movi':
+            break
+    if hdrl is None:
+        raise ProbeError("hdrl list not found")
+
+    usec_per_frame = total_frames = 0
+    width = height = None
+    codec = None
+    rate = scale = length = 0
+    odml_frames = 0
+
+    for chunk_id, start, size, list_type in list(_iter_riff(f, hdrl[0], hdrl[1])):
+        if chunk_id == b'avih':
+            f.seek(start)
+            data = f.read(40)
+            if len(data) < 40:
+                raise ProbeError("Truncated avih header")
+            usec_per_frame, _, _, _, total_frames, _, _, _, w, h = struct.unpack('<10I', data)
+            width, height = w or None, h or None
+        elif chunk_id == b'LIST' and list_type == b'strl' and codec is None:
+            stream = _parse_avi_stream(f, start, start + size)
+            if stream is not None:
+                codec, rate, scale, length = stream
+        elif chunk_id == b'LIST' and list_type == b'odml':
+            # OpenDML(1GB 이상) 파일은 dmlh에 전체 프레임 수가 기록됨
+            for sub_id, sub_start, sub_size, _ in _iter_riff(f, start, start + size):
+                if sub_id == b'dmlh' and sub_size >= 4:
+                    odml_frames = _read_uint_le(f, sub_start, 4)
+
+    fps = rate / scale if rate and scale else (1e6 / usec_per_frame if usec_per_frame else None)
+    frames = odml_frames or length or total_frames
+    duration = frames / fps if fps else 0.0
+    return VideoProbe(duration, width, height, codec, fps)
+
+def _read_uint_le(f: BinaryIO, start: int, size: int) -> int:
+    f.seek(start)
+    return int.from_bytes(f.read(size), 'little')
+
+def _parse_avi_stream(f: BinaryIO, start: int, end: int):
+    """비디오 스트림이면 (codec, rate, scale, length) 를 반환합니다."""
+    handler = None
+    compression = None
+    rate = scale = length = 0
+    is_video = False
+    for chunk_id, chunk_start, chunk_size, _ in _iter_riff(f, start, end):
+        if chunk_id == b'strh':
+            f.seek(chunk_start)
+            data = f.read(36)
+            if len(data) < 36:
+                return None
+            is_video = data[0:4] == b'vids'
+            handler = data[4:8]
+            scale, rate, _, length = struct.unpack('<4I', data[20:36])
+        elif chunk_id == b'strf' and chunk_size >= 20:
+            f.seek(chunk_start)
+            compression = f.read(20)[16:20]
+    if not is_video:
+        return None
+    fourcc = compression if compression and compression.strip(b'\x00 ') else handler
+    codec = fourcc.decode('latin-1').strip('\x00 ') or None if fourcc else None
+    return codec, rate, scale, length
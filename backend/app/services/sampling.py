@@ -0,0 +1,113 @@
+from typing import List, Optional, Tuple
+import cv2
+import numpy as np
+from .probe import KeyframeInfo, probe_keyframes
+
+SAMPLING_STRATEGIES = ('auto', 'grab', 'seek')
+
+# 키프레임 정보를 알 수 없을 때 가정하는 키프레임 간격 (초). 일반적인 인코더 설정(keyint 250 @ 25~60fps) 기준
+DEFAULT_KEYFRAME_INTERVAL = 5.0
+
+# 탐색 한 번의 고정 비용 (디코딩 프레임 수로 환산). OpenCV의 FFmpeg 백엔드는 정확한 위치를 찾기 위해
+# 목표보다 최소 16프레임 앞으로 탐색한 뒤 순차적으로 디코딩함
+SEEK_OVERHEAD_FRAMES = 16
+
+class SamplingError(Exception):
+    """비디오에서 프레임을 추출할 수 없는 경우"""
+
+def plan_samples(total_frames: int, video_fps: float, duration_sec: float, fps: float) -> List[int]:
+    """비디오 중간 지점을 중심으로 duration_sec 동안 fps 간격으로 추출할 프레임 번호를 계산합니다."""
+    start_frame = max(0, total_frames // 2 - int(duration_sec * video_fps / 2))
+    step = video_fps / fps
+    indices = []
+    for i in range(int(duration_sec * fps)):
+        index = start_frame + round(i * step)
+        if indices and index <= indices[-1]:
+            index = indices[-1] + 1  # 원본 FPS가 더 낮으면 연속된 프레임 사용
+        if index >= total_frames:
+            break
+        indices.append(index)
+    return indices
+
+def choose_strategy(sample_gap: float, video_fps: float, keyframes: Optional[KeyframeInfo]) -> str:
+    """샘플 간격과 GOP 구조로 프레임 추출 방식을 고릅니다.
+
+    grab은 건너뛰는 프레임도 디코딩(색 변환만 생략) 하므로 샘플당 (샘플 간격 x FPS) 프레임을,
+    seek는 직전 키프레임부터 디코딩하므로 평균 (키프레임 간격 / 2 x FPS + 탐색 비용) 프레임을 디코딩합니다.
+    """
+    interval = keyframes.interval if keyframes is not None else DEFAULT_KEYFRAME_INTERVAL
+    seek_cost = interval / 2 + SEEK_OVERHEAD_FRAMES / video_fps
+    return 'seek' if seek_cost < sample_gap else 'grab'
+
+def read_frames_grab(cap: cv2.VideoCapture, indices: List[int]) -> List[np.ndarray]:
+    """순차적으로 읽으면서 건너뛰는 프레임은 grab()만 하고 샘플 프레임만 retrieve() 합니다."""
+    frames = []
+    if not indices:
+        return frames
+    cap.set(cv2.CAP_PROP_POS_FRAMES, indices[0])
+    position = indices[0]
+    for index in indices:
+        while position < index:
+            if not cap.grab():
+                return frames
+            position += 1
+        ret, frame = cap.read()
+        if not ret:
+            break
+        position += 1
+        frames.append(frame)
+    return frames
+
+def read_frames_seek(cap: cv2.VideoCapture, timestamps: List[float]) -> List[np.ndarray]:
+    """샘플마다 시각(CAP_PROP_POS_MSEC) 으로 탐색한 뒤 한 프레임을 읽습니다."""
+    frames = []
+    for t in timestamps:
+        cap.set(cv2.CAP_PROP_POS_MSEC, t * 1000.0)
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    return frames
+
+def sample_frames(video_path: str, duration_sec: float, fps: float, strategy: str = 'auto') -> Tuple[List[np.ndarray], str]:
+    """비디오 중간 구간에서 프레임을 추출하여 (BGR 프레임 목록, 사용한 방식) 을 반환합니다."""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise SamplingError(f"Could not open video file - {video_path}")
+
+    try:
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        video_fps = cap.get(cv2.CAP_PROP_FPS)
+        if total_frames <= 0 or video_fps <= 0:
+            raise SamplingError(f"Invalid frame count or FPS for {video_path}")
+
+        indices = plan_samples(total_frames, video_fps, duration_sec, fps)
+        sample_gap = (indices[-1] - indices[0]) / (len(indices) - 1) / video_fps if len(indices) > 1 else float('inf')
+
+        if strategy == 'auto':
+            strategy = choose_strategy(sample_gap, video_fps, probe_keyframes(video_path))
+
+        if strategy == 'seek':
+            return read_frames_seek(cap, [index / video_fps for index in indices]), strategy
+        return read_frames_grab(cap, indices), strategy
+    finally:
+        cap.release()
+
+def sample_poster_frame(video_path: str, position: float = 0.5) -> np.ndarray:
+    """비디오의 position(0~1) 지점으로 한 번 탐색하여 프레임 하나를 반환합니다."""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise SamplingError(f"Could not open video file - {video_path}")
+
+    try:
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        video_fps = cap.get(cv2.CAP_PROP_FPS)
+        if total_frames <= 0 or video_fps <= 0:
+            raise SamplingError(f"Invalid frame count or FPS for {video_path}")
+
+        frames = read_frames_seek(cap, [int(total_frames * position) / video_fps])
+        if not frames:
+            raise SamplingError(f"Could not read poster frame for {video_path}")
+        return frames[0]
+    finally:
+        cap.release()
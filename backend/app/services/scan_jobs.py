@@ -0,0 +1,139 @@
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional, Tuple
+from .. import database
+from ..logger import logger
+from .scanner import scan_videos, ScanProgress
+
+# 상태 조회를 위해 보관하는 완료된 작업 수
+MAX_JOB_HISTORY = 20
+
+class ScanJob:
+    """백그라운드에서 실행되는 스캔 작업"""
+
+    def __init__(self, full: bool = False, queued_after: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.full = full
+        self.queued_after = queued_after  # 예약된 작업이면 먼저 실행 중이던 작업 ID
+        self.status = "pending"  # pending -> running -> completed / failed
+        self.progress = ScanProgress()
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.done = threading.Event()
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "full": self.full,
+            "queued_after": self.queued_after,
+            "progress": self.progress.to_dict(),
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+class ScanJobManager:
+    """스캔 작업을 관리합니다. 동시에 하나의 스캔만 실행하며 중복 요청은 실행 중인 작업으로 합칩니다.
+
+    실행 중인 작업이 전체 스캔이 아닐 때 들어온 전체 스캔 요청은 합치지 않고, 현재 작업이 끝난 뒤 실행할
+    전체 스캔 하나로 모읍니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, ScanJob]" = OrderedDict()
+        self._active: Optional[ScanJob] = None
+        self._queued: Optional[ScanJob] = None  # 실행 중인 작업 다음에 실행할 전체 스캔
+        self.initial_job: Optional[ScanJob] = None
+        self._synced = False  # 스캔이 한 번이라도 성공했는지 여부
+
+    def start_initial_scan(self) -> ScanJob:
+        """서버 시작 시의 첫 스캔(초기 동기화)을 시작합니다."""
+        job, _ = self.start_scan()
+        self.initial_job = job
+        return job
+
+    def is_ready(self) -> bool:
+        """초기 동기화가 성공했는지 여부를 반환합니다. (초기 스캔이 실패한 경우 이후 스캔이 성공하면 True)"""
+        return self._synced
+
+    def start_scan(self, full: bool = False) -> Tuple[ScanJob, bool]:
+        """스캔 작업을 시작합니다. 이미 실행 중인 작업이 있으면 그 작업을 반환합니다.
+
+        실행 중인 작업이 전체 스캔이 아닌데 full=True이면 현재 작업이 끝난 뒤 실행할 전체 스캔을 예약하고
+        (이미 예약되어 있으면 그 작업) 반환합니다. 예약된 작업의 상태는 시작 전까지 pending입니다.
+
+        Returns:
+            (작업, 새로 만들었는지 여부)
+        """
+        with self._lock:
+            if self._active is not None:
+                if not full or self._active.full:
+                    return self._active, False
+                if self._queued is not None:
+                    return self._queued, False
+                job = self._queued = self._add_job(full, queued_after=self._active.id)
+                logger.info(f"Full scan job {job.id} queued after scan job {self._active.id}")
+                return job, True
+
+            job = self._active = self._add_job(full)
+
+        self._start(job)
+        return job, True
+
+    def _add_job(self, full: bool, queued_after: Optional[str] = None) -> ScanJob:
+        job = ScanJob(full, queued_after)
+        self._jobs[job.id] = job
+        while len(self._jobs) > MAX_JOB_HISTORY:
+            self._jobs.popitem(last=False)
+        return job
+
+    def _start(self, job: ScanJob):
+        thread = threading.Thread(target=self._run, args=(job,), daemon=True)
+        thread.start()
+
+    def get_job(self, job_id: str) -> Optional[ScanJob]:
+        """작업 ID로 작업을 조회합니다."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    @property
+    def active_job(self) -> Optional[ScanJob]:
+        return self._active
+
+    def _run(self, job: ScanJob):
+        """작업 스레드에서 스캔을 실행합니다."""
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        logger.info(f"Scan job {job.id} started")
+
+        db = database.SessionLocal()
+        try:
+            scan_videos(db, full=job.full, progress=job.progress)
+            job.status = "completed"
+            self._synced = True
+            logger.info(f"Scan job {job.id} completed: {job.progress.to_dict()}")
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.error(f"Scan job {job.id} failed: {str(e)}")
+        finally:
+            db.close()
+            job.finished_at = datetime.utcnow()
+            next_job = None
+            with self._lock:
+                if self._active is job:
+                    next_job = self._active = self._queued
+                    self._queued = None
+            job.done.set()
+            if next_job is not None:
+                self._start(next_job)
+
+# 전역 스캔 작업 관리자
+scan_job_manager = ScanJobManager()
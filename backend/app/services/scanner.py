@@ -1,19 +1,81 @@
 import os
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from ..models.video import Video
+from ..models.directory import ScannedDirectory
+from ..models.thumbnail_job import ThumbnailJob
 from .thumbnail import ensure_thumbnail, create_thumbnail
 from .metadata import (
-    get_video_duration, is_video_modified, 
+    is_video_modified, has_file_fingerprint, get_file_fingerprint,
     update_video_metadata
 )
+from .probe import probe_video
 from ..config import settings  # 싱글톤 settings import
-from typing import List, Set
-from .tags import cleanup_unused_tags
+from typing import List, Set, Iterator, NamedTuple
+from .tags import ScanTagWriter, cleanup_unused_tags
 from ..logger import logger
 from .thumbnail_worker import get_thumbnail_worker
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import defaultdict
+from sqlalchemy import insert, update, delete
 import hashlib
+import time
+import threading
 from datetime import datetime
 
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mkv', '.mov')
+REMOVE_BATCH_SIZE = 500  # SQLite 바인드 변수 제한을 넘지 않도록 나눠서 삭제
+# mtime 해상도가 낮은 파일시스템에서 같은 시각 안의 변경을 놓치지 않기 위한 여유 시간
+RACY_MTIME_WINDOW_NS = 2_000_000_000
+
+# 전체 스캔과 변경 경로 처리가 동시에 DB를 수정하지 않도록 직렬화
+scan_lock = threading.RLock()
+
+class ScanProgress:
+    """스캔 진행 상황 카운터 (스캔 스레드에서만 갱신하고 다른 스레드에서는 읽기만 함)"""
+
+    def __init__(self):
+        self.files_seen = 0
+        self.probed = 0
+        self.added = 0
+        self.updated = 0
+        self.removed = 0
+        self.thumbnails_queued = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "files_seen": self.files_seen,
+            "probed": self.probed,
+            "added": self.added,
+            "updated": self.updated,
+            "removed": self.removed,
+            "thumbnails_queued": self.thumbnails_queued,
+        }
+
+class KnownVideo(NamedTuple):
+    """스캔 시작 시 DB에서 미리 읽어 둔 비디오 정보 (변경 감지용 지문)"""
+    id: int
+    file_size: int | None
+    mtime_ns: int | None
+    inode: int | None
+    device: int | None
+    updated_at: datetime | None  # 지문이 없는 기존 레코드의 변경 판단용
+
+class JournalEntry(NamedTuple):
+    """디렉토리 저널에 기록된 디렉토리 정보"""
+    id: int
+    parent_path: str | None
+    mtime_ns: int | None
+
+class DirectoryListing(NamedTuple):
+    """디렉토리 하나를 방문한 결과"""
+    base_dir: str
+    path: str
+    parent_path: str | None
+    mtime_ns: int | None
+    files: list[tuple[str, os.stat_result]]
+    subdirs: list[str]
+    unchanged: bool  # 저널과 mtime이 같아 목록을 다시 읽지 않은 경우
+
 def is_file_in_video_directories(file_path: str, video_directories: list[str]) -> bool:
     """파일이 설정된 비디오 디렉토리 중 하나에 포함되어 있는지 확인합니다."""
     file_path = os.path.normpath(file_path)
@@ -23,23 +85,43 @@ def is_file_in_video_directories(file_path: str, video_directories: list[str]) -
             return True
     return False
 
-def remove_missing_videos(db: Session, existing_files: set[str], video_directories: list[str], settings):
-    """실제로 존재하지 않거나 설정된 디렉토리 외부에 있는 비디오 파일들을 DB에서 삭제합니다."""
-    all_videos = db.query(Video).all()
-    
-    for video in all_videos:
-        if (video.file_path not in existing_files or 
-            not is_file_in_video_directories(video.file_path, video_directories)):
-            logger.info(f"Removing video from DB: {video.file_path}")
-            try:
-                thumbnail_path = settings.get_thumbnail_path(video.thumbnail_id)
-                if os.path.exists(thumbnail_path):
-                    os.remove(thumbnail_path)
-            except Exception as e:
-                logger.error(f"Error removing thumbnail file: {str(e)}")
-            db.delete(video)
+def remove_missing_videos(db: Session, existing_files: set[str], video_directories: list[str], settings) -> int:
+    """실제로 존재하지 않거나 설정된 디렉토리 외부에 있는 비디오 파일들을 DB에서 삭제하고 삭제한 개수를 반환합니다."""
+    # 경로만 먼저 조회하고, 삭제 대상만 ORM 객체로 로드
+    missing_ids = [
+        video_id for video_id, file_path in db.query(Video.id, Video.file_path)
+        if (file_path not in existing_files or 
+            not is_file_in_video_directories(file_path, video_directories))
+    ]
+    
+    for i in range(0, len(missing_ids), REMOVE_BATCH_SIZE):
+        batch = missing_ids[i:i + REMOVE_BATCH_SIZE]
+        for video in db.query(Video).filter(Video.id.in_(batch)):
+            remove_video(db, video, settings)
     
     db.commit()
+    return len(missing_ids)
+
+def remove_video(db: Session, video: Video, settings):
+    """비디오를 DB에서 삭제하고 썸네일 파일을 정리합니다. 커밋은 호출한 쪽에서 합니다."""
+    logger.info(f"Removing video from DB: {video.file_path}")
+    try:
+        for thumbnail_path in settings.get_thumbnail_files(video.thumbnail_id):
+            if os.path.exists(thumbnail_path):
+                os.remove(thumbnail_path)
+    except Exception as e:
+        logger.error(f"Error removing thumbnail file: {str(e)}")
+    db.query(ThumbnailJob).filter(ThumbnailJob.thumbnail_id == video.thumbnail_id).delete(synchronize_session=False)
+    db.delete(video)
+
+def find_base_dir(path: str, video_directories: list[str]) -> str | None:
+    """경로가 속한 비디오 디렉토리를 반환합니다."""
+    path = os.path.normpath(path)
+    for base_dir in video_directories:
+        normalized = os.path.normpath(base_dir)
+        if path == normalized or path.startswith(normalized + os.sep):
+            return base_dir
+    return None
 
 def get_thumbnail_id(file_path: str) -> str:
     """파일 경로를 해시하여 썸네일 ID를 생성합니다."""
@@ -48,79 +130,357 @@ def get_thumbnail_id(file_path: str) -> str:
     # 32자리 hex 문자열 반환
     return hash_obj.hexdigest()[:32]
 
-def scan_videos(db: Session):
-    """비디오 파일들을 스캔하여 DB에 저장합니다."""
+def load_known_videos(db: Session) -> dict[str, KnownVideo]:
+    """DB에 저장된 비디오들을 한 번의 쿼리로 {file_path: (id, 지문)} 맵으로 불러옵니다."""
+    return {
+        file_path: KnownVideo(video_id, file_size, mtime_ns, inode, device, updated_at)
+        for video_id, file_path, file_size, mtime_ns, inode, device, updated_at in db.query(
+            Video.id, Video.file_path, Video.file_size, Video.mtime_ns, Video.inode, Video.device, Video.updated_at
+        )
+    }
+
+def load_directory_journal(db: Session) -> dict[str, JournalEntry]:
+    """디렉토리 저널을 한 번의 쿼리로 불러옵니다."""
+    return {
+        path: JournalEntry(dir_id, parent_path, mtime_ns)
+        for dir_id, path, parent_path, mtime_ns in db.query(
+            ScannedDirectory.id, ScannedDirectory.path, ScannedDirectory.parent_path, ScannedDirectory.mtime_ns
+        )
+    }
+
+def _list_directory(base_dir: str, dir_path: str, parent_path: str | None,
+                    journal: dict[str, JournalEntry], journal_children: dict[str, list[str]]) -> DirectoryListing | None:
+    """디렉토리 하나를 방문합니다.
+    
+    저널에 기록된 mtime과 같으면 목록을 읽지 않고 저널의 하위 디렉토리만 반환하고,
+    다르면 os.scandir로 비디오 파일 목록과 하위 디렉토리 목록을 읽습니다.
+    """
+    try:
+        mtime_ns = os.stat(dir_path).st_mtime_ns
+    except OSError as e:
+        logger.error(f"Error reading directory {dir_path}: {str(e)}")
+        return None
+    
+    entry = journal.get(dir_path)
+    if entry is not None and entry.mtime_ns == mtime_ns:
+        return DirectoryListing(base_dir, dir_path, parent_path, mtime_ns,
+                                [], journal_children.get(dir_path, []), True)
+    
+    files = []
+    subdirs = []
     try:
-        logger.info("Starting video scan...")
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                try:
+                    # os.walk와 동일하게 심볼릭 링크 디렉토리는 따라가지 않음
+                    if entry.is_dir() and not entry.is_symlink():
+                        subdirs.append(entry.path)
+                    elif entry.name.lower().endswith(VIDEO_EXTENSIONS) and entry.is_file():
+                        # DirEntry에 캐시된 stat 결과를 재사용
+                        files.append((entry.path, entry.stat()))
+                except OSError as e:
+                    logger.error(f"Error reading directory entry {entry.path}: {str(e)}")
+    except OSError as e:
+        logger.error(f"Error listing directory {dir_path}: {str(e)}")
+        return None
+    
+    # 방금 수정된 디렉토리는 같은 mtime 안에서 다시 바뀔 수 있으므로 기록하지 않음
+    if time.time_ns() - mtime_ns < RACY_MTIME_WINDOW_NS:
+        mtime_ns = None
+    return DirectoryListing(base_dir, dir_path, parent_path, mtime_ns,
+                            files, subdirs, False)
+
+def walk_directories(base_dirs: list[str], max_workers: int,
+                     journal: dict[str, JournalEntry] | None = None,
+                     start_dirs: list[tuple[str, str]] | None = None) -> Iterator[DirectoryListing]:
+    """여러 스레드로 디렉토리 트리를 탐색하며 디렉토리별 방문 결과를 생성합니다.
+    
+    journal이 주어지면 mtime이 바뀌지 않은 디렉토리는 다시 읽지 않습니다.
+    start_dirs에 (base_dir, dir_path) 목록을 주면 루트 대신 해당 하위 디렉토리부터 탐색합니다.
+    """
+    if start_dirs is None:
+        start_dirs = [(base_dir, base_dir) for base_dir in base_dirs]
+    journal = journal or {}
+    journal_children = defaultdict(list)
+    for path, entry in journal.items():
+        if entry.parent_path is not None:
+            journal_children[entry.parent_path].append(path)
+    
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scan-walker") as executor:
+        pending = {
+            executor.submit(_list_directory, base_dir, dir_path,
+                            None if dir_path == base_dir else os.path.dirname(dir_path),
+                            journal, journal_children)
+            for base_dir, dir_path in start_dirs
+        }
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                listing = future.result()
+                if listing is None:
+                    continue
+                # 하위 디렉토리는 다시 스레드 풀에 분배
+                for subdir in listing.subdirs:
+                    pending.add(executor.submit(
+                        _list_directory, listing.base_dir, subdir, listing.path, journal, journal_children
+                    ))
+                yield listing
+
+def save_directory_journal(db: Session, journal: dict[str, JournalEntry],
+                           listings: dict[str, DirectoryListing]):
+    """스캔 결과로 디렉토리 저널을 갱신합니다. 방문하지 않은 디렉토리는 저널에서 삭제합니다."""
+    now = datetime.utcnow()
+    removed_ids = [entry.id for path, entry in journal.items() if path not in listings]
+    for i in range(0, len(removed_ids), REMOVE_BATCH_SIZE):
+        db.execute(delete(ScannedDirectory).where(
+            ScannedDirectory.id.in_(removed_ids[i:i + REMOVE_BATCH_SIZE])
+        ))
+    
+    updated_rows = []
+    new_rows = []
+    for path, listing in listings.items():
+        if listing.unchanged:
+            continue
+        row = {
+            "parent_path": listing.parent_path,
+            "mtime_ns": listing.mtime_ns,
+            "scanned_at": now,
+        }
+        entry = journal.get(path)
+        if entry is not None:
+            updated_rows.append({"id": entry.id, **row})
+        else:
+            new_rows.append({"path": path, **row})
+    
+    if updated_rows:
+        db.execute(update(ScannedDirectory), updated_rows)
+    if new_rows:
+        db.execute(insert(ScannedDirectory), new_rows)
+    db.commit()
+
+def scan_videos(db: Session, full: bool = False, progress: ScanProgress | None = None):
+    """비디오 파일들을 스캔하여 DB에 저장합니다.
+    
+    full이 False이면 디렉토리 저널을 사용해 변경되지 않은 디렉토리는 다시 읽지 않습니다.
+    progress가 주어지면 진행 상황을 기록합니다.
+    """
+    with scan_lock:
+        _scan_videos(db, full, progress or ScanProgress())
+
+def _scan_videos(db: Session, full: bool, progress: ScanProgress):
+    try:
+        logger.info(f"Starting video scan{' (full)' if full else ''}...")
         
         # 썸네일 워커 시작
         thumbnail_worker = get_thumbnail_worker(settings)
         
-        video_extensions = ('.mp4', '.avi', '.mkv', '.mov')
+        # 기존 비디오 정보와 디렉토리 저널을 한 번에 로드하여 파일별 DB 조회 제거
+        known_videos = load_known_videos(db)
+        journal = load_directory_journal(db)
+        known_by_dir = defaultdict(list)
+        for file_path in known_videos:
+            known_by_dir[os.path.dirname(file_path)].append(file_path)
+        
         existing_files = set()
+        listings = {}
+        skipped_dirs = 0
+        tag_writer = ScanTagWriter(db)  # 비디오/태그 변경은 모아서 일괄 저장 (일정 개수나 시간마다 커밋)
         
-        for base_dir in settings.VIDEO_DIRECTORIES:
-            for root, _, files in os.walk(base_dir):
-                for file in files:
-                    if file.lower().endswith(video_extensions):
-                        try:
-                            file_path = os.path.join(root, file)
-                            existing_files.add(file_path)
-                            process_video_file(db, file_path, base_dir, thumbnail_worker)
-                        except Exception as e:
-                            logger.error(f"Error processing file {file_path}: {str(e)}")
-                            db.rollback()
-                            raise
+        for listing in walk_directories(settings.VIDEO_DIRECTORIES, settings.SCAN_MAX_WORKERS,
+                                        None if full else journal):
+            tag_writer.flush_if_due()
+            listings[listing.path] = listing
+            if listing.unchanged:
+                # 변경되지 않은 디렉토리의 파일은 DB에 있는 그대로 유지
+                unchanged_files = known_by_dir.get(listing.path, ())
+                existing_files.update(unchanged_files)
+                progress.files_seen += len(unchanged_files)
+                skipped_dirs += 1
+                continue
+            
+            complete = True
+            for file_path, file_stat in listing.files:
+                try:
+                    existing_files.add(file_path)
+                    progress.files_seen += 1
+                    if not process_video_file(db, file_path, listing.base_dir, thumbnail_worker,
+                                              known_videos=known_videos, file_stat=file_stat,
+                                              progress=progress, tag_writer=tag_writer):
+                        complete = False
+                except Exception as e:
+                    logger.error(f"Error processing file {file_path}: {str(e)}")
+                    db.rollback()
+                    raise
+            
+            # 처리하지 못한 파일(복사 중인 파일 등)이 있으면 다음 스캔 때 다시 읽도록 함
+            if not complete:
+                listings[listing.path] = listing._replace(mtime_ns=None)
         
-        remove_missing_videos(db, existing_files, settings.VIDEO_DIRECTORIES, settings)
+        tag_writer.flush()
+        progress.removed += remove_missing_videos(db, existing_files, settings.VIDEO_DIRECTORIES, settings)
         cleanup_unused_tags(db)
+        save_directory_journal(db, journal, listings)
         db.commit()
-        logger.info("Video scan completed successfully")
+        logger.info(
+            f"Video scan completed successfully ({len(existing_files)} files, "
+            f"{len(listings) - skipped_dirs} directories listed, {skipped_dirs} unchanged)"
+        )
         
     except Exception as e:
         logger.error(f"Error in scan_videos: {str(e)}")
         db.rollback()
         raise
 
-def process_video_file(db: Session, file_path: str, base_dir: str, thumbnail_worker):
-    logger.info(f"Processing video file: {file_path}")
-    """개별 비디오 파일 처리"""
-    existing_video = db.query(Video).filter(Video.file_path == file_path).first()
+def process_changed_paths(db: Session, paths: list[str]):
+    """파일 감시기에서 전달된 변경 경로들만 DB에 반영합니다.
+    
+    존재하는 비디오 파일은 process_video_file로 처리하고, 새로 생긴 디렉토리는 하위를 탐색하며,
+    사라진 경로는 해당 파일(또는 디렉토리 아래의 모든 비디오)을 DB에서 삭제합니다.
+    """
+    with scan_lock:
+        try:
+            thumbnail_worker = get_thumbnail_worker(settings)
+            new_dirs = []
+            
+            for path in paths:
+                base_dir = find_base_dir(path, settings.VIDEO_DIRECTORIES)
+                if base_dir is None:
+                    continue
+                
+                if os.path.isdir(path):
+                    new_dirs.append((base_dir, path))
+                elif os.path.isfile(path):
+                    if path.lower().endswith(VIDEO_EXTENSIONS):
+                        process_video_file(db, path, base_dir, thumbnail_worker)
+                    elif path.lower().endswith('.info'):
+                        _reload_info_file(db, path, base_dir)
+                else:
+                    # 삭제되거나 이동된 경로: 파일 자체 또는 디렉토리 아래의 비디오 삭제
+                    prefix = path.rstrip(os.sep) + os.sep
+                    removed = db.query(Video).filter(
+                        (Video.file_path == path) | Video.file_path.startswith(prefix, autoescape=True)
+                    ).all()
+                    for video in removed:
+                        remove_video(db, video, settings)
+                    db.commit()
+            
+            # 이동되어 들어온 디렉토리는 내부 파일 이벤트가 없으므로 직접 탐색
+            if new_dirs:
+                known_videos = load_known_videos(db)
+                tag_writer = ScanTagWriter(db)
+                for listing in walk_directories(settings.VIDEO_DIRECTORIES, settings.SCAN_MAX_WORKERS,
+                                                start_dirs=new_dirs):
+                    tag_writer.flush_if_due()
+                    for file_path, file_stat in listing.files:
+                        process_video_file(db, file_path, listing.base_dir, thumbnail_worker,
+                                           known_videos=known_videos, file_stat=file_stat,
+                                           tag_writer=tag_writer)
+                tag_writer.flush()
+            
+            cleanup_unused_tags(db)
+            db.commit()
+            
+        except Exception as e:
+            logger.error(f"Error processing changed paths: {str(e)}")
+            db.rollback()
+            raise
+
+def _reload_info_file(db: Session, info_path: str, base_dir: str):
+    """변경된 .info 파일에 해당하는 비디오의 카테고리와 태그를 다시 읽습니다."""
+    stem = os.path.splitext(info_path)[0]
+    video = db.query(Video).filter(
+        Video.file_path.in_([f"{stem}{ext}" for ext in VIDEO_EXTENSIONS + tuple(e.upper() for e in VIDEO_EXTENSIONS)])
+    ).first()
+    if video:
+        logger.info(f"Reloading metadata for: {video.file_path}")
+        update_video_metadata(video, video.file_path, base_dir, db)
+
+def process_video_file(db: Session, file_path: str, base_dir: str, thumbnail_worker,
+                       known_videos: dict[str, KnownVideo] | None = None,
+                       file_stat: os.stat_result | None = None,
+                       progress: ScanProgress | None = None,
+                       tag_writer: ScanTagWriter | None = None):
+    """개별 비디오 파일 처리
+    
+    known_videos와 file_stat이 주어지면 파일별 DB 조회와 stat 호출 없이 변경 여부를 판단합니다.
+    지문이 없는 기존 레코드는 파일이 바뀌지 않았으면 지문만 채웁니다.
+    tag_writer가 주어지면 비디오/태그 저장과 커밋을 tag_writer에 맡깁니다. (주어지지 않으면 파일마다 커밋)
+    probe 전에 오래 기다린 묶음을 먼저 커밋하며, 이 파일의 변경은 flush하지 않고 넘겨 probe 동안 쓰기 잠금을 잡지 않습니다.
+    처리 후 비디오가 DB에 있으면 True, 길이를 읽지 못해 건너뛴 경우 False를 반환합니다.
+    """
+    if known_videos is None:
+        existing_video = db.query(Video).filter(Video.file_path == file_path).first()
+    else:
+        existing_video = known_videos.get(file_path)
+    if file_stat is None:
+        file_stat = os.stat(file_path)
     
     # 새 비디오 생성 또는 기존 비디오 수정이 필요한 경우
     should_update = (
         not existing_video or 
-        (existing_video and is_video_modified(file_path, existing_video))
+        (existing_video and is_video_modified(file_path, existing_video, file_stat))
     )
     
     if should_update:
-        duration = get_video_duration(file_path)
-        if duration <= 0:
+        logger.info(f"Processing video file: {file_path}")
+        if tag_writer is not None:
+            tag_writer.flush_if_due()
+        probe = probe_video(file_path)
+        if progress is not None:
+            progress.probed += 1
+        if probe is None or probe.duration <= 0:
             logger.error(f"Failed to get duration for {file_path}")
-            return
+            return False
             
         thumbnail_id = get_thumbnail_id(file_path)
         
+        # 미리 로드한 정보로 판단한 경우 수정 대상만 ORM 객체로 로드
+        if isinstance(existing_video, KnownVideo):
+            existing_video = db.get(Video, existing_video.id)
+        
         if existing_video:
             logger.info(f"Updating modified video: {file_path}")
-            existing_video.duration = duration
-            existing_video.file_name = Video.get_file_name(file_path)
-            existing_video.thumbnail_id = thumbnail_id
-            existing_video.updated_at = datetime.now()
             video = existing_video
+            video.thumbnail_id = thumbnail_id
+            video.updated_at = datetime.utcnow()
         else:
             logger.info(f"Adding new video: {file_path}")
-            video = Video(
-                file_path=file_path,
-                file_name=Video.get_file_name(file_path),
-                thumbnail_id=thumbnail_id,
-                duration=duration
-            )
+            video = Video(file_path=file_path, thumbnail_id=thumbnail_id)
+        
+        video.file_name = Video.get_file_name(file_path)
+        video.duration = probe.duration
+        video.width = probe.width
+        video.height = probe.height
+        video.fps = probe.fps
+        video.codec = probe.codec
+        video.bitrate = int(file_stat.st_size * 8 / probe.duration)
+        for column, value in get_file_fingerprint(file_stat).items():
+            setattr(video, column, value)
         
+        is_new = existing_video is None
         db.add(video)
-        db.flush()
-        update_video_metadata(video, file_path, base_dir, db)
-        thumbnail_worker.add_task(thumbnail_id, file_path)
+        if tag_writer is None:
+            db.flush()
+        update_video_metadata(video, file_path, base_dir, db, tag_writer)
+        queued = thumbnail_worker.add_task(thumbnail_id, file_path)
+        
+        if progress is not None:
+            if is_new:
+                progress.added += 1
+            else:
+                progress.updated += 1
+            if queued:
+                progress.thumbnails_queued += 1
+    elif not has_file_fingerprint(existing_video):
+        # 지문 도입 전 레코드이고 파일이 바뀌지 않음: 다시 분석하지 않고 지문만 채움 (썸네일 등은 그대로 유지)
+        fingerprint = get_file_fingerprint(file_stat)
+        if tag_writer is not None:
+            tag_writer.set_fingerprint(existing_video.id, fingerprint)
+        else:
+            db.execute(update(Video).where(Video.id == existing_video.id).values(**fingerprint))
+            db.commit()
+    
+    return True
 
 def get_videos(db: Session, page: int = 1, page_size: int = 10) -> tuple[List[dict], int]:
     """저장된 비디오 목록을 반환합니다."""
@@ -129,6 +489,7 @@ def get_videos(db: Session, page: int = 1, page_size: int = 10) -> tuple[List[di
     
     # 페이징 및 정렬 적용하여 비디오 조회
     videos = db.query(Video)\
+        .options(selectinload(Video.tags))\
         .order_by(Video.file_name)\
         .offset((page - 1) * page_size)\
         .limit(page_size)\
@@ -143,6 +504,12 @@ def get_videos(db: Session, page: int = 1, page_size: int = 10) -> tuple[List[di
             "thumbnail_id": video.thumbnail_id,
             "duration": video.duration,
             "category": video.category,
+            "width": video.width,
+            "height": video.height,
+            "fps": video.fps,
+            "codec": video.codec,
+            "bitrate": video.bitrate,
+            "file_size": video.file_size,
             "created_at": video.created_at,
             "updated_at": video.updated_at,
             "tags": [{"id": tag.id, "name": tag.name} for tag in video.tags]
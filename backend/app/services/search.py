@@ -0,0 +1,123 @@
+import re
+from array import array
+from typing import List, Tuple
+from sqlalchemy import column, func, literal_column, select, table, text
+from sqlalchemy.orm import Session, selectinload
+from ..models.video import Video
+from ..logger import logger
+from .library_cache import GenerationCache
+from .listing import VideoFilter, build_video_query, resolve_filter
+
+# videos의 파일 이름, 경로, 카테고리를 색인하는 FTS5 테이블 (내용은 videos 테이블을 참조하고 트리거로 동기화)
+# unicode61 토크나이저가 경로를 '/', '.', '_' 등에서 나누므로 경로의 각 폴더 이름으로도 검색됨
+FTS_TABLE = "videos_fts"
+# 순위(bm25) 계산 시 컬럼별 가중치 (파일 이름 > 카테고리 > 경로)
+RANK_WEIGHTS = (10.0, 1.0, 5.0)
+
+MAX_QUERY_TERMS = 16
+
+_SEARCH_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        file_name, file_path, category,
+        content='videos', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS videos_fts_insert AFTER INSERT ON videos BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, file_name, file_path, category)
+        VALUES (new.id, new.file_name, new.file_path, new.category);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS videos_fts_delete AFTER DELETE ON videos BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, file_name, file_path, category)
+        VALUES ('delete', old.id, old.file_name, old.file_path, old.category);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS videos_fts_update AFTER UPDATE OF file_name, file_path, category ON videos BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, file_name, file_path, category)
+        VALUES ('delete', old.id, old.file_name, old.file_path, old.category);
+        INSERT INTO {FTS_TABLE}(rowid, file_name, file_path, category)
+        VALUES (new.id, new.file_name, new.file_path, new.category);
+    END""",
+]
+
+_fts = table(FTS_TABLE, column("rowid"))
+
+# 검색어와 필터 조건별 순위순 비디오 id 목록
+_results = GenerationCache(max_entries=64)
+
+# 따옴표로 묶은 구문 또는 공백으로 구분된 단어
+_TERM_PATTERN = re.compile(r'"([^"]*)"?|(\S+)')
+
+class InvalidSearchQuery(ValueError):
+    """검색어에 검색할 단어가 없는 경우"""
+
+def create_search_index(engine):
+    """검색 테이블과 동기화 트리거를 만듭니다. 테이블을 새로 만든 경우 기존 비디오를 색인합니다."""
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+        ).first() is not None
+        for statement in _SEARCH_DDL:
+            conn.execute(text(statement))
+        if not exists:
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+            logger.info(f"Created search index {FTS_TABLE}")
+
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+def build_match_query(query: str) -> str:
+    """사용자 검색어를 FTS5 MATCH 식으로 변환합니다.
+
+    단어는 모두 포함해야 하고(AND), 끝에 *를 붙이면 접두어로, "..." 로 묶으면 구문으로 검색합니다.
+    그 밖의 FTS5 연산자는 일반 문자로 취급합니다.
+    """
+    parts = []
+    for match in _TERM_PATTERN.finditer(query):
+        phrase, word = match.groups()
+        if phrase is not None:
+            if phrase.strip():
+                parts.append(_quote(phrase.strip()))
+        else:
+            prefix = word.endswith("*")
+            word = word.rstrip("*")
+            if word:
+                parts.append(_quote(word) + ("*" if prefix else ""))
+    if not parts:
+        raise InvalidSearchQuery(f"No search terms in query: {query}")
+    return " ".join(parts[:MAX_QUERY_TERMS])
+
+def search_video_ids(db: Session, query: str, filters: VideoFilter) -> array:
+    """검색어와 필터 조건에 맞는 비디오 id를 순위순으로 반환합니다. (데이터가 바뀌기 전까지 재사용)"""
+    match = build_match_query(query)
+
+    def compute(filters: VideoFilter):
+        rank = func.bm25(literal_column(FTS_TABLE), *RANK_WEIGHTS)
+        statement = select(_fts.c.rowid).where(literal_column(FTS_TABLE).op("MATCH")(match))
+        if not filters.is_empty:
+            statement = statement.where(_fts.c.rowid.in_(build_video_query(db, filters, Video.id).statement))
+        return array("q", db.execute(statement.order_by(rank, _fts.c.rowid)).scalars())
+
+    if filters.is_empty:
+        return _results.get_or_compute((match, filters.key), lambda: compute(filters))
+    resolved = resolve_filter(db, filters)
+    if resolved is None:
+        return _results.get_or_compute((match, filters.key), lambda: compute(filters))
+    # 필터 없는 검색 결과를 태그 인덱스의 필터 결과로 거름
+    ranked = _results.get_or_compute((match, VideoFilter().key), lambda: compute(VideoFilter()))
+    return _results.get_or_compute(
+        (match, filters.key),
+        lambda: array("q", (video_id for video_id in ranked if video_id in resolved))
+    )
+
+def search_videos(db: Session, query: str, filters: VideoFilter, page: int, size: int) -> Tuple[List[Video], int]:
+    """검색 결과의 한 페이지를 조회합니다.
+
+    Returns:
+        (비디오 목록, 전체 결과 수)
+    """
+    ids = search_video_ids(db, query, filters)
+    page_ids = ids[(page - 1) * size:page * size].tolist()
+    if not page_ids:
+        return [], len(ids)
+    videos = db.query(Video).options(selectinload(Video.tags)).filter(Video.id.in_(page_ids)).all()
+    position = {video_id: index for index, video_id in enumerate(page_ids)}
+    videos.sort(key=lambda video: position[video.id])
+    return videos, len(ids)
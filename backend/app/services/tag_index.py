@@ -0,0 +1,149 @@
+import threading
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import event, inspect, select
+from .. import database
+from ..models.video import Video
+from ..models.tag import Tag, video_tags
+from ..logger import logger
+
+# 세션에 모아 두는 변경 종류 (추가/제거된 연결, 추가/삭제된 비디오, 삭제된 태그)
+_CHANGE_KEYS = ("add", "remove", "videos", "deleted", "tags")
+
+def ids_to_bits(ids: Iterable[int]) -> int:
+    """id 목록을 비트셋(int) 으로 변환합니다."""
+    ids = list(ids)
+    if not ids:
+        return 0
+    data = bytearray(max(ids) // 8 + 1)
+    for video_id in ids:
+        data[video_id >> 3] |= 1 << (video_id & 7)
+    return int.from_bytes(data, 'little')
+
+def bits_to_ids(bits: int) -> array:
+    """비트셋을 오름차순 id 배열로 변환합니다."""
+    ids = array('q')
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+    for byte_index, byte in enumerate(data):
+        if byte:
+            base = byte_index * 8
+            for bit in range(8):
+                if byte >> bit & 1:
+                    ids.append(base + bit)
+    return ids
+
+class TagIndex:
+    """태그 id -> 비디오 id 비트셋(Python int) 메모리 인덱스
+
+    시작 시 video_tags 테이블에서 만들고, 이후에는 세션이 flush한 태그 변경(Video.tags 추가/제거, 비디오/태그 삭제) 을
+    모아 두었다가 커밋될 때 반영합니다. (ORM을 거치지 않는 일괄 변경은 record_changes로 기록) 비트셋은 변경할 때마다 새 int로 교체하므로 읽는 쪽은 잠금 없이 사용합니다.
+    """
+
+    def __init__(self):
+        self._tags: Dict[int, int] = {}
+        self._all = 0  # 모든 비디오 (NOT 조건의 기준)
+        self._lock = threading.Lock()
+        self.ready = False
+
+    def install(self, session_factory):
+        """세션의 태그 변경을 추적하도록 이벤트를 등록합니다."""
+        event.listen(session_factory, "after_flush", self._on_flush)
+        event.listen(session_factory, "after_rollback", self._on_rollback)
+        database.add_commit_hook(self._on_commit)
+
+    def build(self, db):
+        """DB에서 인덱스를 다시 만듭니다."""
+        tag_videos: Dict[int, List[int]] = {}
+        for video_id, tag_id in db.execute(select(video_tags.c.video_id, video_tags.c.tag_id)):
+            if video_id is not None and tag_id is not None:
+                tag_videos.setdefault(tag_id, []).append(video_id)
+        tags = {tag_id: ids_to_bits(video_ids) for tag_id, video_ids in tag_videos.items()}
+        all_videos = ids_to_bits(video_id for video_id, in db.execute(select(Video.id)))
+        with self._lock:
+            self._tags = tags
+            self._all = all_videos
+            self.ready = True
+        logger.info(f"Built tag index: {len(tags)} tags, {all_videos.bit_count()} videos")
+
+    def resolve(self, tag_ids: Optional[List[int]], match_all: bool,
+                exclude_tag_ids: Optional[List[int]] = None) -> int:
+        """태그 조건에 맞는 비디오 비트셋을 반환합니다.
+
+        tag_ids가 있으면 match_all에 따라 모두(AND) 또는 하나 이상(OR) 가진 비디오, 없으면 모든 비디오에서
+        exclude_tag_ids 중 하나라도 가진 비디오를 제외합니다.
+        """
+        tags, all_videos = self._tags, self._all
+        if tag_ids:
+            sets = [tags.get(tag_id, 0) for tag_id in set(tag_ids)]
+            bits = sets[0]
+            for other in sets[1:]:
+                bits = bits & other if match_all else bits | other
+        else:
+            bits = all_videos
+        for tag_id in set(exclude_tag_ids or ()):
+            bits &= ~tags.get(tag_id, 0)
+        return bits
+
+    def tag_bits(self, tag_id: int) -> int:
+        return self._tags.get(tag_id, 0)
+
+    def tag_items(self) -> List[Tuple[int, int]]:
+        """(태그 id, 비트셋) 목록을 반환합니다."""
+        return list(self._tags.items())
+
+    def all_bits(self) -> int:
+        return self._all
+
+    def record_changes(self, session, add: Iterable[Tuple[int, int]] = (), remove: Iterable[Tuple[int, int]] = ()):
+        """ORM을 거치지 않고 변경한 (비디오 id, 태그 id) 연결을 기록합니다. 세션이 커밋될 때 반영됩니다."""
+        self._record(session, {"add": list(add), "remove": list(remove)})
+
+    def _on_flush(self, session, flush_context):
+        changes = {key: [] for key in _CHANGE_KEYS}
+        for obj in session.new:
+            if isinstance(obj, Video):
+                changes["videos"].append(obj.id)
+        for obj in (*session.new, *session.dirty):
+            if isinstance(obj, Video):
+                history = inspect(obj).attrs.tags.history
+                changes["add"].extend((obj.id, tag.id) for tag in history.added)
+                changes["remove"].extend((obj.id, tag.id) for tag in history.deleted)
+        for obj in session.deleted:
+            if isinstance(obj, Video):
+                changes["deleted"].append(obj.id)
+            elif isinstance(obj, Tag):
+                changes["tags"].append(obj.id)
+        
+        self._record(session, changes)
+
+    def _record(self, session, changes: Dict[str, list]):
+        if any(changes.values()):
+            pending = session.info.setdefault("tag_index_changes", {key: [] for key in _CHANGE_KEYS})
+            for key, values in changes.items():
+                pending[key].extend(values)
+
+    def _on_rollback(self, session):
+        session.info.pop("tag_index_changes", None)
+
+    def _on_commit(self, session):
+        changes = session.info.pop("tag_index_changes", None)
+        if not changes or not self.ready:
+            return
+        with self._lock:
+            tags = dict(self._tags)
+            all_videos = self._all | ids_to_bits(changes["videos"])
+            for video_id, tag_id in changes["remove"]:
+                tags[tag_id] = tags.get(tag_id, 0) & ~(1 << video_id)
+            for video_id, tag_id in changes["add"]:
+                tags[tag_id] = tags.get(tag_id, 0) | (1 << video_id)
+            if changes["deleted"]:
+                deleted = ids_to_bits(changes["deleted"])
+                all_videos &= ~deleted
+                tags = {tag_id: bits & ~deleted for tag_id, bits in tags.items()}
+            for tag_id in changes["tags"]:
+                tags.pop(tag_id, None)
+            self._tags = {tag_id: bits for tag_id, bits in tags.items() if bits}
+            self._all = all_videos
+
+# 전역 태그 인덱스
+tag_index = TagIndex()
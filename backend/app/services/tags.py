@@ -1,10 +1,17 @@
+from sqlalchemy import bindparam, insert, select, update
 from sqlalchemy.orm import Session
-from app.models.tag import Tag
+from app.models.tag import Tag, video_tags
 from app.models.video import Video
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Tuple
 from ..config import settings  # 싱글톤 settings import
 from ..logger import logger
+from .tag_index import tag_index
 import os
+import time
+
+BIND_BATCH_SIZE = 500  # SQLite 바인드 변수 제한(기본 999) 을 넘지 않도록 나눠서 실행
+SCAN_TAG_BATCH_SIZE = 500  # 스캔 중 태그를 모았다가 한 번에 저장(커밋) 할 비디오 수
+SCAN_TAG_BATCH_SECONDS = 1.0  # 쓰기 잠금을 오래 잡지 않도록 이 시간이 지나면 모인 만큼 저장
 
 def update_info_file_tags(file_path: str, tags_to_add: List[str] = None, tags_to_remove: List[str] = None):
     """비디오의 .info 파일의 태그를 수정합니다."""
@@ -64,13 +71,121 @@ def update_video_tags(db: Session, video: Video, tag_names: List[str]):
         for tag_name in tag_names:
             if tag_name.strip():  # 빈 태그 제외
                 tag = get_or_create_tag(db, tag_name.strip())
-                video.tags.append(tag)
+                if tag not in video.tags:  # 같은 태그 중복 연결 방지 (video_tags 기본 키)
+                    video.tags.append(tag)
         
         db.commit()  # 여기서 한 번에 커밋
     except:
         db.rollback()
         raise
 
+def _batches(items: list, size: int) -> Iterable[list]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+class ScanTagWriter:
+    """스캔 중 비디오들의 태그를 모았다가 일괄 저장합니다.
+
+    태그 이름 -> id 맵은 처음 저장할 때 한 번의 조회로 만들어 스캔이 끝날 때까지 재사용하고, 새 태그만 일괄
+    INSERT합니다. video_tags는 기존 연결과 비교해 바뀐 행만 일괄 삭제/추가하며, 모인 비디오가 batch_size개가
+    되거나 batch_seconds가 지나면 세션을 커밋합니다. 일괄 INSERT는 executemany로 실행합니다.
+    (여러 행 VALUES 문은 행 수마다 SQL 컴파일을 다시 해서 더 느림)
+
+    비디오 변경도 flush하지 않은 채로 받아 flush()에서 함께 쓰고 바로 커밋합니다. 첫 쓰기 문에서 잡히는 DB 쓰기
+    잠금을 커밋 전까지 유지하므로, 저장을 미루는 동안(다음 파일의 probe, 디렉토리 탐색) 에는 잠금을 잡지 않습니다.
+    탐색 중에는 flush_if_due()로 batch_seconds가 지난 묶음을 저장합니다.
+    지문이 없는 기존 레코드의 지문 채우기(set_fingerprint) 도 같은 묶음으로 저장합니다.
+    """
+
+    def __init__(self, db: Session, batch_size: int = SCAN_TAG_BATCH_SIZE,
+                 batch_seconds: float = SCAN_TAG_BATCH_SECONDS):
+        self.db = db
+        self.batch_size = batch_size
+        self.batch_seconds = batch_seconds
+        self._tag_ids: Dict[str, int] | None = None
+        self._pending: Dict[Video, List[str]] = {}
+        self._fingerprints: Dict[int, dict] = {}
+        self._batch_started = 0.0
+
+    def set_tags(self, video: Video, tag_names: List[str]):
+        """비디오의 태그 목록을 tag_names로 바꾸도록 예약합니다. (새 비디오는 flush 전이라 id가 없어도 됨)"""
+        self._start_batch()
+        names = (name.strip() for name in tag_names)
+        self._pending[video] = list(dict.fromkeys(name for name in names if name))  # 빈 태그, 중복 제외
+        self._flush_if_full()
+
+    def set_fingerprint(self, video_id: int, fingerprint: dict):
+        """비디오의 파일 지문 컬럼을 fingerprint로 채우도록 예약합니다."""
+        self._start_batch()
+        self._fingerprints[video_id] = fingerprint
+        self._flush_if_full()
+
+    def _start_batch(self):
+        if not self._pending and not self._fingerprints:
+            self._batch_started = time.monotonic()
+
+    def _flush_if_full(self):
+        if len(self._pending) + len(self._fingerprints) >= self.batch_size:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def flush_if_due(self):
+        """예약된 변경이 batch_seconds보다 오래 기다렸으면 저장합니다. (오래 걸리는 I/O 전에 호출)"""
+        if ((self._pending or self._fingerprints)
+                and time.monotonic() - self._batch_started >= self.batch_seconds):
+            self.flush()
+
+    def resolve(self, tag_names: Iterable[str]) -> Dict[str, int]:
+        """태그 이름들의 id를 반환합니다. 없는 태그는 새로 추가합니다. (커밋은 하지 않음)"""
+        if self._tag_ids is None:
+            self._tag_ids = {name: tag_id for tag_id, name in self.db.execute(select(Tag.id, Tag.name))}
+        missing = [name for name in dict.fromkeys(tag_names) if name not in self._tag_ids]
+        for batch in _batches(missing, BIND_BATCH_SIZE):
+            # 맵을 만든 뒤 다른 요청이 같은 이름의 태그를 추가했을 수 있으므로 중복은 무시하고 다시 조회
+            self.db.execute(insert(Tag.__table__).prefix_with("OR IGNORE"), [{"name": name} for name in batch])
+            self._tag_ids.update(
+                (name, tag_id) for tag_id, name in self.db.execute(select(Tag.id, Tag.name).where(Tag.name.in_(batch)))
+            )
+        return self._tag_ids
+
+    def flush(self):
+        """예약된 비디오/태그 변경을 저장하고 커밋합니다."""
+        if not self._pending and not self._fingerprints:
+            return
+        pending, self._pending = self._pending, {}
+        fingerprints, self._fingerprints = self._fingerprints, {}
+        try:
+            self.db.flush()  # 새 비디오의 id 할당 (이 시점부터 커밋까지 쓰기 잠금을 잡음)
+            if fingerprints:
+                self.db.execute(update(Video), [{"id": video_id, **values} for video_id, values in fingerprints.items()])
+            pending = {video.id: names for video, names in pending.items()}
+            tag_ids = self.resolve(name for names in pending.values() for name in names) if pending else {}
+            wanted = {(video_id, tag_ids[name]) for video_id, names in pending.items() for name in names}
+            existing = set()
+            for batch in _batches(list(pending), BIND_BATCH_SIZE):
+                rows = self.db.execute(
+                    select(video_tags.c.video_id, video_tags.c.tag_id).where(video_tags.c.video_id.in_(batch))
+                )
+                existing.update((video_id, tag_id) for video_id, tag_id in rows)
+            removed = existing - wanted
+            added = sorted(wanted - existing)
+            
+            if removed:
+                self.db.execute(
+                    video_tags.delete().where(video_tags.c.video_id == bindparam("v"),
+                                              video_tags.c.tag_id == bindparam("t")),
+                    [{"v": video_id, "t": tag_id} for video_id, tag_id in removed]
+                )
+            if added:
+                self.db.execute(video_tags.insert(), [{"video_id": video_id, "tag_id": tag_id} for video_id, tag_id in added])
+            tag_index.record_changes(self.db, add=added, remove=removed)
+            self.db.commit()
+        except:
+            self.db.rollback()
+            self._tag_ids = None  # 롤백된 새 태그 id가 남지 않도록 다시 조회
+            raise
+
 def get_all_tags(db: Session) -> List[Tag]:
     """모든 태그 목록을 반환합니다."""
     return db.query(Tag).all()
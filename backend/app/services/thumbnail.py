@@ -1,117 +1,227 @@
 import os
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
 import cv2
 import numpy as np
 from PIL import Image
 from app.config import Settings
+from app.logger import logger
+from app.services.sampling import sample_frames, sample_poster_frame, SamplingError
+from app.services.thumbnail_metrics import get_process_rss
 
-def create_thumbnail(video_path: str, thumbnail_path: str, settings: Settings) -> bool:
-    """비디오 파일의 중간 부분에서 프레임을 추출하여 WebP 애니메이션으로 저장합니다."""
-    working_path = f"{thumbnail_path}.tmp"  # 임시 파일 경로
+def resize_frame(frame: np.ndarray, max_size: int) -> np.ndarray:
+    """긴 변이 max_size px를 넘지 않도록 프레임 크기를 조정합니다."""
+    height, width = frame.shape[:2]
+    if width > height:
+        if width > max_size:
+            scale = max_size / width
+            new_width = max_size
+            new_height = int(height * scale)
+            frame = cv2.resize(frame, (new_width, new_height))
+    else:
+        if height > max_size:
+            scale = max_size / height
+            new_width = int(width * scale)
+            new_height = max_size
+            frame = cv2.resize(frame, (new_width, new_height))
+    return frame
+
+def encode_animation(frames: List[Image.Image], output_path: str, fps: float, quality: int, method: int):
+    """프레임들을 WebP 애니메이션으로 저장합니다."""
+    duration_ms = int(1000 / fps)  # 프레임당 지속 시간 (밀리초)
+    frames[0].save(
+        output_path,
+        format='WEBP',
+        append_images=frames[1:],
+        save_all=True,
+        duration=duration_ms,
+        loop=0,
+        quality=quality,
+        method=method
+    )
+
+def _remove_file(path: str):
+    """에러 발생 시 임시 파일을 정리합니다."""
+    try:
+        if os.path.exists(path):
+            os.remove(path)
+    except Exception:
+        pass
+
+class ThumbnailError(Exception):
+    """썸네일을 생성할 수 없는 경우"""
+
+def _task_stats(timings: dict) -> dict:
+    """단계별 소요 시간(초) 에 워커 프로세스 정보를 더합니다. (메트릭 집계용)"""
+    timings["total"] = sum(timings.values())
+    timings["pid"] = os.getpid()
+    timings["rss"] = get_process_rss()
+    return timings
+
+def _to_image(frame: np.ndarray) -> Image.Image:
+    """BGR 프레임을 RGB 이미지로 변환합니다."""
+    return Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+def _rendition_outputs(output_path: Optional[str], max_size: int,
+                       renditions: Optional[Dict[int, str]]) -> List[Tuple[int, str]]:
+    """저장할 (크기, 경로) 목록을 반환합니다. 기본 파일이 마지막에 교체되도록 가장 뒤에 둡니다."""
+    outputs = sorted((renditions or {}).items())
+    if output_path is not None:
+        outputs.append((max_size, os.path.normpath(output_path)))
+    return outputs
+
+def _replace_outputs(outputs: List[Tuple[int, str]]):
+    """임시 파일들을 최종 경로로 이동합니다. (기본 파일이 있으면 작은 크기들도 있음을 보장)"""
+    for _, path in outputs:
+        os.replace(f"{path}.tmp", path)
+
+def render_poster(video_path: str, poster_path: Optional[str], settings: Settings,
+                  renditions: Optional[Dict[int, str]] = None) -> dict:
+    """비디오 중간 지점의 프레임 하나를 정지 WebP 이미지(포스터) 로 저장합니다. (탐색 1회, 빠른 인코딩)
+
+    renditions(크기 -> 경로) 가 주어지면 같은 프레임으로 작은 크기의 포스터도 저장합니다.
+    poster_path가 None이면 기본 크기 파일은 그대로 두고 renditions만 저장합니다.
+    단계별 소요 시간을 반환하며, 실패하면 예외를 발생시킵니다.
+    """
+    outputs = _rendition_outputs(poster_path, settings.THUMBNAIL_MAX_SIZE, renditions)
+    
+    try:
+        video_path = os.path.normpath(video_path)
+        os.makedirs(os.path.dirname(outputs[-1][1]), exist_ok=True)
+        
+        started = time.perf_counter()
+        frame = sample_poster_frame(video_path)
+        decoded = time.perf_counter()
+        # 작은 크기는 max_size로 줄인 프레임에서 다시 줄임
+        frame = resize_frame(frame, settings.THUMBNAIL_MAX_SIZE)
+        images = [(path, _to_image(resize_frame(frame, size))) for size, path in outputs]
+        resized = time.perf_counter()
+        for path, image in images:
+            image.save(
+                f"{path}.tmp",
+                format='WEBP',
+                quality=settings.THUMBNAIL_POSTER_QUALITY,
+                method=settings.THUMBNAIL_POSTER_METHOD
+            )
+        _replace_outputs(outputs)
+        encoded = time.perf_counter()
+        return _task_stats({"decode": decoded - started, "resize": resized - decoded, "encode": encoded - resized})
+        
+    except Exception:
+        for _, path in outputs:
+            _remove_file(f"{path}.tmp")
+        raise
+
+def render_thumbnail(video_path: str, thumbnail_path: Optional[str], settings: Settings,
+                     renditions: Optional[Dict[int, str]] = None) -> dict:
+    """비디오 파일의 중간 부분에서 프레임을 추출하여 WebP 애니메이션으로 저장합니다.
+
+    renditions(크기 -> 경로) 가 주어지면 같은 디코딩 결과로 작은 크기의 애니메이션도 저장합니다.
+    thumbnail_path가 None이면 기본 크기 파일은 그대로 두고 renditions만 저장합니다.
+    단계별 소요 시간을 반환하며, 실패하면 예외를 발생시킵니다.
+    """
+    # 경로를 운영체제에 맞게 정규화
+    outputs = _rendition_outputs(thumbnail_path, settings.THUMBNAIL_MAX_SIZE, renditions)
     
     try:
-        # 기존 임시 파일 제거
-        if os.path.exists(working_path):
-            os.remove(working_path)
-            
         # 설정에서 값 가져오기
         duration_sec = settings.THUMBNAIL_DURATION
         fps = settings.THUMBNAIL_FPS
         max_size = settings.THUMBNAIL_MAX_SIZE
         
-        # 경로를 운영체제에 맞게 정규화
         video_path = os.path.normpath(video_path)
-        thumbnail_path = os.path.normpath(thumbnail_path)
         
         # 썸네일 디렉토리 생성
-        os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+        os.makedirs(os.path.dirname(outputs[-1][1]), exist_ok=True)
+        
+        # 1. 프레임 추출 (GOP 구조와 샘플 간격에 따라 grab/seek 방식 선택)
+        started = time.perf_counter()
+        samples, _ = sample_frames(video_path, duration_sec, fps, settings.THUMBNAIL_SAMPLING)
+        if not samples:
+            raise ThumbnailError(f"No frames extracted from {video_path}")
+        decoded = time.perf_counter()
         
-        # 비디오 파일 열기
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            print(f"Error: Could not open video file - {video_path}")
-            return False
+        # 2. 크기별로 조정 후 BGR에서 RGB로 변환 (작은 크기는 max_size로 줄인 프레임에서 다시 줄임)
+        samples = [resize_frame(frame, max_size) for frame in samples]
+        animations = [
+            (path, [_to_image(resize_frame(frame, size)) for frame in samples])
+            for size, path in outputs
+        ]
+        resized = time.perf_counter()
         
-        try:
-            # 전체 프레임 수와 원본 FPS 가져오기
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            video_fps = cap.get(cv2.CAP_PROP_FPS)
-            if total_frames <= 0 or video_fps <= 0:
-                print(f"Error: Invalid frame count or FPS for {video_path}")
-                return False
-            
-            # 중간 지점 계산
-            middle_frame = total_frames // 2
-            start_frame = middle_frame - int(duration_sec * video_fps / 2)
-            start_frame = max(0, start_frame)  # 시작 프레임이 0 이하가 되지 않도록
-            
-            # 추출할 프레임 수 계산
-            frames_to_extract = int(duration_sec * fps)
-            frame_interval = int(video_fps / fps)
-            
-            # 시작 위치로 이동
-            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
-            
-            frames = []
-            for _ in range(frames_to_extract):
-                # 프레임 읽기
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                
-                # 이미지 크기 조정 (최대 max_size px)
-                height, width = frame.shape[:2]
-                if width > height:
-                    if width > max_size:
-                        scale = max_size / width
-                        new_width = max_size
-                        new_height = int(height * scale)
-                        frame = cv2.resize(frame, (new_width, new_height))
-                else:
-                    if height > max_size:
-                        scale = max_size / height
-                        new_width = int(width * scale)
-                        new_height = max_size
-                        frame = cv2.resize(frame, (new_width, new_height))
-                
-                # BGR에서 RGB로 변환
-                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                frames.append(Image.fromarray(frame_rgb))
-                
-                # 다음 프레임으로 이동
-                for _ in range(frame_interval - 1):
-                    cap.read()
-            
-            if frames:
-                # WebP 애니메이션으로 임시 파일에 저장
-                duration_ms = int(1000 / fps)  # 프레임당 지속 시간 (밀리초)
-                frames[0].save(
-                    working_path,
-                    format='WEBP',
-                    append_images=frames[1:],
-                    save_all=True,
-                    duration=duration_ms,
-                    loop=0,
-                    quality=80,
-                    method=6  # 최상의 압축
-                )
-                # 작업 완료 후 파일 이름 변경
-                os.replace(working_path, thumbnail_path)
-                return True
-            
-            return False
-            
-        finally:
-            cap.release()
+        # 3. WebP 애니메이션으로 임시 파일에 저장 후 이름 변경
+        for path, frames in animations:
+            encode_animation(frames, f"{path}.tmp", fps, settings.THUMBNAIL_QUALITY, settings.THUMBNAIL_METHOD)
+        _replace_outputs(outputs)
+        encoded = time.perf_counter()
+        return _task_stats({"decode": decoded - started, "resize": resized - decoded, "encode": encoded - resized})
         
+    except Exception:
+        for _, path in outputs:
+            _remove_file(f"{path}.tmp")
+        raise
+
+def create_thumbnail(video_path: str, thumbnail_path: str, settings: Settings) -> bool:
+    """애니메이션 썸네일을 생성하고 성공 여부를 반환합니다."""
+    try:
+        render_thumbnail(video_path, thumbnail_path, settings)
+        return True
+    except (SamplingError, ThumbnailError) as e:
+        logger.error(f"Error creating thumbnail for {video_path}: {str(e)}")
+        return False
     except Exception as e:
-        # 에러 발생 시 임시 파일 정리
-        try:
-            if os.path.exists(working_path):
-                os.remove(working_path)
-        except Exception:
-            pass
+        logger.error(f"Unexpected error creating thumbnail for {video_path}: {type(e).__name__}: {str(e)}")
         return False
 
+def select_size(size: Optional[int], settings: Settings) -> int:
+    """요청한 크기 이상인 가장 작은 생성 크기를 반환합니다. (없거나 지정하지 않으면 max_size)"""
+    if size is not None:
+        for candidate in settings.THUMBNAIL_SIZES:
+            if candidate >= size:
+                return candidate
+    return settings.THUMBNAIL_MAX_SIZE
+
+class ThumbnailFile(NamedTuple):
+    """제공할 썸네일 파일 (캐시 검증용 mtime과 크기 포함)"""
+    path: str
+    animated: bool
+    mtime_ns: int
+    size: int
+
+def find_thumbnail_file(thumbnail_id: str, settings: Settings, size: Optional[int] = None) -> Optional[ThumbnailFile]:
+    """제공할 썸네일 파일을 찾습니다. 애니메이션 썸네일이 아직 없거나 포스터보다 오래되었으면 포스터를 반환합니다.
+
+    size에 맞는 크기의 파일이 없으면(크기 설정 변경 전에 생성된 경우 등) max_size 파일을 찾습니다.
+    파일이 없으면 None을 반환합니다.
+    """
+    sizes = [select_size(size, settings)]
+    if sizes[0] != settings.THUMBNAIL_MAX_SIZE:
+        sizes.append(settings.THUMBNAIL_MAX_SIZE)
+    
+    for rendition in sizes:
+        newest = None
+        candidates = (
+            (settings.get_thumbnail_path(thumbnail_id, rendition), True),
+            (settings.get_poster_path(thumbnail_id, rendition), False),
+        )
+        for path, animated in candidates:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if newest is None or stat.st_mtime_ns > newest.mtime_ns:
+                newest = ThumbnailFile(path, animated, stat.st_mtime_ns, stat.st_size)
+        if newest is not None:
+            return newest
+    return None
+
+def has_all_sizes(thumbnail_id: str, settings: Settings) -> bool:
+    """설정된 모든 크기의 애니메이션 썸네일이 존재하는지 확인합니다."""
+    return all(
+        os.path.exists(settings.get_thumbnail_path(thumbnail_id, size))
+        for size in settings.THUMBNAIL_SIZES
+    )
+
 def ensure_thumbnail(video, file_path: str, settings) -> bool:
     """비디오의 썸네일이 존재하는지 확인하고, 없으면 생성합니다."""
     thumbnail_path = settings.get_thumbnail_path(video.thumbnail_id)
@@ -0,0 +1,41 @@
+import struct
+from typing import Iterator, List, Optional, Tuple
+from .thumbnail import ThumbnailFile
+from .thumbnail_cache import ThumbnailCache
+
+# 여러 썸네일을 한 응답으로 보내는 바이너리 형식
+#
+#   항목마다 (빅 엔디언)
+#     u8   thumbnail_id 길이
+#     ...  thumbnail_id (ASCII)
+#     u8   종류 (0: 아직 없음, 1: 포스터, 2: 애니메이션)
+#     u32  이미지 길이
+#     ...  이미지 (WebP)
+#
+# 항목은 요청한 순서대로 전송됩니다.
+BUNDLE_MEDIA_TYPE = "application/vnd.thumbnail-bundle"
+
+ENTRY_MISSING = 0
+ENTRY_POSTER = 1
+ENTRY_ANIMATED = 2
+
+def encode_entry(thumbnail_id: str, kind: int, data: bytes = b"") -> bytes:
+    """번들 항목 하나를 인코딩합니다."""
+    encoded_id = thumbnail_id.encode("ascii")
+    return struct.pack(">B", len(encoded_id)) + encoded_id + struct.pack(">BI", kind, len(data)) + data
+
+def iter_bundle(files: List[Tuple[str, Optional[ThumbnailFile]]], cache: ThumbnailCache) -> Iterator[bytes]:
+    """(thumbnail_id, 썸네일 파일) 목록을 번들 항목으로 읽어 하나씩 반환합니다. (블로킹 I/O)"""
+    for thumbnail_id, found in files:
+        if found is None:
+            yield encode_entry(thumbnail_id, ENTRY_MISSING)
+            continue
+        data = cache.get(found.path, found.mtime_ns, found.size)
+        if data is None:
+            try:
+                data = cache.load(found.path, found.mtime_ns, found.size)
+            except OSError:
+                # 파일을 찾은 뒤 삭제된 경우 (비디오 삭제 등)
+                yield encode_entry(thumbnail_id, ENTRY_MISSING)
+                continue
+        yield encode_entry(thumbnail_id, ENTRY_ANIMATED if found.animated else ENTRY_POSTER, data)
@@ -0,0 +1,75 @@
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+from ..config import Settings
+
+class ThumbnailCache:
+    """자주 조회되는 썸네일 파일 내용을 메모리에 보관하는 크기 제한 LRU 캐시
+
+    항목은 파일 경로와 (mtime, 크기) 로 식별하므로 파일이 다시 생성되면 이전 내용은 사용되지 않습니다.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[int, int, bytes]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: str, mtime_ns: int, size: int) -> Optional[bytes]:
+        """캐시된 파일 내용을 반환합니다. 없거나 파일이 바뀌었으면 None을 반환합니다."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[0] != mtime_ns or entry[1] != size:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(path)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, path: str, mtime_ns: int, size: int, data: bytes):
+        """파일 내용을 캐시에 추가하고, 최대 크기를 넘으면 오래 사용되지 않은 항목부터 제거합니다."""
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._bytes -= len(old[2])
+            self._entries[path] = (mtime_ns, size, data)
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def load(self, path: str, mtime_ns: int, size: int) -> bytes:
+        """파일을 읽어 캐시에 추가하고 내용을 반환합니다. (블로킹 I/O)"""
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) == size:  # 읽는 도중 파일이 교체된 경우는 캐싱하지 않음
+            self.put(path, mtime_ns, size, data)
+        return data
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size_mb": round(self._bytes / (1024 * 1024), 1),
+                "max_size_mb": round(self.max_bytes / (1024 * 1024), 1),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+# 전역 캐시 인스턴스
+_cache: Optional[ThumbnailCache] = None
+_cache_lock = threading.Lock()
+
+def get_thumbnail_cache(settings: Settings) -> ThumbnailCache:
+    """ThumbnailCache의 싱글톤 인스턴스를 반환합니다."""
+    global _cache
+    if _cache is not None:
+        return _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ThumbnailCache(settings.THUMBNAIL_CACHE_SIZE_MB * 1024 * 1024)
+        return _cache
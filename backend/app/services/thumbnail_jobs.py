@@ -0,0 +1,210 @@
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from .. import database
+from ..models.thumbnail_job import ThumbnailJob
+from ..logger import LogManager
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+# 실패한 작업의 재시도 간격 (실패할 때마다 2배, 최대 하루)
+RETRY_BASE_DELAY = 60.0
+RETRY_MAX_DELAY = 24 * 60 * 60.0
+
+# DB가 잠겨 있을 때(스캔 트랜잭션 진행 중 등) 기록을 다시 시도할 간격 (초)
+WRITE_RETRY_INTERVAL = 1.0
+
+# (thumbnail_id, video_path, lane) 목록을 받아 작업 큐에 다시 넣는 함수
+ResumeCallback = Callable[[List[Tuple[str, str, int]]], None]
+
+def retry_delay(attempts: int) -> float:
+    """연속 실패 횟수에 따른 재시도 대기 시간(초) 을 반환합니다."""
+    return min(RETRY_BASE_DELAY * (2 ** max(0, attempts - 1)), RETRY_MAX_DELAY)
+
+class ThumbnailJobStore:
+    """썸네일 작업 상태를 thumbnail_jobs 테이블에 기록합니다.
+
+    상태 변경은 메모리에 모았다가 전용 스레드에서 한 트랜잭션으로 기록하므로, 스캔 트랜잭션이나
+    프로세스 풀의 완료 콜백이 DB 잠금을 기다리지 않습니다. 시작 시 완료되지 않은 작업을 다시 큐에 넣고,
+    실패한 작업은 재시도 시각이 되면 다시 큐에 넣습니다.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._updates: List[Tuple[str, str, dict]] = []  # (상태, thumbnail_id, 추가 정보)
+        self._backoff: Dict[str, datetime] = {}  # 재시도 대기 중인 thumbnail_id -> 재시도 시각
+        self._should_stop = False
+        self._thread: Optional[threading.Thread] = None
+        self._resume: Optional[ResumeCallback] = None
+        self.logger = LogManager.get_instance().logger
+
+    def start(self, resume: ResumeCallback):
+        """기록 스레드를 시작합니다. 완료되지 않은 작업은 resume으로 다시 큐에 넣습니다."""
+        if self._thread is not None:
+            return
+        if database.SessionLocal is None:
+            self.logger.info("Database not initialized, thumbnail jobs will not be persisted")
+            return
+        self._resume = resume
+        self._should_stop = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """남은 기록을 저장하고 스레드를 종료합니다."""
+        with self._cond:
+            self._should_stop = True
+            self._cond.notify_all()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def enqueue(self, thumbnail_id: str, video_path: str, lane: int):
+        """새 작업(또는 파일이 변경된 작업) 을 기록합니다. 실패 횟수는 초기화됩니다."""
+        with self._cond:
+            self._backoff.pop(thumbnail_id, None)
+        self._add(JOB_PENDING, thumbnail_id, {"video_path": video_path, "lane": lane})
+
+    def mark_running(self, thumbnail_id: str):
+        self._add(JOB_RUNNING, thumbnail_id, {})
+
+    def mark_done(self, thumbnail_id: str):
+        with self._cond:
+            self._backoff.pop(thumbnail_id, None)
+        self._add(JOB_DONE, thumbnail_id, {})
+
+    def mark_failed(self, thumbnail_id: str, error: str):
+        self._add(JOB_FAILED, thumbnail_id, {"error": error[:1000]})
+
+    def is_backing_off(self, thumbnail_id: str) -> bool:
+        """최근 실패하여 재시도 시각을 기다리는 작업인지 확인합니다."""
+        with self._cond:
+            retry_at = self._backoff.get(thumbnail_id)
+        return retry_at is not None and retry_at > datetime.utcnow()
+
+    def _add(self, state: str, thumbnail_id: str, info: dict):
+        if self._thread is None:
+            return
+        with self._cond:
+            self._updates.append((state, thumbnail_id, info))
+            self._cond.notify()
+
+    def _run(self):
+        """기록 스레드: 상태 변경을 저장하고, 재시도 시각이 된 작업을 다시 큐에 넣습니다."""
+        # 완료되지 않은 작업과 재시도 시각이 지난 실패 작업을 다시 큐에 넣음
+        self._resume_jobs([JOB_PENDING, JOB_RUNNING, JOB_FAILED])
+        while True:
+            with self._cond:
+                if not self._updates and not self._should_stop:
+                    # 다음 재시도 시각까지 대기 (재시도할 작업이 없으면 상태 변경이 생길 때까지)
+                    next_retry = min(self._backoff.values(), default=None)
+                    timeout = None if next_retry is None else max(0.0, (next_retry - datetime.utcnow()).total_seconds())
+                    self._cond.wait(timeout=timeout)
+                updates, self._updates = self._updates, []
+                should_stop = self._should_stop
+
+            if updates and not self._write(updates):
+                # DB가 잠겨 있으면 다음에 다시 기록
+                with self._cond:
+                    self._updates[:0] = updates
+                if should_stop:
+                    break
+                with self._cond:
+                    self._cond.wait(timeout=WRITE_RETRY_INTERVAL)
+                continue
+            if should_stop:
+                break
+            with self._cond:
+                retry_due = any(retry_at <= datetime.utcnow() for retry_at in self._backoff.values())
+            if retry_due:
+                self._resume_jobs([JOB_FAILED])
+
+    def _write(self, updates: List[Tuple[str, str, dict]]) -> bool:
+        """상태 변경들을 한 트랜잭션으로 기록합니다."""
+        db = database.SessionLocal()
+        try:
+            thumbnail_ids = {thumbnail_id for _, thumbnail_id, _ in updates}
+            jobs = {
+                job.thumbnail_id: job
+                for job in db.query(ThumbnailJob).filter(ThumbnailJob.thumbnail_id.in_(thumbnail_ids))
+            }
+            now = datetime.utcnow()
+            backoff = {}
+            for state, thumbnail_id, info in updates:
+                job = jobs.get(thumbnail_id)
+                if state == JOB_PENDING:
+                    if job is None:
+                        job = jobs[thumbnail_id] = ThumbnailJob(thumbnail_id=thumbnail_id)
+                        db.add(job)
+                    job.video_path = info["video_path"]
+                    job.lane = info["lane"]
+                    job.attempts = 0
+                    job.last_error = None
+                    job.next_attempt_at = None
+                    backoff.pop(thumbnail_id, None)
+                elif job is None:
+                    continue  # 기록되지 않은 작업 (스토어 시작 전에 추가된 작업 등)
+                elif state == JOB_FAILED:
+                    job.last_error = info["error"]
+                    if job.state == JOB_FAILED:
+                        continue  # 같은 시도에서 포스터와 애니메이션이 모두 실패한 경우 한 번만 계산
+                    job.attempts = (job.attempts or 0) + 1
+                    job.next_attempt_at = now + timedelta(seconds=retry_delay(job.attempts))
+                    backoff[thumbnail_id] = job.next_attempt_at
+                    self.logger.info(f"Thumbnail job {thumbnail_id} failed {job.attempts} time(s), "
+                                     f"retrying at {job.next_attempt_at}")
+                elif state == JOB_DONE:
+                    job.attempts = 0
+                    job.last_error = None
+                    job.next_attempt_at = None
+                    backoff.pop(thumbnail_id, None)
+                job.state = state
+            db.commit()
+        except (OperationalError, PoolTimeoutError) as e:
+            # DB 잠금 또는 쓰기 연결 대기 시간 초과 (긴 스캔 트랜잭션 등)
+            db.rollback()
+            self.logger.info(f"Thumbnail job table is busy, retrying later: {str(e)}")
+            return False
+        except Exception as e:
+            db.rollback()
+            self.logger.error(f"Error saving thumbnail jobs: {str(e)}")
+            return True  # 잘못된 기록은 다시 시도하지 않음
+        finally:
+            db.close()
+
+        with self._cond:
+            self._backoff.update(backoff)
+        return True
+
+    def _resume_jobs(self, states: List[str]):
+        """주어진 상태의 작업 중 지금 실행할 수 있는 작업을 대기 상태로 바꾸고 다시 큐에 넣습니다."""
+        now = datetime.utcnow()
+        with self._cond:
+            # 재시도 시각이 지난 항목은 DB 조회 결과와 관계없이 제거 (삭제된 작업이 남아 계속 깨우지 않도록)
+            self._backoff = {thumbnail_id: retry_at for thumbnail_id, retry_at in self._backoff.items() if retry_at > now}
+
+        db = database.SessionLocal()
+        try:
+            jobs = []
+            for job in db.query(ThumbnailJob).filter(ThumbnailJob.state.in_(states)):
+                if job.state == JOB_FAILED and job.next_attempt_at is not None and job.next_attempt_at > now:
+                    with self._cond:
+                        self._backoff[job.thumbnail_id] = job.next_attempt_at
+                    continue
+                job.state = JOB_PENDING
+                jobs.append((job.thumbnail_id, job.video_path, job.lane))
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            self.logger.error(f"Error loading thumbnail jobs: {str(e)}")
+            return
+        finally:
+            db.close()
+
+        if jobs:
+            self.logger.info(f"Resuming {len(jobs)} thumbnail jobs")
+            self._resume(jobs)
@@ -0,0 +1,160 @@
+import bisect
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+# 지연 시간 히스토그램 구간 상한 (밀리초)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+# 처리량 계산 구간 (초)
+RATE_WINDOW = 60.0
+
+# 이 시간 동안 결과를 보고하지 않은 워커 프로세스는 목록에서 제외 (초)
+WORKER_STALE_AFTER = 600.0
+
+PHASES = ('decode', 'resize', 'encode', 'total')
+
+def get_process_rss() -> Optional[int]:
+    """현재 프로세스의 RSS(바이트) 를 반환합니다. 알 수 없으면 None을 반환합니다."""
+    try:
+        if sys.platform.startswith('linux'):
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        if sys.platform == 'win32':
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [
+                    ('cb', wintypes.DWORD),
+                    ('PageFaultCount', wintypes.DWORD),
+                    ('PeakWorkingSetSize', ctypes.c_size_t),
+                    ('WorkingSetSize', ctypes.c_size_t),
+                    ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                    ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                    ('PagefileUsage', ctypes.c_size_t),
+                    ('PeakPagefileUsage', ctypes.c_size_t),
+                ]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize
+            return None
+        import resource  # macOS 등: 현재 값 대신 최대 RSS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except Exception:
+        return None
+
+class LatencyHistogram:
+    """고정 구간 지연 시간 히스토그램"""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)  # 마지막 칸은 최대 구간 초과
+        self.count = 0
+        self.total_ms = 0.0
+
+    def observe(self, value_ms: float):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q 분위수가 속한 구간의 상한을 반환합니다. (최대 구간 초과는 None)"""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.counts):
+            seen += count
+            if seen >= rank:
+                return float(bound)
+        return None
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "buckets": {
+                **{f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS_MS, self.counts)},
+                "inf": self.counts[-1],
+            },
+        }
+
+class ThumbnailMetrics:
+    """썸네일 작업의 처리량, 단계별 지연 시간, 워커 프로세스 메모리를 집계합니다."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events: Deque[Tuple[float, str, bool]] = deque()  # (완료 시각, 작업 종류, 성공 여부)
+        self._totals: Dict[str, Dict[str, int]] = {}
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._workers: Dict[int, dict] = {}
+
+    def record(self, kind: str, success: bool, stats: Optional[dict] = None):
+        """작업 결과를 기록합니다. stats는 워커 프로세스가 반환한 단계별 시간(초), pid, rss 입니다."""
+        now = time.monotonic()
+        with self._lock:
+            self._events.append((now, kind, success))
+            self._trim(now)
+            totals = self._totals.setdefault(kind, {"completed": 0, "failed": 0})
+            totals["completed" if success else "failed"] += 1
+
+            if not stats:
+                return
+            for phase in PHASES:
+                if phase in stats:
+                    histogram = self._histograms.setdefault((kind, phase), LatencyHistogram())
+                    histogram.observe(stats[phase] * 1000)
+            if stats.get("pid") is not None:
+                worker = self._workers.setdefault(stats["pid"], {"tasks": 0})
+                worker["tasks"] += 1
+                worker["rss"] = stats.get("rss")
+                worker["last_seen"] = now
+
+    def snapshot(self) -> dict:
+        """현재까지의 집계 결과를 반환합니다."""
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            per_minute = {"completed": {}, "failed": {}}
+            for _, kind, success in self._events:
+                bucket = per_minute["completed" if success else "failed"]
+                bucket[kind] = bucket.get(kind, 0) + 1
+
+            latency: Dict[str, Dict[str, dict]] = {}
+            for (kind, phase), histogram in self._histograms.items():
+                latency.setdefault(kind, {})[phase] = histogram.to_dict()
+
+            workers: List[dict] = []
+            for pid, worker in list(self._workers.items()):
+                if now - worker["last_seen"] > WORKER_STALE_AFTER:
+                    del self._workers[pid]
+                    continue
+                rss = worker.get("rss")
+                workers.append({
+                    "pid": pid,
+                    "rss_mb": round(rss / (1024 * 1024), 1) if rss is not None else None,
+                    "tasks": worker["tasks"],
+                    "last_seen_sec": round(now - worker["last_seen"], 1),
+                })
+
+            return {
+                "per_minute": per_minute,
+                "totals": {kind: dict(totals) for kind, totals in self._totals.items()},
+                "latency": latency,
+                "workers": sorted(workers, key=lambda w: w["pid"]),
+            }
+
+    def _trim(self, now: float):
+        while self._events and now - self._events[0][0] > RATE_WINDOW:
+            self._events.popleft()
@@ -0,0 +1,140 @@
+import heapq
+import itertools
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# 우선순위 레인 (낮을수록 먼저 처리)
+LANE_ON_DEMAND = 0   # 조회했지만 아직 없는 썸네일
+LANE_PREFETCH = 1    # 화면에 보이는 페이지의 썸네일
+LANE_BACKGROUND = 2  # 스캔으로 추가된 파일의 포스터
+LANE_UPGRADE = 3     # 포스터를 애니메이션 WebP로 교체
+LANE_NAMES = {
+    LANE_ON_DEMAND: 'on_demand',
+    LANE_PREFETCH: 'prefetch',
+    LANE_BACKGROUND: 'background',
+    LANE_UPGRADE: 'upgrade',
+}
+
+class ThumbnailTask:
+    """썸네일 생성 작업 하나 (종류 + thumbnail_id 로 식별)"""
+    __slots__ = ('kind', 'thumbnail_id', 'video_path', 'output_path', 'lane', 'valid')
+
+    def __init__(self, kind: str, thumbnail_id: str, video_path: str, output_path: str, lane: int):
+        self.kind = kind
+        self.thumbnail_id = thumbnail_id
+        self.video_path = video_path
+        self.output_path = output_path
+        self.lane = lane
+        self.valid = True  # 다른 레인으로 옮겨지면 False (힙에서 꺼낼 때 버림)
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return self.kind, self.thumbnail_id
+
+class ThumbnailTaskQueue:
+    """(종류, thumbnail_id) 기준으로 중복을 제거하는 레인별 우선순위 큐
+
+    같은 레인 안에서는 kind_order 순서(포스터 먼저), 그 다음 추가된 순서로 처리합니다.
+    이미 대기 중인 작업은 더 높은 레인으로만 옮길 수 있으며, 옮기기 전 항목은 꺼낼 때 버립니다.
+    """
+
+    def __init__(self, kind_order: Dict[str, int]):
+        self._kind_order = kind_order
+        self._heap: List[tuple] = []
+        self._pending: Dict[Tuple[str, str], ThumbnailTask] = {}
+        self._order = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put(self, kind: str, thumbnail_id: str, video_path: str, output_path: str, lane: int) -> bool:
+        """작업을 추가합니다. 이미 같은 작업이 대기 중이면 경로만 갱신하고 레인은 높은 쪽을 따릅니다.
+
+        Returns:
+            새 작업이 추가되었는지 여부
+        """
+        with self._cond:
+            task = self._pending.get((kind, thumbnail_id))
+            if task is not None:
+                task.video_path = video_path
+                task.output_path = output_path
+                self._move(task, lane)
+                return False
+
+            self._push(ThumbnailTask(kind, thumbnail_id, video_path, output_path, lane))
+            return True
+
+    def promote(self, thumbnail_id: str, kind_lanes: Dict[str, int]) -> bool:
+        """대기 중인 thumbnail_id의 작업들을 종류별 레인(kind_lanes) 으로 앞당깁니다.
+
+        Returns:
+            대기 중인 작업이 있었는지 여부
+        """
+        found = False
+        with self._cond:
+            for kind in self._kind_order:
+                task = self._pending.get((kind, thumbnail_id))
+                if task is not None:
+                    found = True
+                    self._move(task, kind_lanes[kind])
+        return found
+
+    def discard(self, kind: str, thumbnail_id: str) -> bool:
+        """대기 중인 작업을 취소합니다. 취소된 작업이 있으면 True를 반환합니다."""
+        with self._cond:
+            task = self._pending.pop((kind, thumbnail_id), None)
+            if task is None:
+                return False
+            task.valid = False
+            return True
+
+    def has_pending(self, thumbnail_id: str) -> bool:
+        """thumbnail_id의 작업이 대기 중인지 확인합니다."""
+        with self._cond:
+            return any((kind, thumbnail_id) in self._pending for kind in self._kind_order)
+
+    def get(self) -> Optional[ThumbnailTask]:
+        """가장 우선순위가 높은 작업을 꺼냅니다. 작업이 없으면 대기하며, 큐가 닫히면 None을 반환합니다."""
+        with self._cond:
+            while True:
+                if self._closed:
+                    return None
+                while self._heap:
+                    task = heapq.heappop(self._heap)[-1]
+                    if task.valid:
+                        del self._pending[task.key]
+                        return task
+                self._cond.wait()
+
+    def lane_sizes(self) -> Dict[str, int]:
+        """레인별 대기 작업 수를 반환합니다."""
+        sizes = {name: 0 for name in LANE_NAMES.values()}
+        with self._cond:
+            for task in self._pending.values():
+                sizes[LANE_NAMES[task.lane]] += 1
+        return sizes
+
+    def close(self):
+        """대기 중인 get() 호출을 깨우고 이후 get()은 None을 반환하게 합니다."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def reopen(self):
+        with self._cond:
+            self._closed = False
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def _push(self, task: ThumbnailTask):
+        self._pending[task.key] = task
+        heapq.heappush(self._heap, (task.lane, self._kind_order[task.kind], next(self._order), task))
+        self._cond.notify()
+
+    def _move(self, task: ThumbnailTask, lane: int):
+        """대기 중인 작업을 더 높은 레인으로 옮깁니다. (힙의 기존 항목은 무효 처리)"""
+        if lane >= task.lane:
+            return
+        task.valid = False
+        self._push(ThumbnailTask(task.kind, task.thumbnail_id, task.video_path, task.output_path, lane))
@@ -1,16 +1,48 @@
 import os
-import queue
 import threading
-import time
-from typing import Dict, Optional, Tuple
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
 from concurrent.futures import ProcessPoolExecutor, Future
-from .thumbnail import create_thumbnail
+from .thumbnail import render_thumbnail, render_poster
+from .thumbnail_jobs import ThumbnailJobStore
+from .thumbnail_metrics import ThumbnailMetrics
+from .thumbnail_queue import (
+    ThumbnailTaskQueue, LANE_ON_DEMAND, LANE_PREFETCH, LANE_BACKGROUND, LANE_UPGRADE
+)
 from ..config import Settings
 from ..logger import LogManager
 from multiprocessing import get_context
 import signal
 from functools import partial
 
+# 작업 종류. 같은 레인에서는 포스터(정지 이미지) 를 애니메이션 WebP보다 먼저 생성
+TASK_POSTER = 'poster'
+TASK_ANIMATED = 'animated'
+TASK_ORDER = {TASK_POSTER: 0, TASK_ANIMATED: 1}
+TASK_FUNCTIONS = {TASK_POSTER: render_poster, TASK_ANIMATED: render_thumbnail}
+
+# get_result로 조회할 수 있도록 보관하는 최근 결과 수
+MAX_RESULTS = 1000
+
+def _task_lanes(lane: int) -> Dict[str, int]:
+    """요청 레인에 따른 종류별 레인. 스캔 작업의 애니메이션은 모든 포스터가 끝난 뒤(upgrade 레인) 생성"""
+    return {TASK_POSTER: lane, TASK_ANIMATED: LANE_UPGRADE if lane >= LANE_BACKGROUND else lane}
+
+def _stale_paths(output_paths: Iterable[str], video_path: str) -> List[str]:
+    """썸네일 파일들(크기별) 중 없거나 비디오 파일보다 오래된 파일을 반환합니다."""
+    video_mtime = os.path.getmtime(video_path)
+    return [path for path in output_paths if not os.path.exists(path) or video_mtime > os.path.getmtime(path)]
+
+def _stale_outputs(video_path: str, output_path: str,
+                   renditions: Dict[int, str]) -> Tuple[Optional[str], Dict[int, str]]:
+    """생성할 (기본 크기 경로, 크기별 경로) 를 반환합니다. 최신인 파일은 제외합니다. (기본 크기가 최신이면 None)"""
+    try:
+        stale = set(_stale_paths([output_path, *renditions.values()], video_path))
+    except OSError:
+        return output_path, renditions  # 비디오 파일을 읽을 수 없으면 그대로 생성을 시도하여 실패로 기록
+    return (output_path if output_path in stale else None,
+            {size: path for size, path in renditions.items() if path in stale})
+
 def _init_worker():
     """워커 프로세스 초기화 함수"""
     # 워커 프로세스에서 KeyboardInterrupt 무시
@@ -19,13 +51,17 @@ def _init_worker():
 class ThumbnailWorker:
     def __init__(self, settings: Settings):
         self.settings = settings
-        self.task_queue = queue.Queue()
-        self.results: Dict[str, bool] = {}
+        self.task_queue = ThumbnailTaskQueue(TASK_ORDER)
+        # 프로세스 풀에 동시에 제출하는 작업 수 제한. 큐의 작업은 슬롯이 빌 때까지 큐에 남으므로
+        # 대기 작업 수와 관계없이 Future 수가 일정하고, 우선순위도 풀 내부 FIFO 큐에 묻히지 않음
+        self._slots = threading.Semaphore(settings.THUMBNAIL_MAX_IN_FLIGHT)
+        self.results: "OrderedDict[str, bool]" = OrderedDict()  # 최근 MAX_RESULTS개만 보관
+        self.metrics = ThumbnailMetrics()
+        self.jobs = ThumbnailJobStore()  # 재시작 후 이어서 처리하기 위한 작업 기록
         self.worker_thread: Optional[threading.Thread] = None
-        self.result_thread: Optional[threading.Thread] = None
         self.should_stop = threading.Event()  # Event 객체로 변경
         self._executor: Optional[ProcessPoolExecutor] = None
-        self._futures: Dict[str, Tuple[Future, str]] = {}
+        self._futures: Dict[Tuple[str, str], Tuple[Future, str]] = {}
         self._lock = threading.Lock()
         self.logger = LogManager.get_instance().logger
     
@@ -33,17 +69,17 @@ class ThumbnailWorker:
         """작업자 스레드를 시작합니다."""
         if self.worker_thread is None:
             self.should_stop.clear()
+            self.task_queue.reopen()
+            self._slots = threading.Semaphore(self.settings.THUMBNAIL_MAX_IN_FLIGHT)
             self._executor = ProcessPoolExecutor(
                 max_workers=self.settings.THUMBNAIL_MAX_WORKERS,
                 mp_context=get_context('spawn'),
                 initializer=_init_worker  # 워커 프로세스 초기화 함수 설정
             )
             self.worker_thread = threading.Thread(target=self._process_queue)
-            self.result_thread = threading.Thread(target=self._process_results)
             self.worker_thread.daemon = True
-            self.result_thread.daemon = True
             self.worker_thread.start()
-            self.result_thread.start()
+            self.jobs.start(self._resume_jobs)
             self.logger.info("Thumbnail worker started")
     
     def stop(self):
@@ -54,27 +90,22 @@ class ThumbnailWorker:
         self.logger.info("Stopping thumbnail worker...")
         self.should_stop.set()
         
-        # 1. 진행 중인 작업 취소
+        # 1. 진행 중인 작업 취소 (취소 시 완료 콜백이 바로 호출되므로 락 밖에서 취소)
         try:
             with self._lock:
-                for future, _ in self._futures.values():
-                    if future.done():
-                        continue
+                futures = [future for future, _ in self._futures.values()]
+            for future in futures:
+                if not future.done():
                     future.cancel()
-                self._futures.clear()
         except Exception as e:
             self.logger.error(f"Error canceling futures: {str(e)}")
         
-        # 2. 스레드 종료 대기
-        threads = []
+        # 2. 작업 스레드를 깨운 뒤 종료 대기
+        self._slots.release()
+        self.task_queue.close()
         if self.worker_thread and self.worker_thread.is_alive():
-            threads.append(self.worker_thread)
-        if self.result_thread and self.result_thread.is_alive():
-            threads.append(self.result_thread)
-            
-        for thread in threads:
             try:
-                thread.join(timeout=0.5)
+                self.worker_thread.join(timeout=0.5)
             except Exception as e:
                 self.logger.error(f"Error joining thread: {str(e)}")
         
@@ -87,108 +118,194 @@ class ThumbnailWorker:
             finally:
                 self._executor = None
         
+        # 4. 남은 작업 기록 저장
+        self.jobs.stop()
+        
         self.worker_thread = None
-        self.result_thread = None
         self.logger.info("Thumbnail worker stopped")
     
-    def add_task(self, thumbnail_id: str, video_path: str) -> None:
-        """썸네일 생성 작업을 큐에 추가합니다."""
+    def add_task(self, thumbnail_id: str, video_path: str, lane: int = LANE_BACKGROUND) -> bool:
+        """썸네일 생성 작업을 큐에 추가합니다. 작업이 추가되면 True를 반환합니다.
+
+        포스터가 없거나 오래된 경우 포스터 작업을 먼저 추가하고, 애니메이션 작업은 낮은 우선순위로 추가합니다.
+        이미 대기 중인 작업은 중복 추가하지 않고 더 높은 레인으로만 옮깁니다.
+        """
+        if not self._queue_job(thumbnail_id, video_path, lane):
+            return False
+        self.jobs.enqueue(thumbnail_id, video_path, lane)
+        self.logger.info(f"Added thumbnail task for: {video_path}")
+        return True
+    
+    def _queue_job(self, thumbnail_id: str, video_path: str, lane: int) -> bool:
+        """필요한 썸네일 작업을 큐에 넣습니다. 썸네일이 이미 최신이면 False를 반환합니다."""
         thumbnail_path = self.settings.get_thumbnail_path(thumbnail_id)
+        poster_path = self.settings.get_poster_path(thumbnail_id)
         
-        # 썸네일이 이미 존재하고 최신인 경우 스킵
-        if os.path.exists(thumbnail_path):
-            try:
-                # 비디오 파일과 썸네일 파일의 수정 시간 비교
-                video_mtime = os.path.getmtime(video_path)
-                thumb_mtime = os.path.getmtime(thumbnail_path)
-                
-                if video_mtime <= thumb_mtime:
-                    self.logger.info(f"Skipping thumbnail creation for: {video_path} (already exists)")
-                    return
-                    
+        try:
+            # 모든 크기의 애니메이션 썸네일이 이미 존재하고 최신인 경우 스킵
+            thumbnail_renditions = self.settings.get_rendition_paths(thumbnail_id).values()
+            needs_animated = bool(_stale_paths([thumbnail_path, *thumbnail_renditions], video_path))
+            if not needs_animated:
+                self.logger.info(f"Skipping thumbnail creation for: {video_path} (already exists)")
+                return False
+            if os.path.exists(thumbnail_path):
                 self.logger.info(f"Updating outdated thumbnail for: {video_path}")
-            except Exception as e:
-                self.logger.error(f"Error checking thumbnail status: {str(e)}")
-                # 에러 발생 시 안전하게 썸네일 재생성
+            # 포스터는 애니메이션과 따로 확인 (작업 실행 시 없거나 오래된 크기만 생성)
+            poster_renditions = self.settings.get_rendition_paths(thumbnail_id, poster=True).values()
+            needs_poster = bool(_stale_paths([poster_path, *poster_renditions], video_path))
+        except Exception as e:
+            self.logger.error(f"Error checking thumbnail status: {str(e)}")
+            # 에러 발생 시 안전하게 썸네일 재생성
+            needs_poster = True
         
-        # 썸네일이 없거나 업데이트가 필요한 경우
-        self.task_queue.put((thumbnail_id, video_path, thumbnail_path))
-        self.logger.info(f"Added thumbnail task for: {video_path}")
+        lanes = _task_lanes(lane)
+        if needs_poster:
+            self.task_queue.put(TASK_POSTER, thumbnail_id, video_path, poster_path, lanes[TASK_POSTER])
+        self.task_queue.put(TASK_ANIMATED, thumbnail_id, video_path, thumbnail_path, lanes[TASK_ANIMATED])
+        return True
+    
+    def _resume_jobs(self, jobs: List[Tuple[str, str, Optional[int]]]):
+        """DB에 기록된 완료되지 않은 작업(또는 재시도할 작업) 을 다시 큐에 넣습니다."""
+        for thumbnail_id, video_path, lane in jobs:
+            if not video_path or not os.path.exists(video_path):
+                self.jobs.mark_failed(thumbnail_id, f"Video file not found: {video_path}")
+            elif not self._queue_job(thumbnail_id, video_path, LANE_BACKGROUND if lane is None else lane):
+                self.jobs.mark_done(thumbnail_id)
+    
+    def request(self, thumbnail_id: str, lane: int = LANE_ON_DEMAND) -> bool:
+        """조회된 썸네일의 대기 작업을 lane으로 앞당깁니다.
+
+        Returns:
+            대기 중이거나 생성 중인 작업이 있으면 True (없으면 호출한 쪽에서 add_task 필요)
+        """
+        if self.task_queue.promote(thumbnail_id, _task_lanes(lane)):
+            return True
+        with self._lock:
+            return any((kind, thumbnail_id) in self._futures for kind in TASK_ORDER)
+    
+    def is_pending(self, thumbnail_id: str) -> bool:
+        """썸네일이 다시 생성될 예정인지 확인합니다. (대기 중, 생성 중, 또는 실패 후 재시도 대기 중)"""
+        if self.task_queue.has_pending(thumbnail_id) or self.jobs.is_backing_off(thumbnail_id):
+            return True
+        with self._lock:
+            return any((kind, thumbnail_id) in self._futures for kind in TASK_ORDER)
+    
+    def prefetch(self, thumbnail_ids: Iterable[str]) -> int:
+        """화면에 보이는 썸네일들을 prefetch 레인으로 앞당기고, 앞당긴 수를 반환합니다."""
+        return sum(1 for thumbnail_id in thumbnail_ids if self.request(thumbnail_id, LANE_PREFETCH))
     
     def get_result(self, thumbnail_id: str) -> Optional[bool]:
         """특정 썸네일의 생성 결과를 반환합니다."""
         with self._lock:
             return self.results.get(thumbnail_id)
     
+    def get_metrics(self) -> dict:
+        """대기열, 실행 중인 작업 수, 처리량, 단계별 지연 시간, 워커 프로세스 메모리를 반환합니다."""
+        with self._lock:
+            in_flight = {}
+            for kind, _ in self._futures:
+                in_flight[kind] = in_flight.get(kind, 0) + 1
+        return {
+            "queue": self.task_queue.lane_sizes(),
+            "queued": len(self.task_queue),
+            "in_flight": sum(in_flight.values()),
+            "in_flight_by_kind": in_flight,
+            "max_in_flight": self.settings.THUMBNAIL_MAX_IN_FLIGHT,
+            "max_workers": self.settings.THUMBNAIL_MAX_WORKERS,
+            **self.metrics.snapshot(),
+        }
+    
     def _process_queue(self):
-        """큐의 작업을 처리합니다."""
+        """큐의 작업을 우선순위 순서대로 처리합니다. 작업이나 빈 슬롯이 없으면 대기합니다."""
         while not self.should_stop.is_set():
             try:
-                try:
-                    thumbnail_id, video_path, thumbnail_path = self.task_queue.get(timeout=0.5)
-                except queue.Empty:
-                    continue
+                # 빈 슬롯이 생긴 뒤에 큐에서 꺼내야 그 사이 추가된 높은 우선순위 작업이 먼저 처리됨
+                self._slots.acquire()
+                task = self.task_queue.get()
                 
-                if self._executor is None or self.should_stop.is_set():
+                if task is None or self._executor is None or self.should_stop.is_set():
+                    self._slots.release()
                     break
-                    
-                self.logger.info(f"Processing thumbnail for: {video_path}")
-                future = self._executor.submit(
-                    create_thumbnail,
-                    video_path,
-                    thumbnail_path,
-                    self.settings
+                
+                kind, thumbnail_id, video_path, output_path = (
+                    task.kind, task.thumbnail_id, task.video_path, task.output_path
+                )
+                # 크기별 파일 중 없거나 오래된 파일만 생성 (크기 설정 추가 시 최신인 기본 크기 파일은 유지)
+                output_path, renditions = _stale_outputs(
+                    video_path, output_path,
+                    self.settings.get_rendition_paths(thumbnail_id, poster=kind == TASK_POSTER)
                 )
+                if output_path is None and not renditions:
+                    # 대기 중에 다른 작업으로 이미 생성됨
+                    self._slots.release()
+                    if kind == TASK_ANIMATED:
+                        self.jobs.mark_done(thumbnail_id)
+                    continue
                 
-                with self._lock:
-                    self._futures[thumbnail_id] = (future, video_path)
+                self.logger.info(f"Processing {kind} thumbnail for: {video_path}")
+                key = (kind, thumbnail_id)
+                try:
+                    future = self._executor.submit(
+                        TASK_FUNCTIONS[kind],
+                        video_path,
+                        output_path,
+                        self.settings,
+                        renditions
+                    )
+                except Exception:
+                    self._slots.release()
+                    raise
                 
-                self.task_queue.task_done()
+                with self._lock:
+                    self._futures[key] = (future, video_path)
+                future.add_done_callback(partial(self._on_task_done, key, video_path))
+                self.jobs.mark_running(thumbnail_id)
                 
             except Exception as e:
                 self.logger.error(f"Error in queue processing: {str(e)}")
                 continue
     
-    def _process_results(self):
-        """완료된 썸네일 생성 작업의 결과를 처리합니다."""
-        while not self.should_stop.is_set():
+    def _on_task_done(self, key: Tuple[str, str], video_path: str, future: Future):
+        """작업 완료 시 호출됩니다. (프로세스 풀의 관리 스레드에서 실행)"""
+        kind, thumbnail_id = key
+        with self._lock:
+            entry = self._futures.get(key)
+            if entry is not None and entry[0] is future:
+                del self._futures[key]
+        self._slots.release()
+        
+        if future.cancelled():
+            # 취소된 경우 썸네일 임시 파일 정리
             try:
-                with self._lock:
-                    done_futures = []
-                    for thumbnail_id, (future, video_path) in self._futures.items():
-                        if future.done():
-                            try:
-                                success = future.result(timeout=0)
-                                self.results[thumbnail_id] = success
-                                if success:
-                                    self.logger.info(f"Successfully created thumbnail for: {video_path}")
-                                else:
-                                    self.logger.error(f"Failed to create thumbnail for: {video_path}")
-                                done_futures.append(thumbnail_id)
-                            except KeyboardInterrupt:
-                                # 인터럽트 발생 시 썸네일 파일 정리
-                                try:
-                                    thumbnail_path = self.settings.get_thumbnail_path(thumbnail_id)
-                                    tmp_path = f"{thumbnail_path}.tmp"
-                                    if os.path.exists(tmp_path):
-                                        os.remove(tmp_path)
-                                except Exception:
-                                    pass
-                                done_futures.append(thumbnail_id)
-                                self.logger.info(f"Cancelled thumbnail creation for: {video_path}")
-                            except Exception as e:
-                                self.logger.error(f"Error processing thumbnail result: {str(e)}")
-                                done_futures.append(thumbnail_id)
-                    
-                    # 처리 완료된 Future 제거
-                    for thumbnail_id in done_futures:
-                        del self._futures[thumbnail_id]
-                
-                time.sleep(0.1)
-                
-            except Exception as e:
-                self.logger.error(f"Error in result processing: {str(e)}")
-                continue
+                for thumbnail_path in self.settings.get_thumbnail_files(thumbnail_id):
+                    tmp_path = f"{thumbnail_path}.tmp"
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+            except Exception:
+                pass
+            self.logger.info(f"Cancelled thumbnail creation for: {video_path}")
+            return
+        
+        error = future.exception()
+        self.metrics.record(kind, error is None, future.result() if error is None else None)
+        if kind == TASK_ANIMATED:
+            with self._lock:
+                self.results[thumbnail_id] = error is None
+                self.results.move_to_end(thumbnail_id)
+                while len(self.results) > MAX_RESULTS:
+                    self.results.popitem(last=False)
+        
+        if error is None:
+            if kind == TASK_ANIMATED:
+                self.jobs.mark_done(thumbnail_id)
+            self.logger.info(f"Successfully created {kind} thumbnail for: {video_path}")
+            return
+        
+        # 포스터를 만들 수 없는 파일은 애니메이션도 만들 수 없으므로 함께 재시도 대기
+        if kind == TASK_POSTER:
+            self.task_queue.discard(TASK_ANIMATED, thumbnail_id)
+        self.jobs.mark_failed(thumbnail_id, f"{type(error).__name__}: {error}")
+        self.logger.error(f"Failed to create {kind} thumbnail for: {video_path} ({str(error)})")
 
 # 전역 worker 인스턴스
 _worker: Optional[ThumbnailWorker] = None
@@ -0,0 +1,199 @@
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from ..config import Settings
+from ..logger import LogManager
+from .. import database
+from .scanner import VIDEO_EXTENSIONS, scan_videos, process_changed_paths
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # watchdog이 없으면 폴링 모드로만 동작
+    Observer = None
+    FileSystemEventHandler = object
+
+WATCHED_EXTENSIONS = VIDEO_EXTENSIONS + ('.info',)
+
+# 처리할 필요가 없는 이벤트
+IGNORED_EVENT_TYPES = ('opened', 'closed_no_write')
+
+def _get_file_size(path: str) -> Optional[int]:
+    """파일 크기를 반환합니다. 파일이 아니면 None을 반환합니다."""
+    try:
+        return os.stat(path).st_size if os.path.isfile(path) else None
+    except OSError:
+        return None
+
+class _LibraryEventHandler(FileSystemEventHandler):
+    """watchdog(inotify) 이벤트를 LibraryWatcher로 전달합니다."""
+
+    def __init__(self, watcher: "LibraryWatcher"):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if event.event_type in IGNORED_EVENT_TYPES:
+            return
+        # 디렉토리 수정 이벤트는 내부 파일 이벤트로 처리되므로 무시
+        if event.is_directory and event.event_type == 'modified':
+            return
+
+        self.watcher.notify(os.fsdecode(event.src_path), event.is_directory)
+        dest_path = getattr(event, 'dest_path', None)
+        if dest_path:
+            self.watcher.notify(os.fsdecode(dest_path), event.is_directory)
+
+class LibraryWatcher:
+    """비디오 디렉토리를 감시하여 변경된 경로만 DB에 반영합니다.
+
+    inotify 이벤트는 debounce 시간 동안 모아서 처리하며, 파일 크기가 계속 바뀌는 경우(복사 중)
+    크기가 안정될 때까지 처리를 미룹니다. inotify를 사용할 수 없으면 디렉토리 저널 기반의
+    증분 스캔을 주기적으로 실행합니다.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.should_stop = threading.Event()
+        self.observer = None
+        self.worker_thread: Optional[threading.Thread] = None
+        self.polling = False
+        self._pending: Dict[str, List] = {}  # path -> [처리 예정 시각, 마지막 파일 크기]
+        self._cond = threading.Condition()
+        self.logger = LogManager.get_instance().logger
+
+    def start(self):
+        """감시를 시작합니다."""
+        if self.worker_thread is not None:
+            return
+        self.should_stop.clear()
+
+        self.polling = self.settings.WATCHER_POLLING
+        if not self.polling:
+            if Observer is None:
+                self.logger.info("watchdog is not installed, falling back to polling")
+                self.polling = True
+            else:
+                try:
+                    self.observer = Observer()
+                    handler = _LibraryEventHandler(self)
+                    for base_dir in self.settings.VIDEO_DIRECTORIES:
+                        if os.path.isdir(base_dir):
+                            self.observer.schedule(handler, base_dir, recursive=True)
+                    self.observer.start()
+                except Exception as e:
+                    # inotify 감시 개수 제한 등으로 실패하면 폴링으로 대체
+                    self.logger.error(f"Failed to start file system observer, falling back to polling: {str(e)}")
+                    self.observer = None
+                    self.polling = True
+
+        target = self._poll_loop if self.polling else self._process_events
+        self.worker_thread = threading.Thread(target=target, daemon=True)
+        self.worker_thread.start()
+        self.logger.info(f"Library watcher started ({'polling' if self.polling else 'inotify'})")
+
+    def stop(self):
+        """감시를 중지합니다."""
+        if self.should_stop.is_set():
+            return
+
+        self.should_stop.set()
+        with self._cond:
+            self._cond.notify_all()
+
+        if self.observer is not None:
+            try:
+                self.observer.stop()
+                self.observer.join(timeout=1.0)
+            except Exception as e:
+                self.logger.error(f"Error stopping observer: {str(e)}")
+            self.observer = None
+
+        if self.worker_thread and self.worker_thread.is_alive():
+            self.worker_thread.join(timeout=1.0)
+        self.worker_thread = None
+        self.logger.info("Library watcher stopped")
+
+    def notify(self, path: str, is_directory: bool = False):
+        """변경된 경로를 대기 목록에 추가합니다. 같은 경로의 이벤트는 하나로 합쳐집니다."""
+        if not is_directory and not path.lower().endswith(WATCHED_EXTENSIONS):
+            return
+
+        size = _get_file_size(path)
+        with self._cond:
+            self._pending[path] = [time.monotonic() + self.settings.WATCHER_DEBOUNCE, size]
+            self._cond.notify()
+
+    def _process_events(self):
+        """debounce 시간이 지난 경로들을 모아 처리합니다."""
+        while not self.should_stop.is_set():
+            with self._cond:
+                now = time.monotonic()
+                ready = [path for path, (deadline, _) in self._pending.items() if deadline <= now]
+                if not ready:
+                    # 다음 처리 예정 시각까지 대기 (대기 목록이 비어 있으면 이벤트가 올 때까지)
+                    timeout = min((d for d, _ in self._pending.values()), default=None)
+                    self._cond.wait(timeout=None if timeout is None else timeout - now)
+                    continue
+
+            paths = []
+            for path in ready:
+                size = _get_file_size(path)
+                with self._cond:
+                    entry = self._pending.get(path)
+                    if entry is None or entry[0] > now:
+                        continue  # 그 사이 새 이벤트가 들어온 경우
+                    if size is not None and size != entry[1]:
+                        # 아직 복사 중인 파일은 크기가 안정될 때까지 대기
+                        entry[0] = now + self.settings.WATCHER_DEBOUNCE
+                        entry[1] = size
+                        continue
+                    del self._pending[path]
+                paths.append(path)
+
+            if paths:
+                self._apply_changes(paths)
+
+    def _apply_changes(self, paths: List[str]):
+        """변경된 경로들을 DB에 반영합니다."""
+        self.logger.info(f"Applying {len(paths)} library changes")
+        db = database.SessionLocal()
+        try:
+            process_changed_paths(db, paths)
+        except Exception as e:
+            self.logger.error(f"Error applying library changes: {str(e)}")
+        finally:
+            db.close()
+
+    def _poll_loop(self):
+        """주기적으로 증분 스캔을 실행합니다. 변경되지 않은 디렉토리는 저널 덕분에 stat 한 번으로 끝납니다."""
+        while not self.should_stop.wait(self.settings.WATCHER_POLL_INTERVAL):
+            db = database.SessionLocal()
+            try:
+                scan_videos(db)
+            except Exception as e:
+                self.logger.error(f"Error during polling scan: {str(e)}")
+            finally:
+                db.close()
+
+# 전역 watcher 인스턴스
+_watcher: Optional[LibraryWatcher] = None
+_watcher_lock = threading.Lock()
+
+def start_library_watcher(settings: Settings) -> LibraryWatcher:
+    """LibraryWatcher 싱글톤을 생성하고 감시를 시작합니다."""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = LibraryWatcher(settings)
+            _watcher.start()
+        return _watcher
+
+def shutdown_library_watcher():
+    """LibraryWatcher를 종료합니다."""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is not None:
+            _watcher.stop()
+            _watcher = None
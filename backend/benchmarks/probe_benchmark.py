@@ -0,0 +1,101 @@
+"""컨테이너 헤더 파싱과 OpenCV의 비디오 정보 읽기 속도를 비교합니다.
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.probe_benchmark --count 20
+    python -m benchmarks.probe_benchmark --dir D:/videos
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+import cv2
+import numpy as np
+from app.services.probe import probe_container, probe_video_opencv
+
+# (확장자, fourcc) 별로 생성할 테스트 파일 형식
+CORPUS_FORMATS = [
+    ('.mp4', 'mp4v'),
+    ('.mov', 'mp4v'),
+    ('.mkv', 'XVID'),
+    ('.avi', 'MJPG'),
+]
+
+def generate_corpus(directory: str, count: int, seconds: float = 4.0,
+                    size: tuple[int, int] = (320, 180)) -> list[str]:
+    """형식별로 count개의 짧은 테스트 비디오를 생성합니다. (길이와 FPS를 다르게 설정)"""
+    width, height = size
+    paths = []
+    for ext, fourcc in CORPUS_FORMATS:
+        for i in range(count):
+            fps = (24, 25, 30, 60)[i % 4]
+            duration = seconds + i % 3
+            path = os.path.join(directory, f"sample_{fourcc}_{i}{ext}")
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, (width, height))
+            for frame_index in range(int(duration * fps)):
+                frame = np.full((height, width, 3), frame_index % 255, np.uint8)
+                writer.write(frame)
+            writer.release()
+            paths.append(path)
+    return paths
+
+def collect_videos(directory: str) -> list[str]:
+    extensions = tuple(ext for ext, _ in CORPUS_FORMATS)
+    return [
+        os.path.join(root, name)
+        for root, _, files in os.walk(directory)
+        for name in files if name.lower().endswith(extensions)
+    ]
+
+def time_probe(probe, paths: list[str], repeat: int) -> tuple[list[float], dict]:
+    """각 파일을 repeat번 읽어 파일별 최소 시간(ms)과 결과를 반환합니다."""
+    timings = []
+    results = {}
+    for path in paths:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            try:
+                results[path] = probe(path)
+            except Exception:
+                results[path] = None
+            best = min(best, time.perf_counter() - start)
+        timings.append(best * 1000)
+    return timings, results
+
+def main():
+    parser = argparse.ArgumentParser(description="Video probe benchmark")
+    parser.add_argument("--dir", help="기존 비디오 디렉토리 (지정하지 않으면 테스트 파일 생성)")
+    parser.add_argument("--count", type=int, default=10, help="형식별 생성할 파일 수")
+    parser.add_argument("--repeat", type=int, default=3, help="파일별 반복 횟수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.dir:
+            paths = collect_videos(args.dir)
+        else:
+            print(f"Generating {args.count * len(CORPUS_FORMATS)} sample videos...")
+            paths = generate_corpus(tmp_dir, args.count)
+
+        header_times, header_results = time_probe(probe_container, paths, args.repeat)
+        opencv_times, opencv_results = time_probe(probe_video_opencv, paths, args.repeat)
+
+    print(f"\n{len(paths)} files, best of {args.repeat}")
+    print(f"{'path':<10}{'mean ms':>10}{'median ms':>12}{'max ms':>10}{'total s':>10}")
+    for name, times in (("header", header_times), ("opencv", opencv_times)):
+        print(f"{name:<10}{statistics.mean(times):>10.3f}{statistics.median(times):>12.3f}"
+              f"{max(times):>10.3f}{sum(times) / 1000:>10.3f}")
+    print(f"speedup: {statistics.mean(opencv_times) / statistics.mean(header_times):.1f}x")
+
+    # 두 방식의 길이 결과 비교
+    parsed = [p for p in paths if header_results.get(p) is not None and header_results[p].duration > 0]
+    mismatched = [
+        p for p in parsed
+        if opencv_results.get(p) is not None and abs(header_results[p].duration - opencv_results[p].duration) > 0.1
+    ]
+    print(f"header parsed: {len(parsed)}/{len(paths)}, duration mismatches (>0.1s): {len(mismatched)}")
+    for path in mismatched[:10]:
+        print(f"  {path}: header={header_results[path].duration:.3f} opencv={opencv_results[path].duration:.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""스캔 중 태그 저장 방식별 소요 시간을 비교합니다.
+
+per-video: 비디오마다 update_video_tags (태그 이름마다 조회 + flush, 비디오마다 커밋)
+batched:   ScanTagWriter (한 번 조회한 이름 -> id 맵, 새 태그와 video_tags 일괄 INSERT, 묶음 커밋)
+
+각 비디오에는 폴더 태그(같은 폴더의 비디오가 공유) 와 info 파일 태그를 붙입니다.
+per-video 방식은 느리므로 --per-video-limit 개만 실행하고 전체 시간은 비례하여 추정합니다.
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.scan_tags_benchmark
+    python -m benchmarks.scan_tags_benchmark --videos 100000 --per-video-limit 5000
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime
+import yaml
+from sqlalchemy import create_engine, func, select
+from app.config import settings
+from app.database import Base, init_db
+from app.models.video import Video
+from app.models.tag import video_tags
+from app.services.tags import ScanTagWriter, update_video_tags
+
+def generate_videos(path: str, videos: int):
+    """태그 없는 테스트 비디오를 만듭니다."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(Video.__table__.insert(), [
+            {"file_path": f"/videos/{i}.mp4", "file_name": f"{i}.mp4", "thumbnail_id": f"{i:032x}",
+             "duration": 60.0, "created_at": now, "updated_at": now}
+            for i in range(videos)
+        ])
+    engine.dispose()
+
+def video_tag_names(videos: int, info_tags: int) -> dict[int, list[str]]:
+    """비디오 id별 태그 이름 (폴더 태그 3단계 + info 태그 2개)"""
+    random.seed(1)
+    return {
+        video_id: [f"genre{video_id % 20}", f"series{video_id // 1000}", f"season{video_id // 100}",
+                   f"info{random.randrange(info_tags)}", f"info{random.randrange(info_tags)}"]
+        for video_id in range(1, videos + 1)
+    }
+
+def open_sessions(path: str, work_dir: str):
+    config_path = os.path.join(work_dir, "config.yaml")
+    with open(config_path, "w", encoding="utf-8") as f:
+        yaml.dump({
+            "video_directories": [work_dir],
+            "database": {"path": path},
+            "thumbnails": {"directory": os.path.join(work_dir, "thumbnails"), "extension": ".webp"},
+        }, f)
+    settings.init_settings(config_path)
+    engine, SessionLocal, _ = init_db()
+    return engine, SessionLocal
+
+def run_per_video(SessionLocal, names: dict[int, list[str]]) -> float:
+    db = SessionLocal()
+    start = time.perf_counter()
+    try:
+        for video_id, tag_names in names.items():
+            update_video_tags(db, db.get(Video, video_id), tag_names)
+    finally:
+        db.close()
+    return time.perf_counter() - start
+
+def run_batched(SessionLocal, names: dict[int, list[str]]) -> float:
+    # 스캔처럼 비디오 객체를 넘기되 객체 로드 시간은 제외 (묶음 커밋 후에도 다시 로드하지 않도록 만료하지 않음)
+    db = SessionLocal(expire_on_commit=False)
+    videos = {video.id: video for video in db.query(Video)}
+    start = time.perf_counter()
+    try:
+        writer = ScanTagWriter(db)
+        for video_id, tag_names in names.items():
+            writer.set_tags(videos[video_id], tag_names)
+        writer.flush()
+    finally:
+        db.close()
+    return time.perf_counter() - start
+
+def read_pairs(SessionLocal, limit: int) -> set:
+    with SessionLocal() as db:
+        from app.models.tag import Tag
+        rows = db.execute(
+            select(video_tags.c.video_id, Tag.name).join(Tag, Tag.id == video_tags.c.tag_id)
+            .where(video_tags.c.video_id <= limit)
+        )
+        return {(video_id, name) for video_id, name in rows}
+
+def main():
+    parser = argparse.ArgumentParser(description="Scan tag write benchmark")
+    parser.add_argument("--videos", type=int, default=100000, help="테스트 비디오 수")
+    parser.add_argument("--info-tags", type=int, default=500, help="info 파일 태그 종류 수")
+    parser.add_argument("--per-video-limit", type=int, default=2000, help="per-video 방식으로 처리할 비디오 수")
+    args = parser.parse_args()
+
+    names = video_tag_names(args.videos, args.info_tags)
+    limit = min(args.per_video_limit, args.videos)
+    with tempfile.TemporaryDirectory() as work_dir:
+        template = os.path.join(work_dir, "template.db")
+        print(f"Generating {args.videos} videos...")
+        generate_videos(template, args.videos)
+
+        results = {}
+        pairs = {}
+        for name, run, subset in (("per-video", run_per_video, dict(list(names.items())[:limit])),
+                                  ("batched", run_batched, names)):
+            path = os.path.join(work_dir, f"{name}.db")
+            shutil.copyfile(template, path)
+            engine, SessionLocal = open_sessions(path, work_dir)
+            print(f"Running {name} ({len(subset)} videos)...")
+            elapsed = run(SessionLocal, subset)
+            with SessionLocal() as db:
+                rows = db.scalar(select(func.count()).select_from(video_tags))
+            results[name] = (len(subset), elapsed, rows)
+            pairs[name] = read_pairs(SessionLocal, limit)
+            engine.dispose()
+
+    print(f"\n{args.videos} videos, 5 tags each ({args.info_tags} info tags + shared folder tags)")
+    print(f"{'method':<12}{'videos':>9}{'rows':>9}{'seconds':>10}{'ms/video':>10}{'est. total s':>14}")
+    for name, (count, elapsed, rows) in results.items():
+        print(f"{name:<12}{count:>9}{rows:>9}{elapsed:>10.2f}{elapsed / count * 1000:>10.3f}"
+              f"{elapsed / count * args.videos:>14.1f}")
+    print(f"\nsame associations for first {limit} videos: {pairs['per-video'] == pairs['batched']}")
+
+if __name__ == "__main__":
+    main()
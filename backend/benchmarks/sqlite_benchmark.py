@@ -0,0 +1,191 @@
+"""SQLite 연결 설정(기본 설정 vs WAL/PRAGMA + 읽기/쓰기 연결 분리) 별 읽기/쓰기 혼합 부하의 지연 시간을 비교합니다.
+
+조회 스레드들이 /list처럼 페이지를 읽는 동안, 태그 편집 스레드가 짧은 쓰기 트랜잭션을,
+스캔 스레드가 여러 행을 수정하는 긴 쓰기 트랜잭션을 반복합니다.
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.sqlite_benchmark
+    python -m benchmarks.sqlite_benchmark --videos 50000 --seconds 20 --readers 8
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime
+import yaml
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import selectinload, sessionmaker
+from app.config import settings
+from app.database import Base, init_db
+from app.models.video import Video
+from app.models.tag import Tag, video_tags
+
+PAGE_SIZE = 25
+SCAN_BATCH = 2000  # 스캔 트랜잭션 하나에서 수정하는 비디오 수
+
+def generate_database(path: str, videos: int, tags: int, video_root: str = "/videos"):
+    """테스트용 비디오, 태그 데이터를 만듭니다. (롤백 저널 모드, 비디오는 video_root 아래 500개씩 폴더로 나눔)"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    random.seed(1)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(Tag.__table__.insert(), [{"name": f"tag{i}"} for i in range(tags)])
+        conn.execute(Video.__table__.insert(), [
+            {"file_path": f"{video_root}/{i // 500}/video_{i}.mp4", "file_name": f"video_{i}.mp4",
+             "thumbnail_id": f"{i:032x}", "duration": random.uniform(10, 3600), "created_at": now, "updated_at": now}
+            for i in range(videos)
+        ])
+        pairs = {(random.randint(1, videos), random.randint(1, tags)) for _ in range(videos)}
+        conn.execute(video_tags.insert(), [{"video_id": v, "tag_id": t} for v, t in pairs])
+    engine.dispose()
+
+def baseline_sessions(path: str):
+    """변경 전 설정: 기본 SQLite 엔진 하나로 읽기와 쓰기를 모두 처리"""
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    with engine.begin() as conn:
+        conn.execute(text("PRAGMA journal_mode = DELETE"))
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    return factory, factory, engine
+
+def tuned_sessions(path: str, work_dir: str):
+    """설정 파일의 PRAGMA와 쓰기 연결 하나 + 읽기 전용 연결 풀 (database.init_db)"""
+    config_path = os.path.join(work_dir, "config.yaml")
+    with open(config_path, "w", encoding="utf-8") as f:
+        yaml.dump({
+            "video_directories": [work_dir],
+            "database": {"path": path},
+            "thumbnails": {"directory": os.path.join(work_dir, "thumbnails"), "extension": ".webp"},
+        }, f)
+    settings.init_settings(config_path)
+    engine, SessionLocal, ReadSessionLocal = init_db()
+    return SessionLocal, ReadSessionLocal, engine
+
+class Recorder:
+    """작업 종류별 지연 시간(ms) 과 오류 수"""
+
+    def __init__(self):
+        self.timings = {"read": [], "edit": [], "scan": []}
+        self.errors = {"read": 0, "edit": 0, "scan": 0}
+        self.lock = threading.Lock()
+
+    def run(self, kind: str, operation):
+        start = time.perf_counter()
+        try:
+            operation()
+        except (OperationalError, PoolTimeoutError):
+            with self.lock:
+                self.errors[kind] += 1
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        with self.lock:
+            self.timings[kind].append(elapsed)
+
+def run_workload(write_factory, read_factory, videos: int, tags: int, seconds: float, readers: int) -> Recorder:
+    recorder = Recorder()
+    stop = threading.Event()
+
+    def read_page():
+        db = read_factory()
+        try:
+            after = random.randint(0, videos)
+            db.query(Video).options(selectinload(Video.tags)).filter(Video.id > after) \
+                .order_by(Video.id).limit(PAGE_SIZE).all()
+        finally:
+            db.close()
+
+    def edit_tags():
+        db = write_factory()
+        try:
+            video = db.get(Video, random.randint(1, videos))
+            tag = db.get(Tag, random.randint(1, tags))
+            if tag in video.tags:
+                video.tags.remove(tag)
+            else:
+                video.tags.append(tag)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def scan_batch():
+        db = write_factory()
+        try:
+            start = random.randint(1, max(1, videos - SCAN_BATCH))
+            now = datetime.utcnow()
+            for video in db.query(Video).filter(Video.id.between(start, start + SCAN_BATCH - 1)):
+                video.updated_at = now
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def loop(kind, operation, pause):
+        while not stop.is_set():
+            recorder.run(kind, operation)
+            if pause:
+                time.sleep(pause)
+
+    threads = [threading.Thread(target=loop, args=("read", read_page, 0)) for _ in range(readers)]
+    threads.append(threading.Thread(target=loop, args=("edit", edit_tags, 0.01)))
+    threads.append(threading.Thread(target=loop, args=("scan", scan_batch, 0.2)))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return recorder
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite connection settings benchmark")
+    parser.add_argument("--videos", type=int, default=20000, help="테스트 비디오 수")
+    parser.add_argument("--tags", type=int, default=200, help="테스트 태그 수")
+    parser.add_argument("--seconds", type=float, default=10.0, help="설정별 실행 시간 (초)")
+    parser.add_argument("--readers", type=int, default=4, help="조회 스레드 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        template = os.path.join(work_dir, "template.db")
+        print(f"Generating {args.videos} videos, {args.tags} tags...")
+        generate_database(template, args.videos, args.tags)
+
+        results = {}
+        for name, make_sessions in (("baseline", lambda path: baseline_sessions(path)),
+                                    ("tuned", lambda path: tuned_sessions(path, work_dir))):
+            path = os.path.join(work_dir, f"{name}.db")
+            shutil.copyfile(template, path)
+            write_factory, read_factory, engine = make_sessions(path)
+            print(f"Running {name} for {args.seconds:.0f}s...")
+            results[name] = run_workload(write_factory, read_factory, args.videos, args.tags,
+                                         args.seconds, args.readers)
+            engine.dispose()
+            if read_factory is not write_factory:
+                read_factory.kw["bind"].dispose()
+
+    print(f"\n{args.readers} readers, 1 tag editor, 1 scanner ({SCAN_BATCH} rows/txn), {args.seconds:.0f}s each")
+    print(f"{'config':<10}{'op':<6}{'count':>8}{'ops/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>10}{'errors':>8}")
+    for name, recorder in results.items():
+        for kind, timings in recorder.timings.items():
+            if not timings:
+                print(f"{name:<10}{kind:<6}{0:>8}{'-':>9}{'-':>9}{'-':>9}{'-':>9}{'-':>10}{recorder.errors[kind]:>8}")
+                continue
+            print(f"{name:<10}{kind:<6}{len(timings):>8}{len(timings) / args.seconds:>9.1f}"
+                  f"{statistics.median(timings):>9.2f}{percentile(timings, 0.95):>9.2f}"
+                  f"{percentile(timings, 0.99):>9.2f}{max(timings):>10.2f}{recorder.errors[kind]:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""썸네일 프레임 추출 방식(grab/seek/auto) 별 썸네일당 디코딩 시간을 비교합니다.
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.thumbnail_benchmark --count 4
+    python -m benchmarks.thumbnail_benchmark --duration 20 --fps 0.5   # 드문 샘플
+    python -m benchmarks.thumbnail_benchmark --dir D:/videos
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from app.services.sampling import SAMPLING_STRATEGIES, sample_frames
+from benchmarks.probe_benchmark import generate_corpus, collect_videos
+
+def time_sampling(paths: list[str], strategy: str, duration: float, fps: float, repeat: int):
+    """각 파일의 프레임 추출 최소 시간(ms), 추출한 프레임 수, 실제 사용한 방식을 반환합니다."""
+    timings = []
+    frame_counts = []
+    used = {}
+    for path in paths:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            try:
+                frames, chosen = sample_frames(path, duration, fps, strategy)
+            except Exception:
+                frames, chosen = [], 'error'
+            best = min(best, time.perf_counter() - start)
+        timings.append(best * 1000)
+        frame_counts.append(len(frames))
+        used[chosen] = used.get(chosen, 0) + 1
+    return timings, frame_counts, used
+
+def main():
+    parser = argparse.ArgumentParser(description="Thumbnail frame sampling benchmark")
+    parser.add_argument("--dir", help="기존 비디오 디렉토리 (지정하지 않으면 테스트 파일 생성)")
+    parser.add_argument("--count", type=int, default=4, help="형식별 생성할 파일 수")
+    parser.add_argument("--seconds", type=float, default=30.0, help="생성할 비디오 길이 (초)")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--duration", type=float, default=3.0, help="썸네일 길이 (초)")
+    parser.add_argument("--fps", type=float, default=5.0, help="썸네일 FPS")
+    parser.add_argument("--repeat", type=int, default=2, help="파일별 반복 횟수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.dir:
+            paths = collect_videos(args.dir)
+        else:
+            print(f"Generating {args.count * 4} sample videos ({args.width}x{args.height}, {args.seconds}s)...")
+            paths = generate_corpus(tmp_dir, args.count, args.seconds, (args.width, args.height))
+
+        results = {
+            strategy: time_sampling(paths, strategy, args.duration, args.fps, args.repeat)
+            for strategy in SAMPLING_STRATEGIES
+        }
+
+    print(f"\n{len(paths)} files, thumbnail {args.duration}s @ {args.fps}fps, best of {args.repeat}")
+    print(f"{'strategy':<10}{'mean ms':>10}{'median ms':>12}{'max ms':>10}{'frames':>8}  chosen")
+    for strategy, (times, frame_counts, used) in results.items():
+        chosen = ", ".join(f"{name}={count}" for name, count in sorted(used.items()))
+        print(f"{strategy:<10}{statistics.mean(times):>10.1f}{statistics.median(times):>12.1f}"
+              f"{max(times):>10.1f}{statistics.mean(frame_counts):>8.1f}  {chosen}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""태그 편집 요청이 몰리는 동안(쓰기 폭주) /list 조회 지연 시간과 이벤트 루프 지연을 측정합니다.
+
+앱을 같은 프로세스에서 실행하고(httpx ASGITransport), 먼저 조회 요청만 보낸 뒤
+태그 추가/제거/목록 갱신 요청과 스캔의 긴 쓰기 트랜잭션을 동시에 계속 실행하면서 같은 조회를 반복합니다.
+쓰기 처리가 이벤트 루프를 막으면 조회 지연과 루프 지연(10ms 타이머가 늦게 깨어난 시간) 이 함께 늘어납니다.
+
+사용법 (backend 디렉토리에서):
+    python -m benchmarks.write_storm_benchmark
+    python -m benchmarks.write_storm_benchmark --videos 50000 --writers 32 --seconds 20
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime
+import httpx
+import yaml
+from sqlalchemy import create_engine, text
+from app import database
+from app.config import settings
+from app.models.video import Video
+from benchmarks.sqlite_benchmark import SCAN_BATCH, generate_database, percentile
+
+PAGE_SIZE = 25
+TICK_INTERVAL = 0.01  # 이벤트 루프 지연 측정 간격 (초)
+SCAN_PAUSE = 0.2  # 스캔 트랜잭션 사이 간격 (초)
+
+def create_library(db_path: str, library: str, videos: int, tags: int):
+    """테스트 데이터와 같은 경로에 빈 비디오 파일을 만들고, 시작 시 스캔이 변경되지 않은 파일로 보도록 지문을 기록합니다.
+    (태그 편집 시 info 파일도 이 폴더에 저장됨)"""
+    generate_database(db_path, videos, tags, video_root=library)
+    engine = create_engine(f"sqlite:///{db_path}")
+    with engine.begin() as conn:
+        rows = []
+        for video_id, file_path in conn.execute(text("SELECT id, file_path FROM videos")):
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            open(file_path, "wb").close()
+            stat = os.stat(file_path)
+            rows.append({"id": video_id, "size": stat.st_size, "mtime": stat.st_mtime_ns,
+                         "inode": stat.st_ino, "device": stat.st_dev})
+        conn.execute(text("UPDATE videos SET file_size = :size, mtime_ns = :mtime, inode = :inode, device = :device "
+                          "WHERE id = :id"), rows)
+    engine.dispose()
+
+def write_config(work_dir: str, db_path: str, library: str) -> str:
+    config_path = os.path.join(work_dir, "config.yaml")
+    with open(config_path, "w", encoding="utf-8") as f:
+        yaml.dump({
+            "video_directories": [library],
+            "database": {"path": db_path},
+            "thumbnails": {"directory": os.path.join(work_dir, "thumbnails"), "extension": ".webp"},
+            "scan": {"startup": "blocking"},  # 측정 전에 시작 시 스캔 완료
+        }, f)
+    return config_path
+
+def scan_loop(videos: int, deadline: float):
+    """스캔처럼 여러 행을 수정하는 긴 쓰기 트랜잭션을 반복합니다. (API 밖의 스레드에서 쓰기 잠금을 잡음)"""
+    while time.perf_counter() < deadline:
+        db = database.SessionLocal()
+        try:
+            start = random.randint(1, max(1, videos - SCAN_BATCH))
+            now = datetime.utcnow()
+            for video in db.query(Video).filter(Video.id.between(start, start + SCAN_BATCH - 1)):
+                video.updated_at = now
+            db.commit()
+        finally:
+            db.close()
+        time.sleep(SCAN_PAUSE)
+
+async def run_phase(client: httpx.AsyncClient, videos: int, tags: int, seconds: float,
+                    readers: int, writers: int) -> dict:
+    """조회 요청 readers개와 태그 편집 요청 writers개(있으면 스캔 스레드도) 를 seconds 동안 동시에 반복합니다."""
+    timings = {"list": [], "write": [], "loop lag": []}
+    errors = {"list": 0, "write": 0, "loop lag": 0}
+    deadline = time.perf_counter() + seconds
+    scanner = threading.Thread(target=scan_loop, args=(videos, deadline)) if writers else None
+    if scanner:
+        scanner.start()
+
+    async def timed(kind: str, send):
+        start = time.perf_counter()
+        response = await send()
+        if response.status_code >= 400:
+            errors[kind] += 1
+        else:
+            timings[kind].append((time.perf_counter() - start) * 1000)
+
+    async def read_loop():
+        while time.perf_counter() < deadline:
+            page = random.randint(1, max(1, videos // PAGE_SIZE))
+            await timed("list", lambda: client.get("/api/videos/list", params={"page": page, "size": PAGE_SIZE}))
+
+    async def write_loop():
+        while time.perf_counter() < deadline:
+            video_id = random.randint(1, videos)
+            action = random.random()
+            if action < 0.4:
+                send = lambda: client.post(f"/api/videos/{video_id}/tags", json={"name": f"tag{random.randrange(tags)}"})
+            elif action < 0.7:
+                send = lambda: client.delete(f"/api/videos/{video_id}/tags/{random.randint(1, tags)}")
+            else:
+                tag_ids = random.sample(range(1, tags + 1), 3)
+                send = lambda: client.put(f"/api/videos/{video_id}/tags", json={"tag_ids": tag_ids})
+            await timed("write", send)
+
+    async def tick_loop():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await asyncio.sleep(TICK_INTERVAL)
+            timings["loop lag"].append(max(0.0, (time.perf_counter() - start - TICK_INTERVAL) * 1000))
+
+    tasks = [read_loop() for _ in range(readers)] + [write_loop() for _ in range(writers)] + [tick_loop()]
+    await asyncio.gather(*tasks)
+    if scanner:
+        await asyncio.to_thread(scanner.join)
+    return {"timings": timings, "errors": errors}
+
+async def run(args) -> dict:
+    from app.main import app
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)  # 처리 중 예외는 500 응답(오류) 으로 집계
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            await client.get("/api/videos/list", params={"size": PAGE_SIZE})  # 캐시 준비
+            for name, writers in (("idle", 0), ("storm", args.writers)):
+                print(f"Running {name} ({writers} writers) for {args.seconds:.0f}s...")
+                results[name] = await run_phase(client, args.videos, args.tags, args.seconds,
+                                                args.readers, writers)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="/list latency under a tag write storm")
+    parser.add_argument("--videos", type=int, default=20000, help="테스트 비디오 수")
+    parser.add_argument("--tags", type=int, default=200, help="테스트 태그 수")
+    parser.add_argument("--seconds", type=float, default=10.0, help="단계별 실행 시간 (초)")
+    parser.add_argument("--readers", type=int, default=4, help="동시 조회 요청 수")
+    parser.add_argument("--writers", type=int, default=16, help="동시 태그 편집 요청 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        db_path = os.path.join(work_dir, "videos.db")
+        library = os.path.join(work_dir, "library")
+        print(f"Generating {args.videos} videos, {args.tags} tags...")
+        create_library(db_path, library, args.videos, args.tags)
+        settings.init_settings(write_config(work_dir, db_path, library))
+        results = asyncio.run(run(args))
+
+    print(f"\n{args.readers} /list readers, {args.writers} tag writers + 1 scanner ({SCAN_BATCH} rows/txn) "
+          f"in storm, {args.seconds:.0f}s each")
+    print(f"{'phase':<8}{'op':<10}{'count':>8}{'ops/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>10}{'errors':>8}")
+    for name, result in results.items():
+        for kind, timings in result["timings"].items():
+            error_count = result["errors"][kind]
+            if not timings:
+                print(f"{name:<8}{kind:<10}{0:>8}{'-':>9}{'-':>9}{'-':>9}{'-':>9}{'-':>10}{error_count:>8}")
+                continue
+            print(f"{name:<8}{kind:<10}{len(timings):>8}{len(timings) / args.seconds:>9.1f}"
+                  f"{statistics.median(timings):>9.2f}{percentile(timings, 0.95):>9.2f}"
+                  f"{percentile(timings, 0.99):>9.2f}{max(timings):>10.2f}{error_count:>8}")
+
+if __name__ == "__main__":
+    main()
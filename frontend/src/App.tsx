@@ -3,7 +3,7 @@ import styled from 'styled-components';
 import { VideoGrid } from './components/VideoGrid';
 import { Pagination } from './components/Pagination';
 import { TagList } from './components/TagList';
-import { Video, PageResponse, Tag } from './types/video';
+import { Video, PageResponse, Tag, TagFacets } from './types/video';
 
 const Container = styled.div<{ $sidebarWidth: number }>`
   margin-left: ${props => props.$sidebarWidth}px;
@@ -22,6 +22,24 @@ const Loading = styled.div`
   color: #666;
 `;
 
+const SearchInput = styled.input`
+  width: 100%;
+  padding: 0.5rem 0.75rem;
+  margin-bottom: 1rem;
+  border: 1px solid #ddd;
+  border-radius: 4px;
+  font-size: 0.95rem;
+  box-sizing: border-box;
+  
+  &:focus {
+    outline: none;
+    border-color: #999;
+  }
+`;
+
+// 검색어 입력 후 검색 요청까지 기다리는 시간 (ms)
+const SEARCH_DEBOUNCE_MS = 300;
+
 const SelectedTagsHeader = styled.div`
   display: flex;
   justify-content: space-between;
@@ -105,6 +123,9 @@ function App() {
   const [sidebarWidth, setSidebarWidth] = useState(240);
   const [selectedTags, setSelectedTags] = useState<Tag[]>([]);
   const [searchMode, setSearchMode] = useState<'AND' | 'OR'>('AND');
+  const [tagCounts, setTagCounts] = useState<Map<number, number> | null>(null);
+  const [searchInput, setSearchInput] = useState('');
+  const [searchQuery, setSearchQuery] = useState('');  // 실제 검색에 사용하는 검색어 (입력이 멈춘 뒤 반영)
   const isInitialized = useRef(false);
   
   const handleTagClick = (tag: Tag) => {
@@ -127,20 +148,24 @@ function App() {
     setPage(1);
     setSearchMode(prev => {
       const newMode = prev === 'AND' ? 'OR' : 'AND';
-      fetchVideos(1, selectedTags.map(tag => tag.id), newMode);
+      fetchVideos(1, selectedTags.map(tag => tag.id), newMode, searchQuery);
       return newMode;
     });
   };
 
-  const fetchVideos = async (pageNum: number, tagIds?: number[], mode: 'AND' | 'OR' = 'AND') => {
+  const fetchVideos = async (pageNum: number, tagIds?: number[], mode: 'AND' | 'OR' = 'AND', query: string = '') => {
     try {
       setMainLoading(true);
-      let url = `/api/videos/list?page=${pageNum}&size=25`;
+      // 검색어가 있으면 관련도 순 검색 결과, 없으면 전체 목록
+      let url = query
+        ? `/api/videos/search?q=${encodeURIComponent(query)}&page=${pageNum}&size=25`
+        : `/api/videos/list?page=${pageNum}&size=25`;
       if (tagIds && tagIds.length > 0) {
         url += tagIds.map(id => `&tag_ids=${id}`).join('');
         url += `&tag_mode=${mode.toLowerCase()}`;
       }
       const response = await fetch(url);
+      if (!response.ok) throw new Error(`Failed to fetch videos: ${response.status}`);
       const data: PageResponse<Video> = await response.json();
       
       setMainLoading(false);
@@ -176,9 +201,45 @@ function App() {
 
   useEffect(() => {
     if (!initialLoading && isInitialized.current) {
-      fetchVideos(page, selectedTags.map(tag => tag.id), searchMode);
+      fetchVideos(page, selectedTags.map(tag => tag.id), searchMode, searchQuery);
     }
-  }, [page, selectedTags, initialLoading, searchMode]);
+  }, [page, selectedTags, initialLoading, searchMode, searchQuery]);
+
+  useEffect(() => {
+    const timer = setTimeout(() => {
+      const query = searchInput.trim();
+      if (query !== searchQuery) {
+        setPage(1);
+        setSearchQuery(query);
+      }
+    }, SEARCH_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [searchInput, searchQuery]);
+
+  // 태그 목록에 표시할 태그별 비디오 수
+  // AND 모드는 선택한 태그를 모두 가진 비디오 중의 수, OR 모드는 태그를 추가하면 결과가 늘어나므로 전체 비디오 중의 수
+  useEffect(() => {
+    let cancelled = false;
+    const fetchFacets = async () => {
+      try {
+        let url = '/api/videos/facets?';
+        if (searchMode === 'AND' && selectedTags.length > 0) {
+          url += selectedTags.map(tag => `tag_ids=${tag.id}`).join('&') + '&tag_mode=and';
+        }
+        const response = await fetch(url);
+        const data: TagFacets = await response.json();
+        if (!cancelled) {
+          setTagCounts(new Map(data.tags.map(tag => [tag.id, tag.count])));
+        }
+      } catch (error) {
+        console.error('Failed to fetch tag counts:', error);
+      }
+    };
+    if (!initialLoading) {
+      fetchFacets();
+    }
+    return () => { cancelled = true; };
+  }, [selectedTags, searchMode, initialLoading]);
   
   if (initialLoading) {
     return <Loading>Loading...</Loading>;
@@ -188,11 +249,19 @@ function App() {
     <>
       <TagList 
         tags={tags}
+        tagCounts={tagCounts}
+        selectedTagIds={selectedTags.map(tag => tag.id)}
         onTagClick={handleTagClick}
         onWidthChange={setSidebarWidth}
       />
       <Container $sidebarWidth={sidebarWidth}>
         <MainContent>
+          <SearchInput
+            type="search"
+            placeholder="파일 이름, 경로, 카테고리 검색 (접두어: 단어*, 구문: &quot;...&quot;)"
+            value={searchInput}
+            onChange={(e) => setSearchInput(e.target.value)}
+          />
           {selectedTags.length > 0 && (
             <SelectedTagsHeader>
               <SelectedTags>
@@ -132,7 +132,10 @@ const ClearButton = styled.button`
   }
 `;
 
-const TagItem = styled.div`
+const TagItem = styled.div<{ $empty?: boolean }>`
+  display: flex;
+  justify-content: space-between;
+  gap: 0.5rem;
   width: calc(100% - 1rem);
   padding: 0.35rem 0.5rem;
   margin: 0.2rem 0;
@@ -147,11 +150,19 @@ const TagItem = styled.div`
   white-space: normal;
   overflow-wrap: break-word;
   
+  opacity: ${props => props.$empty ? 0.4 : 1};
+  
   &:hover {
     filter: brightness(0.95);
   }
 `;
 
+const TagCount = styled.span`
+  color: #888;
+  font-size: 0.8rem;
+  flex-shrink: 0;
+`;
+
 // 파스텔톤 색상 배열
 const pastelColors = [
   '#FFE5E5', // 연한 분홍
@@ -164,11 +175,13 @@ const pastelColors = [
 
 interface Props {
   tags: Tag[];
+  tagCounts?: Map<number, number> | null;  // 현재 조건에서 각 태그를 가진 비디오 수 (없으면 표시하지 않음)
+  selectedTagIds?: number[];
   onTagClick?: (tag: Tag) => void;
   onWidthChange?: (width: number) => void;
 }
 
-export const TagList: React.FC<Props> = ({ tags, onTagClick, onWidthChange }) => {
+export const TagList: React.FC<Props> = ({ tags, tagCounts, selectedTagIds = [], onTagClick, onWidthChange }) => {
   const [width, setWidth] = useState(240);
   const [isResizing, setIsResizing] = useState(false);
   const [searchTerm, setSearchTerm] = useState('');
@@ -224,15 +237,21 @@ export const TagList: React.FC<Props> = ({ tags, onTagClick, onWidthChange }) =>
             />
           )}
         </SearchContainer>
-        {filteredTags.map((tag, index) => (
-          <TagItem 
-            key={tag.id}
-            onClick={() => onTagClick?.(tag)}
-            style={{ background: pastelColors[index % pastelColors.length] }}
-          >
-            {tag.name}
-          </TagItem>
-        ))}
+        {filteredTags.map((tag, index) => {
+          const isSelected = selectedTagIds.includes(tag.id);
+          const count = tagCounts && !isSelected ? tagCounts.get(tag.id) ?? 0 : null;
+          return (
+            <TagItem 
+              key={tag.id}
+              onClick={() => onTagClick?.(tag)}
+              $empty={count === 0}
+              style={{ background: pastelColors[index % pastelColors.length] }}
+            >
+              <span>{tag.name}</span>
+              {count !== null && <TagCount>{count}</TagCount>}
+            </TagItem>
+          );
+        })}
       </TagsContainer>
       <Resizer onMouseDown={startResizing} />
     </Sidebar>
@@ -479,7 +479,7 @@ export const VideoDetail: React.FC<Props> = ({
             )}
             {!thumbnailError && (
               <img
-                src={`http://localhost:8000/api/videos/thumbnails/${video.thumbnail_id}`}
+                src={`http://localhost:8000/api/videos/thumbnails/${video.thumbnail_id}?v=${encodeURIComponent(video.updated_at)}`}
                 alt={video.file_name}
                 className={thumbnailLoading ? 'hidden' : ''}
                 onError={handleThumbnailError}
@@ -143,6 +143,35 @@ const LoadingPlaceholder = styled.div`
   left: 0;
 `;
 
+// 목록 타일에 사용할 썸네일 크기 (px). 상세 화면은 기본(최대) 크기를 사용
+const GRID_THUMBNAIL_SIZE = 320;
+
+// 썸네일 묶음 응답의 항목 종류 (/api/videos/thumbnails/bundle)
+const BUNDLE_ENTRY_ANIMATED = 2;
+
+// 묶음 응답을 thumbnail_id별 이미지 URL로 변환 (완성된 애니메이션만, 나머지는 개별 요청으로 생성/갱신)
+// 항목 형식: [u8 ID 길이][ID][u8 종류][u32 길이][WebP] (빅 엔디언)
+const parseThumbnailBundle = (buffer: ArrayBuffer): { [thumbnailId: string]: string } => {
+  const view = new DataView(buffer);
+  const decoder = new TextDecoder('ascii');
+  const urls: { [thumbnailId: string]: string } = {};
+  let offset = 0;
+  while (offset < buffer.byteLength) {
+    const idLength = view.getUint8(offset);
+    const thumbnailId = decoder.decode(new Uint8Array(buffer, offset + 1, idLength));
+    offset += 1 + idLength;
+    const kind = view.getUint8(offset);
+    const length = view.getUint32(offset + 1);
+    offset += 5;
+    if (kind === BUNDLE_ENTRY_ANIMATED) {
+      const blob = new Blob([new Uint8Array(buffer, offset, length)], { type: 'image/webp' });
+      urls[thumbnailId] = URL.createObjectURL(blob);
+    }
+    offset += length;
+  }
+  return urls;
+};
+
 interface ThumbnailState {
   loading: boolean;
   error: boolean;
@@ -174,6 +203,8 @@ export const VideoGrid: React.FC<Props> = ({
   const [selectedVideo, setSelectedVideo] = useState<Video | null>(null);
   const [pendingTransition, setPendingTransition] = useState<'next' | 'prev' | null>(null);
   const prevVideosRef = useRef<Video[]>([]);
+  // 페이지 썸네일 묶음 (null이면 아직 받는 중)
+  const [bundleUrls, setBundleUrls] = useState<{ [thumbnailId: string]: string } | null>(null);
 
   // 키보드 이벤트 핸들러 추가
   useEffect(() => {
@@ -212,6 +243,37 @@ export const VideoGrid: React.FC<Props> = ({
     }
   }, [videos, isLoading, pendingTransition]);
 
+  // 현재 페이지의 썸네일을 한 번의 요청으로 받음
+  // (없는 썸네일은 서버가 스캔 작업보다 먼저 생성하도록 앞당기고, 해당 타일은 개별 요청으로 재시도)
+  useEffect(() => {
+    if (isLoading || videos.length === 0) return;
+    const controller = new AbortController();
+    let urls: { [thumbnailId: string]: string } = {};
+    const params = new URLSearchParams({ thumbnail_size: String(GRID_THUMBNAIL_SIZE) });
+    videos.forEach(video => params.append('ids', video.thumbnail_id));
+    setBundleUrls(null);
+
+    fetch(`/api/videos/thumbnails/bundle?${params}`, { signal: controller.signal })
+      .then(response => {
+        if (!response.ok) throw new Error(`Failed to load thumbnails: ${response.status}`);
+        return response.arrayBuffer();
+      })
+      .then(buffer => {
+        urls = parseThumbnailBundle(buffer);
+        setBundleUrls(urls);
+      })
+      .catch(error => {
+        if (error instanceof Error && error.name === 'AbortError') return;
+        console.error('Failed to load thumbnail bundle:', error);
+        setBundleUrls({});  // 개별 요청으로 대체
+      });
+
+    return () => {
+      controller.abort();
+      Object.values(urls).forEach(url => URL.revokeObjectURL(url));
+    };
+  }, [videos, isLoading]);
+
   // 배열 비교 헬퍼 함수
   const arraysEqual = (a: Video[], b: Video[]) => {
     if (a.length !== b.length) return false;
@@ -345,10 +407,11 @@ export const VideoGrid: React.FC<Props> = ({
             retryCount: 0 
           };
           
-          const thumbnailUrl = `/api/videos/thumbnails/${video.thumbnail_id}`;
+          // 비디오가 바뀌면 updated_at도 바뀌므로 버전으로 사용 (완성된 썸네일은 브라우저가 재요청하지 않음)
+          const thumbnailUrl = `/api/videos/thumbnails/${video.thumbnail_id}?size=${GRID_THUMBNAIL_SIZE}&v=${encodeURIComponent(video.updated_at)}`;
           const imageUrl = state.error ? 
-            `${thumbnailUrl}?t=${Date.now()}` : 
-            thumbnailUrl;
+            `${thumbnailUrl}&t=${Date.now()}` : 
+            bundleUrls?.[video.thumbnail_id] ?? thumbnailUrl;
           
           return (
             <VideoCard 
@@ -357,7 +420,7 @@ export const VideoGrid: React.FC<Props> = ({
               data-modal-open={!!selectedVideo}
             >
               <ThumbnailContainer>
-                {state.error ? (
+                {state.error || bundleUrls === null ? (
                   <LoadingPlaceholder>
                     Loading...
                   </LoadingPlaceholder>
@@ -5,6 +5,12 @@ export interface Video {
   thumbnail_id: string;
   duration: number;
   category: string | null;
+  width: number | null;
+  height: number | null;
+  fps: number | null;
+  codec: string | null;
+  bitrate: number | null;
+  file_size: number | null;
   created_at: string;
   updated_at: string;
   tags: Tag[];
@@ -21,4 +27,11 @@ export interface PageResponse<T> {
   pages: number;
   page: number;
   size: number;
-} 
\ No newline at end of file
+  next_cursor?: string | null;  // 다음 페이지 커서 (/list?cursor=...)
+} 
+
+export interface TagFacets {
+  total: number;
+  tags: { id: number; count: number }[];  // 현재 조건의 비디오 중 각 태그를 가진 수 (0개, 조건에 쓰인 태그 제외)
+  categories: { category: string | null; count: number }[];
+}